@@ -1,20 +1,32 @@
 import os
-import io
-import csv
 import json
+import math
 import time
+import sys
+import asyncio
+import anyio
 import pathlib
-from typing import Dict, Any, List
+from contextlib import asynccontextmanager
+from typing import Dict, Any, List, Literal, Optional
 
-from fastapi import FastAPI, Request, HTTPException, Response
+from fastapi import FastAPI, HTTPException, Response
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import RedirectResponse
+from fastapi.responses import RedirectResponse, StreamingResponse, PlainTextResponse, JSONResponse
 from pydantic import BaseModel
 
-from core.model import Params, plan
-from core.recommend import optimize
-from core.presets import list_presets, get_preset
-from core.pricing import list_profiles as list_price_profiles, get_profile as get_price_profile
+# Only numpy-free modules are imported here; the /plan path never needs numpy.
+# Batch, search, simulation and export modules (numpy, optionally pyarrow) are
+# imported inside the endpoints that use them, so replicas start without them.
+from core.model import Params, PlanResult
+from core.cache import default_cache
+from core.solve import min_servers, max_qps, max_T_ctx
+from core.ratelimit import RateLimiter, LocalBuckets, SQLiteBuckets
+from core.metrics import Registry, COUNT_BUCKETS, begin_request, stage, stages
+from core.presets import list_presets, get_preset, get_presets
+from core.pricing import (
+    PRICE_FIELDS, apply_profile, default_registry, get_curve, find_profiles as find_price_profiles,
+    get_profile as get_price_profile,
+)
 
 
 def _read_version() -> str:
@@ -25,11 +37,143 @@ def _read_version() -> str:
 
 
 APP_VERSION = _read_version()
-app = FastAPI(title="GenAI Cost Planner API", version=APP_VERSION)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Parse the profile file and build the preset registry before the first request.
+    default_registry().index()
+    get_presets()
+    default_cache()
+    yield
+    if "core.jobs" in sys.modules:
+        sys.modules["core.jobs"].default_manager().shutdown()
+
+
+app = FastAPI(title="GenAI Cost Planner API", version=APP_VERSION, lifespan=lifespan)
 
 origins_env = os.getenv("ALLOWED_ORIGINS", "*")
 origins = ["*"] if origins_env.strip() == "*" else [o.strip() for o in origins_env.split(",") if o.strip()]
 
+API_KEY = os.getenv("API_KEY", "").strip()
+RATE_LIMIT_RPS = float(os.getenv("RATE_LIMIT_RPS") or 0)
+RATE_LIMIT_BURST = float(os.getenv("RATE_LIMIT_BURST") or 0)
+RATE_LIMIT_MAX_CLIENTS = int(os.getenv("RATE_LIMIT_MAX_CLIENTS") or 100000)
+RATE_LIMIT_DB = os.getenv("RATE_LIMIT_DB", "").strip()
+SIMULATE_MAX_N = int(os.getenv("SIMULATE_MAX_N", "2000000"))
+EXPORT_MEDIA_TYPES = {
+    "csv": "text/csv",
+    "json": "application/json",
+    "ndjson": "application/x-ndjson",
+    "arrow": "application/vnd.apache.arrow.stream",
+    "parquet": "application/vnd.apache.parquet",
+}
+COLUMNAR = ("arrow", "parquet")
+# Exports up to this size read plans through default_cache(), like /plan; larger ones are
+# streamed through plan_batch, which is far cheaper per row than a cache lookup and
+# would only flush the cache.
+EXPORT_CACHE_MAX_ITEMS = 256
+JOB_MAX_ROWS = int(os.getenv("JOB_MAX_ROWS", "2000000"))
+MONTECARLO_MAX_N = int(os.getenv("MONTECARLO_MAX_N", "5000000"))
+PARETO_MAX_POINTS = int(os.getenv("PARETO_MAX_POINTS", "5000000"))
+MONTECARLO_MAX_WORKERS = int(os.getenv("MONTECARLO_MAX_WORKERS", str(os.cpu_count() or 1)))
+FAST_JSON = os.getenv("FAST_JSON", "").strip().lower() in ("1", "true", "yes")
+_orjson = None
+if FAST_JSON:
+    try:
+        import orjson as _orjson
+    except ImportError:
+        pass
+METRICS = Registry()
+METRICS.counter("http_requests_total", "Requests by route, method and status.")
+METRICS.histogram("http_request_duration_seconds", "End-to-end request latency by route.")
+METRICS.histogram("http_request_stage_seconds", "Request latency by route and stage (validate, compute, serialize).")
+METRICS.histogram("optimize_plan_evaluations", "plan() evaluations per /optimize request (0 on a cache hit).",
+                  COUNT_BUCKETS)
+METRICS.gauge("http_requests_in_flight", "Requests currently being handled.", lambda: [((), _in_flight[0])])
+METRICS.gauge("plan_cache_hit_ratio", "Hit ratio of the plan/optimize result cache.",
+              lambda: [((), default_cache().stats()["hit_ratio"])])
+METRICS.gauge("plan_cache_entries", "Entries in the in-process result cache.", lambda: [((), len(default_cache()))])
+METRICS.gauge("jobs_in_flight", "Sweep jobs queued or running.", lambda: [((), _jobs_active())])
+_in_flight = [0]
+
+
+def _jobs_active() -> int:
+    jobs = sys.modules.get("core.jobs")
+    return jobs.default_manager().active() if jobs is not None else 0
+
+
+class MetricsMiddleware:
+    # Plain ASGI rather than @app.middleware("http"): BaseHTTPMiddleware alone costs ~25% on /plan.
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        timing = begin_request()
+        status = [500]
+
+        async def send_status(message):
+            if message["type"] == "http.response.start":
+                status[0] = message["status"]
+            await send(message)
+
+        _in_flight[0] += 1
+        try:
+            await self.app(scope, receive, send_status)
+        finally:
+            _in_flight[0] -= 1
+            end = time.perf_counter()
+            route = scope.get("route")
+            path = route.path if route is not None else "unmatched"
+            METRICS.inc("http_requests_total", route=path, method=scope["method"], status=str(status[0]))
+            METRICS.observe("http_request_duration_seconds", end - timing.start, route=path)
+            for name, v in stages(timing, end).items():
+                METRICS.observe("http_request_stage_seconds", v, route=path, stage=name)
+
+
+PUBLIC_PATHS = {"/", "/healthz", "/favicon.ico", "/docs", "/redoc", "/openapi.json", "/version"}
+
+
+def _error(status: int, detail: str, headers: Optional[Dict[str, str]] = None) -> JSONResponse:
+    return JSONResponse({"detail": detail}, status_code=status, headers=headers)
+
+
+class AuthRateMiddleware:
+    def __init__(self, app, api_key: str = "", limiter: Optional[RateLimiter] = None):
+        self.app = app
+        self.api_key = api_key
+        self.limiter = limiter
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        path = scope["path"]
+        if self.api_key and not (path in PUBLIC_PATHS or path.startswith("/pricing/profiles")):
+            headers = dict(scope["headers"])
+            if headers.get(b"x-api-key", b"").decode("latin-1") != self.api_key:
+                return await _error(401, "invalid api key")(scope, receive, send)
+        if self.limiter is not None and path not in PUBLIC_PATHS:
+            client = scope.get("client")
+            key = client[0] if client else "unknown"
+            if self.limiter.blocking:
+                ok, retry_after = await anyio.to_thread.run_sync(self.limiter.check, key)
+            else:
+                ok, retry_after = self.limiter.check(key)
+            if not ok:
+                return await _error(429, "rate limit exceeded", {"Retry-After": str(retry_after)})(scope, receive, send)
+        await self.app(scope, receive, send)
+
+
+if API_KEY or RATE_LIMIT_RPS > 0:
+    _limiter = None
+    if RATE_LIMIT_RPS > 0:
+        backend = SQLiteBuckets(RATE_LIMIT_DB) if RATE_LIMIT_DB else LocalBuckets(RATE_LIMIT_MAX_CLIENTS)
+        _limiter = RateLimiter(RATE_LIMIT_RPS, RATE_LIMIT_BURST or None, backend)
+    app.add_middleware(AuthRateMiddleware, api_key=API_KEY, limiter=_limiter)
+# Starlette wraps the most recently added middleware outermost: CORS must see
+# preflights before auth, and metrics also counts 401/429 responses.
 app.add_middleware(
     CORSMiddleware,
     allow_origins=origins,
@@ -37,11 +181,7 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
-
-API_KEY = os.getenv("API_KEY", "").strip()
-RATE_LIMIT_RPS = float(os.getenv("RATE_LIMIT_RPS", "0"))
-_rate_state: Dict[str, Dict[str, float]] = {}
-PUBLIC_PATHS = {"/", "/healthz", "/favicon.ico", "/docs", "/redoc", "/openapi.json", "/version"}
+app.add_middleware(MetricsMiddleware)
 
 
 class PlanRequest(BaseModel):
@@ -61,10 +201,97 @@ class PlanRequest(BaseModel):
     burst_factor: float = 1.0
 
 
+class PlanBatchRequest(BaseModel):
+    items: Optional[List[PlanRequest]] = None
+    columns: Optional[Dict[str, List[float]]] = None
+    fields: Optional[List[str]] = None
+
+
+class PlanDistributionRequest(BaseModel):
+    params: PlanRequest
+    sketch: Optional[Dict[str, Any]] = None
+    samples: Optional[Dict[str, List[float]]] = None
+
+
 class OptimizeRequest(BaseModel):
     params: PlanRequest
     sla_p95: float = 2.0
     rho_target: float = 0.7
+    mode: Literal["pruned", "grid"] = "pruned"
+    profile: Optional[str] = None
+
+
+class ParetoRequest(BaseModel):
+    params: PlanRequest
+    space: Optional[Dict[str, List[float]]] = None
+    sla_p95: Optional[float] = None
+    rho_target: Optional[float] = None
+
+
+class SimulateRequest(BaseModel):
+    params: PlanRequest
+    n: int = 200000
+    seed: Optional[int] = 0
+    service_cv: float = 0.0
+
+
+class SolveRequest(BaseModel):
+    params: PlanRequest
+    target: Literal["servers", "qps", "T_ctx"]
+    sla_p95: Optional[float] = None
+    rho_target: Optional[float] = None
+    budget_month: Optional[float] = None
+
+
+class LoadCurveRequest(BaseModel):
+    params: PlanRequest
+    qps: List[float]
+    interval_s: float = 3600.0
+    sla_p95: Optional[float] = 2.0
+    rho_target: Optional[float] = 0.7
+    server_cost_per_hour: float = 0.0
+    autoscale: bool = True
+    include_intervals: bool = True
+
+
+class JobRequest(BaseModel):
+    params: Optional[PlanRequest] = None
+    presets: Optional[List[str]] = None
+    profiles: Optional[List[str]] = None
+    grid: Dict[str, List[float]] = {}
+    fields: Optional[List[str]] = None
+
+
+class CompareRequest(BaseModel):
+    params: PlanRequest
+    profiles: Optional[List[str]] = None
+    provider: Optional[str] = None
+    model: Optional[str] = None
+    max_price_in: Optional[float] = None
+    max_price_out: Optional[float] = None
+    optimize: bool = False
+    sla_p95: Optional[float] = 2.0
+    rho_target: Optional[float] = 0.7
+    batch_max: int = 64
+
+
+class SensitivityRequest(BaseModel):
+    params: PlanRequest
+    outputs: List[str] = ["cost.per_month", "latency.p95_s"]
+    rel_step: float = 0.01
+    swing: float = 0.1
+    profile: Optional[str] = None
+
+
+class MonteCarloRequest(BaseModel):
+    params: PlanRequest
+    distributions: Dict[str, Dict[str, Any]]
+    n: int = 100000
+    seed: Optional[int] = 0
+    sla_p95: Optional[float] = None
+    outputs: List[str] = ["cost.per_month", "latency.p95_s"]
+    workers: int = 1
+    profile: Optional[str] = None
 
 
 class ExportItem(BaseModel):
@@ -75,6 +302,7 @@ class ExportItem(BaseModel):
 class ExportRequest(BaseModel):
     items: List[ExportItem]
     format: str = "csv"
+    gzip: bool = False
 
 
 class ApplyProfileRequest(BaseModel):
@@ -82,24 +310,6 @@ class ApplyProfileRequest(BaseModel):
     params: PlanRequest
 
 
-async def auth_and_rate(request: Request, call_next):
-    path = request.url.path
-    if API_KEY and not (path in PUBLIC_PATHS or path.startswith("/pricing/profiles")):
-        if request.headers.get("x-api-key", "") != API_KEY:
-            raise HTTPException(status_code=401, detail="invalid api key")
-    if RATE_LIMIT_RPS > 0 and path not in PUBLIC_PATHS:
-        now = time.time()
-        ip = request.client.host if request.client else "unknown"
-        state = _rate_state.get(ip, {"t": now, "c": 0})
-        if now - state["t"] > 1.0:
-            state = {"t": now, "c": 0}
-        state["c"] += 1
-        _rate_state[ip] = state
-        if state["c"] > RATE_LIMIT_RPS:
-            raise HTTPException(status_code=429, detail="rate limit exceeded")
-    return await call_next(request)
-
-
 @app.get("/")
 def root():
     return RedirectResponse("/docs")
@@ -115,6 +325,16 @@ def version() -> Dict[str, str]:
     return {"version": APP_VERSION}
 
 
+@app.get("/metrics")
+def metrics() -> PlainTextResponse:
+    return PlainTextResponse(METRICS.render(), media_type="text/plain; version=0.0.4")
+
+
+@app.get("/cache/stats")
+def cache_stats() -> Dict[str, Any]:
+    return default_cache().stats()
+
+
 @app.get("/presets")
 def presets() -> Dict[str, Any]:
     return {"presets": list_presets()}
@@ -127,63 +347,362 @@ def preset(name: str) -> Dict[str, Any]:
 
 
 @app.get("/pricing/profiles")
-def pricing_profiles() -> Dict[str, Any]:
-    return {"profiles": list_price_profiles()}
+def pricing_profiles(provider: Optional[str] = None, model: Optional[str] = None,
+                     min_price_in: Optional[float] = None, max_price_in: Optional[float] = None,
+                     min_price_out: Optional[float] = None, max_price_out: Optional[float] = None) -> Dict[str, Any]:
+    return {"profiles": find_price_profiles(provider, model, min_price_in, max_price_in, min_price_out, max_price_out)}
+
+
+def _price_profile_or_404(name: str) -> Dict[str, Any]:
+    try:
+        return get_price_profile(name)
+    except KeyError as e:
+        raise HTTPException(status_code=404, detail=str(e.args[0]))
 
 
 @app.get("/pricing/profiles/{name}")
 def pricing_profile(name: str) -> Dict[str, Any]:
-    return {"name": name, "profile": get_price_profile(name)}
+    return {"name": name, "profile": _price_profile_or_404(name)}
 
 
 @app.post("/pricing/apply")
 def pricing_apply(body: ApplyProfileRequest) -> Dict[str, Any]:
-    prof = get_price_profile(body.profile)
+    prof = _price_profile_or_404(body.profile)
     merged = body.params.model_dump()
-    merged.update(prof)
+    merged.update({k: prof[k] for k in PRICE_FIELDS})
     return {"params": merged, "profile": body.profile}
 
 
+def _json_default(v):
+    if isinstance(v, PlanResult):
+        return v.to_dict()
+    raise TypeError(f"cannot serialize {type(v).__name__}")
+
+
+def _respond(payload: Any):
+    """With FAST_JSON (and orjson installed) the payload is encoded directly, skipping
+    FastAPI's response validation; inf/nan become null and numpy arrays are written
+    without a list round trip. Otherwise the payload goes through FastAPI as usual."""
+    if _orjson is None:
+        return payload
+    body = _orjson.dumps(payload, default=_json_default, option=_orjson.OPT_SERIALIZE_NUMPY)
+    return Response(body, media_type="application/json")
+
+
+def _columns(cols: Dict[str, Any]) -> Dict[str, Any]:
+    return cols if _orjson is not None else {k: v.tolist() for k, v in cols.items()}
+
+
+def _with_profile(p: Params, profile: Optional[str]):
+    if profile is None:
+        return p, None
+    try:
+        return apply_profile(p, profile), get_curve(profile)
+    except KeyError as e:
+        raise HTTPException(status_code=404, detail=str(e.args[0]))
+
+
 @app.post("/plan")
-def plan_endpoint(body: PlanRequest) -> Dict[str, Any]:
-    p = Params(**body.model_dump())
-    return plan(p)
+def plan_endpoint(body: PlanRequest, profile: Optional[str] = None) -> Dict[str, Any]:
+    p, curve = _with_profile(Params(**body.model_dump()), profile)
+    with stage():
+        out = default_cache().plan(p, curve)
+    return _respond(out)
+
+
+@app.post("/plan/batch")
+def plan_batch_endpoint(body: PlanBatchRequest) -> Dict[str, Any]:
+    from core.batch import plan_batch, params_to_columns, flatten_columns
+
+    if (body.items is None) == (body.columns is None):
+        raise HTTPException(status_code=400, detail="provide exactly one of items or columns")
+    if body.items is not None:
+        cols = params_to_columns(Params(**it.model_dump()) for it in body.items)
+    else:
+        cols = body.columns
+    try:
+        with stage():
+            out = flatten_columns(plan_batch(cols), body.fields)
+    except KeyError as e:
+        raise HTTPException(status_code=400, detail=str(e.args[0]))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    n = len(next(iter(out.values()))) if out else 0
+    return _respond({"n": n, "columns": _columns(out)})
+
+
+@app.post("/plan/distribution")
+def plan_distribution_endpoint(body: PlanDistributionRequest) -> Dict[str, Any]:
+    from core.sketch import WorkloadSketch, plan_distribution
+
+    if (body.sketch is None) == (body.samples is None):
+        raise HTTPException(status_code=400, detail="provide exactly one of sketch or samples")
+    p = Params(**body.params.model_dump())
+    try:
+        if body.sketch is not None:
+            w = WorkloadSketch.from_dict(body.sketch)
+        else:
+            w = WorkloadSketch().add(body.samples)
+        with stage():
+            out = plan_distribution(p, w)
+    except KeyError as e:
+        raise HTTPException(status_code=400, detail=f"missing sketch dimension: {e.args[0]}")
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return _respond(out)
+
+
+@app.post("/compare")
+def compare_endpoint(body: CompareRequest) -> Dict[str, Any]:
+    from core.compare import compare_profiles
+
+    p = Params(**body.params.model_dump())
+    names = body.profiles
+    if names is None:
+        names = find_price_profiles(body.provider, body.model, max_price_in=body.max_price_in,
+                                    max_price_out=body.max_price_out)
+    try:
+        with stage():
+            out = compare_profiles(p, names, optimize=body.optimize, sla_p95=body.sla_p95,
+                                   rho_target=body.rho_target, batch_max=max(1, min(body.batch_max, 1024)))
+    except KeyError as e:
+        raise HTTPException(status_code=404, detail=str(e.args[0]))
+    return _respond(_finite(out))
 
 
 @app.post("/optimize")
 def optimize_endpoint(body: OptimizeRequest) -> Dict[str, Any]:
-    p = Params(**body.params.model_dump())
-    out = optimize(p, sla_p95=body.sla_p95, rho_target=body.rho_target)
-    payload: Dict[str, Any] = {"base_cost": out["base_cost"], "count": out["count"], "best": None}
+    p, curve = _with_profile(Params(**body.params.model_dump()), body.profile)
+    cache = default_cache()
+    key = cache.key(p, "optimize", body.sla_p95, body.rho_target, body.mode, curve.key if curve else None)
+    computed = []
+
+    def compute():
+        computed.append(True)
+        return _optimize_payload(p, body, curve)
+
+    with stage():
+        out = cache.get_or_compute(key, compute)
+    METRICS.observe("optimize_plan_evaluations", out["evals"] if computed else 0, mode=body.mode)
+    return _respond(out)
+
+
+def _optimize_payload(p: Params, body: OptimizeRequest, curve=None) -> Dict[str, Any]:
+    from core.recommend import optimize
+
+    out = optimize(p, sla_p95=body.sla_p95, rho_target=body.rho_target, mode=body.mode, curve=curve)
+    payload: Dict[str, Any] = {"base_cost": out["base_cost"], "count": out["count"], "evals": out["evals"], "best": None}
     if out["best"] is not None:
         bp = out["best"]["params"]
         br = out["best"]["result"]
-        payload["best"] = {"params": bp.__dict__, "result": br, "score": out["best"]["score"]}
+        payload["best"] = {"params": dict(bp.__dict__), "result": br, "score": list(out["best"]["score"])}
     return payload
 
 
+@app.post("/sensitivity")
+def sensitivity_endpoint(body: SensitivityRequest) -> Dict[str, Any]:
+    from core.sensitivity import sensitivity
+
+    p, curve = _with_profile(Params(**body.params.model_dump()), body.profile)
+    if not 0 < body.rel_step < 1 or not 0 < body.swing < 1:
+        raise HTTPException(status_code=400, detail="rel_step and swing must be in (0, 1)")
+    try:
+        with stage():
+            out = sensitivity(p, body.outputs, rel_step=body.rel_step, swing=body.swing, curve=curve)
+    except KeyError as e:
+        raise HTTPException(status_code=400, detail=str(e.args[0]))
+    return _respond(out)
+
+
+@app.post("/montecarlo")
+def montecarlo_endpoint(body: MonteCarloRequest) -> Dict[str, Any]:
+    from core.montecarlo import montecarlo
+
+    p, curve = _with_profile(Params(**body.params.model_dump()), body.profile)
+    n = max(1, min(int(body.n), MONTECARLO_MAX_N))
+    workers = max(1, min(int(body.workers), MONTECARLO_MAX_WORKERS))
+    try:
+        with stage():
+            out = montecarlo(p, body.distributions, n=n, seed=body.seed, sla_p95=body.sla_p95,
+                             outputs=body.outputs, curve=curve, workers=workers)
+    except KeyError as e:
+        raise HTTPException(status_code=400, detail=str(e.args[0]))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return _respond(out)
+
+
+@app.post("/pareto")
+def pareto_endpoint(body: ParetoRequest) -> Dict[str, Any]:
+    from core.pareto import pareto_frontier, default_space, space_size
+
+    p = Params(**body.params.model_dump())
+    space = body.space if body.space else default_space(p)
+    points = space_size(space)
+    if points > PARETO_MAX_POINTS:
+        raise HTTPException(status_code=400,
+                            detail=f"search space has {points} points, above PARETO_MAX_POINTS={PARETO_MAX_POINTS}")
+    try:
+        with stage():
+            out = pareto_frontier(p, space=space, sla_p95=body.sla_p95, rho_target=body.rho_target)
+    except KeyError as e:
+        raise HTTPException(status_code=400, detail=str(e.args[0]))
+    return _respond(out)
+
+
+@app.post("/simulate")
+def simulate_endpoint(body: SimulateRequest) -> Dict[str, Any]:
+    from core.simulate import simulate
+
+    p = Params(**body.params.model_dump())
+    n = max(1, min(int(body.n), SIMULATE_MAX_N))
+    with stage():
+        out = simulate(p, n=n, seed=body.seed, service_cv=max(0.0, body.service_cv))
+    return _respond(out)
+
+
+@app.post("/solve")
+def solve_endpoint(body: SolveRequest) -> Dict[str, Any]:
+    p = Params(**body.params.model_dump())
+    with stage():
+        out = _solve(p, body)
+    return {"target": body.target, **out}
+
+
+def _solve(p: Params, body: SolveRequest) -> Dict[str, Any]:
+    if body.target == "servers":
+        return min_servers(p, sla_p95=body.sla_p95, rho_target=body.rho_target)
+    if body.target == "qps":
+        return max_qps(p, sla_p95=body.sla_p95, rho_target=body.rho_target)
+    return max_T_ctx(p, budget_month=body.budget_month, sla_p95=body.sla_p95, rho_target=body.rho_target)
+
+
+@app.post("/plan/loadcurve")
+def load_curve_endpoint(body: LoadCurveRequest) -> Dict[str, Any]:
+    from core.loadcurve import plan_load_curve
+
+    p = Params(**body.params.model_dump())
+    try:
+        with stage():
+            out = plan_load_curve(
+                p, body.qps, interval_s=body.interval_s, sla_p95=body.sla_p95, rho_target=body.rho_target,
+                server_cost_per_hour=body.server_cost_per_hour, autoscale=body.autoscale,
+            )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    payload: Dict[str, Any] = {"totals": out["totals"], "daily": _columns(out["daily"])}
+    if body.include_intervals:
+        payload["intervals"] = _columns(out["intervals"])
+    return _respond(payload)
+
+
+def _finite(v):
+    if isinstance(v, float):
+        return v if math.isfinite(v) else None
+    if isinstance(v, dict):
+        return {k: _finite(x) for k, x in v.items()}
+    if isinstance(v, list):
+        return [_finite(x) for x in v]
+    return v
+
+
+def _job_manager():
+    from core.jobs import default_manager
+    return default_manager()
+
+
+def _job_or_404(job_id: str):
+    job = _job_manager().get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="job not found")
+    return job
+
+
+@app.post("/jobs", status_code=202)
+def create_job(body: JobRequest) -> Dict[str, Any]:
+    from core.jobs import expand_sweep
+    from core.pareto import space_size
+
+    spec = body.model_dump()
+    manager = _job_manager()
+    try:
+        rows = space_size(body.grid) * len(expand_sweep(spec))
+        if rows > JOB_MAX_ROWS:
+            raise ValueError(f"sweep has {rows} rows, above JOB_MAX_ROWS={JOB_MAX_ROWS}")
+        job = manager.submit(spec)
+    except KeyError as e:
+        raise HTTPException(status_code=400, detail=str(e.args[0]))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return job.summary()
+
+
+@app.get("/jobs")
+def list_jobs() -> Dict[str, Any]:
+    return {"jobs": _job_manager().list()}
+
+
+@app.get("/jobs/{job_id}")
+def get_job(job_id: str, offset: int = 0, results: bool = True) -> Dict[str, Any]:
+    job = _job_or_404(job_id)
+    payload = job.summary()
+    if results:
+        payload["offset"] = offset
+        payload["results"] = _finite(_job_manager().results(job_id, offset))
+    return _respond(payload)
+
+
+@app.get("/jobs/{job_id}/stream")
+async def stream_job(job_id: str):
+    _job_or_404(job_id)
+    manager = _job_manager()
+
+    async def lines():
+        offset = 0
+        while True:
+            job = manager.get(job_id)
+            try:
+                chunk = manager.results(job_id, offset)
+            except KeyError:
+                job = None
+            if job is None:
+                yield json.dumps({"status": "evicted", "error": "job was evicted before the stream finished"}) + "\n"
+                return
+            for part in chunk:
+                yield json.dumps(_finite(part)) + "\n"
+            offset += len(chunk)
+            if job.status != "running" and offset >= len(job.results):
+                yield json.dumps({"status": job.status, "error": job.error}) + "\n"
+                return
+            await asyncio.sleep(0.05)
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+
+@app.delete("/jobs/{job_id}")
+def cancel_job(job_id: str) -> Dict[str, Any]:
+    _job_or_404(job_id)
+    return _job_manager().cancel(job_id).summary()
+
+
 @app.post("/export")
 def export_endpoint(body: ExportRequest):
-    rows: List[Dict[str, Any]] = []
-    for it in body.items:
-        p = Params(**it.params.model_dump())
-        r = plan(p)
-        rows.append(
-            {
-                "name": it.name,
-                "cost_per_query": r["cost"]["per_query"],
-                "cost_per_1k": r["cost"]["per_1k"],
-                "p50_s": r["latency"]["p50_s"],
-                "p95_s": r["latency"]["p95_s"],
-                "rho": r["latency"]["rho"],
-                "mu_qps": r["latency"]["mu_qps"],
-            }
-        )
-    if body.format.lower() == "json":
-        return Response(json.dumps(rows, ensure_ascii=False), media_type="application/json")
-    output = io.StringIO()
-    writer = csv.DictWriter(output, fieldnames=list(rows[0].keys()))
-    writer.writeheader()
-    for row in rows:
-        writer.writerow(row)
-    return Response(output.getvalue(), media_type="text/csv")
+    from core.export import ENCODERS, cached_export_chunk, iter_export_chunks, gzip_stream
+
+    fmt = body.format.lower()
+    if fmt not in ENCODERS:
+        raise HTTPException(status_code=400, detail=f"format must be one of {', '.join(ENCODERS)}")
+    items = ((it.name, Params(**it.params.model_dump())) for it in body.items)
+    if len(body.items) <= EXPORT_CACHE_MAX_ITEMS:
+        chunks = iter([cached_export_chunk(items, default_cache())]) if body.items else iter(())
+    else:
+        chunks = iter_export_chunks(items, chunk_size=65536 if fmt in COLUMNAR else 4096)
+    try:
+        stream = ENCODERS[fmt](chunks)
+    except ImportError as e:
+        raise HTTPException(status_code=501, detail=str(e))
+    headers = {}
+    if body.gzip:
+        stream = gzip_stream(stream)
+        headers["Content-Encoding"] = "gzip"
+    return StreamingResponse(stream, media_type=EXPORT_MEDIA_TYPES[fmt], headers=headers)
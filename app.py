@@ -1,11 +1,15 @@
 import io
+import altair as alt
 import numpy as np
 import pandas as pd
 import streamlit as st
 
-from core.model import Params, plan, plan_cached
+from core.model import Params, plan
+from core.pareto import sweep_grid
 from core.presets import get_preset, list_presets
 from core.recommend import suggest, optimize
+from core.solve import min_servers, max_qps
+from core.sensitivity import sensitivity
 from core.pricing import (
     list_profiles as list_price_profiles,
     get_profile as get_price_profile,
@@ -148,17 +152,17 @@ c8.metric("Service capacity μ", f"{res['latency']['mu_qps']:.2f} qps")
 
 # Capacity planning (servers)
 st.subheader("Capacity planning")
-safe_qps_total = res["latency"]["safe_qps"]
-safe_qps_per_instance = safe_qps_total / max(1, int(getattr(params, "servers", 1)))
-required_instances = int(
-    np.ceil((params.qps * max(1.0, getattr(params, "burst_factor", 1.0))) / max(1e-9, safe_qps_per_instance))
-)
+sized = min_servers(params, sla_p95=sla_p95, rho_target=rho_target)
+required_instances = sized["servers"]
+sla_qps = max_qps(params, sla_p95=sla_p95, rho_target=rho_target)["qps"]
 c9, c10, c11 = st.columns(3)
 c9.metric("Max QPS total (μ)", f"{res['latency']['mu_qps']:.2f}")
-c10.metric("Safe QPS total (ρ≤0.7)", f"{safe_qps_total:.2f}")
-c11.metric("Instances needed", f"{required_instances}")
+c10.metric(f"Max QPS within SLA (ρ≤{rho_target:.2f})", "n/a" if sla_qps is None else f"{sla_qps:.2f}")
+c11.metric("Instances needed", "n/a" if required_instances is None else f"{required_instances}")
+if required_instances is None:
+    st.info(sized["reason"])
 
-if required_instances > getattr(params, "servers", 1) and st.button("Apply scaling suggestion"):
+if required_instances is not None and required_instances > getattr(params, "servers", 1) and st.button("Apply scaling suggestion"):
     new_servers = required_instances
     st.session_state.current_params = Params(
         T_ctx=params.T_ctx, T_prompt=params.T_prompt, T_resp=params.T_resp,
@@ -177,44 +181,82 @@ try:
 except Exception as e:
     st.info(f"(suggest) {e}")
 
-# What-if: p95 vs batch
-st.subheader("What-if: p95 latency vs batch size")
-b_values = np.arange(1, 33)
-p95_list = []
-for b in b_values:
-    tmp = Params(
-        T_ctx=params.T_ctx, T_prompt=params.T_prompt, T_resp=params.T_resp,
-        qps=params.qps, cache_hit=params.cache_hit, cache_savings=params.cache_savings,
-        batch=int(b), price_in=params.price_in, price_out=params.price_out,
-        tps_prefill=params.tps_prefill, tps_decode=params.tps_decode, net_ms_one_way=params.net_ms_one_way,
-        servers=int(getattr(params, "servers", 1)), burst_factor=float(getattr(params, "burst_factor", 1.0)),
+# Sensitivity (tornado): one batched evaluation for all inputs
+st.subheader("Sensitivity: ±10% per input")
+sens = sensitivity(params, swing=0.1)
+sens_metric = st.radio("Output", ["cost.per_month", "latency.p95_s"], horizontal=True)
+base_val = sens["base"][sens_metric]
+if base_val is None:
+    st.info("Output is unbounded at the baseline (unstable queue).")
+else:
+    rows = []
+    for it in sens["fields"]:
+        lo, hi = it["low"][sens_metric], it["high"][sens_metric]
+        if lo is None or hi is None:
+            continue
+        rows.append({"input": it["field"], "low (−10%)": lo - base_val, "high (+10%)": hi - base_val})
+    df_sens = pd.DataFrame(rows).set_index("input")
+    df_sens = df_sens.loc[(df_sens.abs().max(axis=1)).sort_values().index]
+    st.bar_chart(df_sens, horizontal=True, stack=False)
+
+# What-if sweeps: one vectorized plan_batch call each, memoized on the baseline
+@st.cache_data(show_spinner=False, max_entries=64)
+def sweep_1d(params: Params, axis: str, values: tuple, field: str) -> pd.DataFrame:
+    out = sweep_grid(params, {axis: values}, [field])
+    return pd.DataFrame({axis: values, field: out[field]})
+
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def sweep_2d(params: Params, x: str, x_values: tuple, y: str, y_values: tuple, field: str) -> pd.DataFrame:
+    grid = sweep_grid(params, {x: x_values, y: y_values}, [field])[field]
+    xs, ys = np.meshgrid(x_values, y_values, indexing="ij")
+    z = np.where(np.isfinite(grid), grid, np.nan)
+    return pd.DataFrame({x: xs.ravel(), y: ys.ravel(), field: z.ravel()})
+
+
+def heatmap(df: pd.DataFrame, x: str, y: str, field: str, title: str):
+    chart = alt.Chart(df).mark_rect().encode(
+        x=alt.X(f"{x}:Q", bin=alt.Bin(maxbins=len(df[x].unique())), title=x),
+        y=alt.Y(f"{y}:Q", bin=alt.Bin(maxbins=len(df[y].unique())), title=y),
+        color=alt.Color(f"{field}:Q", title=title, scale=alt.Scale(scheme="viridis")),
+        tooltip=[x, y, field],
     )
-    p95_list.append(plan_cached(tmp)["latency"]["p95_s"])
-df_batch = pd.DataFrame({"batch": b_values, "p95 (s)": p95_list}).set_index("batch")
-st.line_chart(df_batch)
+    st.altair_chart(chart, width="stretch")
+
+
+st.subheader("What-if: p95 latency vs batch size")
+b_values = tuple(range(1, 129))
+df_batch = sweep_1d(params, "batch", b_values, "latency.p95_s").rename(columns={"latency.p95_s": "p95 (s)"})
+st.line_chart(df_batch.set_index("batch"))
 
-# What-if: Cost vs context
 st.subheader("What-if: Cost per query vs context length")
-ctx_max = max(1, int(params.T_ctx * 2))
-ctx_values = np.linspace(0, ctx_max, num=30)
-cost_list = []
-for ctx in ctx_values:
-    tmp = Params(
-        T_ctx=float(ctx), T_prompt=params.T_prompt, T_resp=params.T_resp,
-        qps=params.qps, cache_hit=params.cache_hit, cache_savings=params.cache_savings,
-        batch=int(params.batch), price_in=params.price_in, price_out=params.price_out,
-        tps_prefill=params.tps_prefill, tps_decode=params.tps_decode, net_ms_one_way=params.net_ms_one_way,
-        servers=int(getattr(params, "servers", 1)), burst_factor=float(getattr(params, "burst_factor", 1.0)),
+ctx_values = tuple(np.linspace(0, max(1, int(params.T_ctx * 2)), num=200).tolist())
+df_ctx = sweep_1d(params, "T_ctx", ctx_values, "cost.per_query").rename(
+    columns={"T_ctx": "context", "cost.per_query": "cost/query ($)"})
+st.line_chart(df_ctx.set_index("context"))
+
+st.subheader("Heatmaps")
+res_n = st.select_slider("Resolution", options=[50, 100, 200, 300], value=200)
+h1, h2 = st.columns(2)
+with h1:
+    k_max = max(16, 4 * int(getattr(params, "servers", 1)))
+    heatmap(
+        sweep_2d(params, "batch", tuple(np.unique(np.linspace(1, 256, res_n).astype(int)).tolist()),
+                 "servers", tuple(np.unique(np.linspace(1, k_max, res_n).astype(int)).tolist()), "latency.p95_s"),
+        "batch", "servers", "latency.p95_s", "p95 (s)",
+    )
+with h2:
+    heatmap(
+        sweep_2d(params, "T_ctx", tuple(np.linspace(0, max(1.0, 2.0 * params.T_ctx), res_n).tolist()),
+                 "cache_hit", tuple(np.linspace(0.0, 1.0, res_n).tolist()), "cost.per_month"),
+        "T_ctx", "cache_hit", "cost.per_month", "cost/month ($)",
     )
-    cost_list.append(plan_cached(tmp)["cost"]["per_query"])
-df_ctx = pd.DataFrame({"context": ctx_values, "cost/query ($)": cost_list}).set_index("context")
-st.line_chart(df_ctx)
 
 # Export
 st.subheader("Export")
 if st.button("Download CSV (batch sweep)"):
     csv_buf = io.StringIO()
-    pd.DataFrame({"batch": b_values, "p95 (s)": p95_list}).to_csv(csv_buf, index=False)
+    df_batch.to_csv(csv_buf, index=False)
     st.download_button("Save CSV", csv_buf.getvalue(), file_name="batch_sweep.csv", mime="text/csv")
 
 # Optimizer
@@ -0,0 +1,213 @@
+from dataclasses import fields
+from typing import Dict, Any, Iterable, Mapping, Optional
+
+import numpy as np
+
+from .model import Params
+
+FIELDS = tuple(f.name for f in fields(Params))
+DEFAULTS = {"net_ms_one_way": 0.0, "servers": 1, "burst_factor": 1.0}
+
+
+def params_to_columns(items: Iterable[Params]) -> Dict[str, np.ndarray]:
+    items = list(items)
+    return {
+        name: np.fromiter((getattr(p, name) for p in items), dtype=float, count=len(items))
+        for name in FIELDS
+    }
+
+
+def columns_to_params(cols: Mapping[str, Any]):
+    cols = _broadcast(cols)
+    n = len(cols["qps"])
+    out = []
+    for i in range(n):
+        kw = {name: float(cols[name][i]) for name in FIELDS}
+        kw["batch"] = int(kw["batch"])
+        kw["servers"] = int(kw["servers"])
+        out.append(Params(**kw))
+    return out
+
+
+def _broadcast(cols: Mapping[str, Any]) -> Dict[str, np.ndarray]:
+    missing = [f for f in FIELDS if f not in cols and f not in DEFAULTS]
+    if missing:
+        raise KeyError(f"missing columns: {', '.join(missing)}")
+    arrays = [np.asarray(cols.get(f, DEFAULTS.get(f)), dtype=float) for f in FIELDS]
+    arrays = np.broadcast_arrays(*[np.atleast_1d(a) for a in arrays])
+    return dict(zip(FIELDS, arrays))
+
+
+def flatten_columns(out: Mapping[str, Mapping[str, np.ndarray]], fields: Optional[Iterable[str]] = None) -> Dict[str, np.ndarray]:
+    if fields is None:
+        return {f"{group}.{key}": arr for group, cols in out.items() for key, arr in cols.items()}
+    flat = {}
+    for name in fields:
+        group, _, key = name.partition(".")
+        if group not in out or key not in out[group]:
+            raise KeyError(f"unknown result field: {name}")
+        flat[name] = out[group][key]
+    return flat
+
+
+RECURRENCE_MAX_K = 256
+TAIL_CHUNK = 1 << 22
+_LOG_2PI = float(np.log(2.0 * np.pi))
+_LOG_FACTORIAL = np.concatenate([[0.0], np.cumsum(np.log(np.arange(1.0, RECURRENCE_MAX_K + 1)))])
+
+
+def _log_factorial(n: np.ndarray) -> np.ndarray:
+    """log(n!) for non-negative integer-valued floats: a table, then Stirling's series."""
+    out = np.empty_like(n)
+    small = n <= RECURRENCE_MAX_K
+    out[small] = _LOG_FACTORIAL[n[small].astype(np.int64)]
+    x = n[~small]
+    inv2 = 1.0 / (x * x)
+    log_x = np.log(x)
+    out[~small] = (x * log_x - x + 0.5 * (_LOG_2PI + log_x)
+                   + (1.0 / 12.0 - inv2 * (1.0 / 360.0 - inv2 / 1260.0)) / x)
+    return out
+
+
+def _erlang_c_recurrence(a: np.ndarray, k: np.ndarray) -> np.ndarray:
+    order = np.argsort(k, kind="stable")
+    ks = k[order]
+    As = a[order]
+    B = np.ones_like(As)
+    kmax = int(ks[-1]) if ks.size else 0
+    # Erlang B recurrence: B(n) = a B(n-1) / (n + a B(n-1)); rows drop out once n > k.
+    for n in range(1, kmax + 1):
+        start = np.searchsorted(ks, n, side="left")
+        aB = As[start:] * B[start:]
+        B[start:] = aB / (n + aB)
+    rho = As / np.maximum(ks, 1)
+    C = B / (1.0 - rho * (1.0 - B))
+    out = np.empty_like(C)
+    out[order] = C
+    return out
+
+
+def _erlang_c_tail(a: np.ndarray, k: np.ndarray) -> np.ndarray:
+    # C = pk / (P(N < k) + pk) with N ~ Poisson(a) and pk = t(k) / (1 - a/k). P(N < k) is
+    # 1 - P(N >= k), and the upper tail is summed from t(k) with t(n+1) = t(n) a / (n+1).
+    # Terms shrink by at least a/k per step and like exp(-m^2 / 2k), so the work per row
+    # is about min(log(eps) / log(a/k), 9 sqrt(k)) terms: ~100 at 70% utilization.
+    kf = k.astype(float)
+    rho = a / kf
+    t_k = np.exp(kf * np.log(a) - a - _log_factorial(kf))
+    with np.errstate(divide="ignore"):
+        by_rho = np.ceil(-39.0 / np.log(rho))
+    span = (np.minimum(by_rho, np.floor(9.0 * np.sqrt(kf)) + 20.0) + 1.0).astype(np.int64)
+    tail = np.empty_like(a)
+    order = np.argsort(span, kind="stable")
+    start = 0
+    while start < len(order):
+        # Rows sorted by span; each chunk is one rows x span array of bounded size.
+        stop = start + 1
+        while stop < len(order) and (stop - start + 1) * int(span[order[stop]]) <= TAIL_CHUNK:
+            stop += 1
+        idx = order[start:stop]
+        j = np.arange(int(span[idx[-1]]), dtype=float)
+        r = a[idx, None] / (kf[idx, None] + j)
+        r[:, 0] = 1.0
+        r[j >= span[idx, None]] = 0.0
+        tail[idx] = np.cumprod(r, axis=1).sum(axis=1)
+        start = stop
+    pk = t_k / (1.0 - rho)
+    return pk / (1.0 - t_k * tail + pk)
+
+
+def erlang_c_batch(a: np.ndarray, k: np.ndarray) -> np.ndarray:
+    """Erlang C wait probability for offered load ``a`` on ``k`` servers (a < k).
+
+    Rows with k <= RECURRENCE_MAX_K use the Erlang B recurrence; larger fleets use the
+    Poisson upper-tail sum, so a single huge ``servers`` value does not cost O(k).
+    """
+    a = np.asarray(a, dtype=float)
+    k = np.asarray(k, dtype=np.int64)
+    out = np.empty_like(a)
+    small = k <= RECURRENCE_MAX_K
+    if small.any():
+        out[small] = _erlang_c_recurrence(a[small], k[small])
+    # No load means no waiting; k * log(a) would be 0 * -inf there.
+    idle = a <= 0.0
+    out[~small & idle] = 0.0
+    big = ~small & ~idle
+    if big.any():
+        out[big] = _erlang_c_tail(a[big], k[big])
+    return out
+
+
+def plan_batch(cols: Mapping[str, Any]) -> Dict[str, Dict[str, np.ndarray]]:
+    c = _broadcast(cols)
+    h = np.clip(c["cache_hit"], 0.0, 1.0)
+    s = np.clip(c["cache_savings"], 0.0, 1.0)
+    b = np.maximum(1.0, np.trunc(c["batch"]))
+    k = np.maximum(1.0, np.trunc(c["servers"]))
+    T_ctx = np.maximum(0.0, c["T_ctx"])
+    T_prompt = np.maximum(0.0, c["T_prompt"])
+    T_resp = np.maximum(0.0, c["T_resp"])
+    burst = np.maximum(1.0, c["burst_factor"])
+    lam = np.maximum(0.0, c["qps"]) * burst
+    P_in = np.maximum(0.0, c["price_in"])
+    P_out = np.maximum(0.0, c["price_out"])
+    tps_prefill = np.maximum(1e-9, c["tps_prefill"])
+    tps_decode = np.maximum(1e-9, c["tps_decode"])
+    net_rtt_s = np.maximum(0.0, 2.0 * c["net_ms_one_way"]) / 1000.0
+    T_ctx_eff = (1.0 - h * s) * T_ctx
+    T_ctx_eff_batch = T_ctx_eff / b
+    T_in_per_query = T_ctx_eff_batch + T_prompt
+    T_out_per_query = T_resp
+    cost_in = (T_in_per_query / 1000.0) * P_in
+    cost_out = (T_out_per_query / 1000.0) * P_out
+    cost_q = cost_in + cost_out
+    s_prefill = T_in_per_query / tps_prefill
+    s_decode = T_out_per_query / tps_decode
+    s_base = s_prefill + s_decode + net_rtt_s
+    mu = 1.0 / np.maximum(1e-9, s_base)
+    mu_total = k * mu
+    stable = lam < mu_total
+    a = lam / mu
+
+    single = k <= 1
+    rho1 = np.minimum(a, 0.999999)
+    multi = ~single & (a / k < 1.0)
+    p_wait = np.where(single, rho1, 1.0)
+    if multi.any():
+        p_wait[multi] = erlang_c_batch(a[multi], k[multi].astype(np.int64))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        wq = np.where(single, rho1 / (mu - lam), p_wait / (mu_total - lam))
+    wq = np.where(single & (lam < mu) | multi, wq, np.inf)
+
+    L_p50 = np.where(stable, s_base + wq, np.inf)
+    L_p95 = np.where(stable, s_base + 3.0 * wq, np.inf)
+    qpd = (lam / burst) * 86400.0
+    cost_day = qpd * cost_q
+    return {
+        "tokens": {
+            "T_ctx_eff": T_ctx_eff,
+            "T_ctx_eff_batch": T_ctx_eff_batch,
+            "T_in_per_query": T_in_per_query,
+            "T_out_per_query": T_out_per_query,
+        },
+        "cost": {
+            "in_per_query": cost_in,
+            "out_per_query": cost_out,
+            "per_query": cost_q,
+            "per_1k": 1000.0 * cost_q,
+            "per_day": cost_day,
+            "per_month": 30.0 * cost_day,
+        },
+        "latency": {
+            "prefill_s": s_prefill,
+            "decode_s": s_decode,
+            "service_base_s": s_base,
+            "p50_s": L_p50,
+            "p95_s": L_p95,
+            "rho": lam / mu_total,
+            "mu_qps": mu_total,
+            "stable": stable,
+            "safe_qps": mu_total * 0.7,
+            "p_wait": p_wait,
+        },
+    }
@@ -0,0 +1,169 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import asdict
+from typing import Any, Callable, Dict, Optional
+
+from .model import Params, plan
+
+INT_FIELDS = ("batch", "servers")
+PRUNE_EVERY = 1024
+
+
+def _copy(v):
+    if isinstance(v, dict):
+        return {k: _copy(x) for k, x in v.items()}
+    if isinstance(v, list):
+        return [_copy(x) for x in v]
+    return v
+
+
+def quantize(x: float, digits: int = 12) -> float:
+    return float(f"{float(x):.{digits}g}")
+
+
+def canonical_params(p: Params, digits: int = 12) -> Params:
+    kw = {}
+    for name, v in p.__dict__.items():
+        kw[name] = int(v) if name in INT_FIELDS else quantize(v, digits)
+    return Params(**kw)
+
+
+class ResultCache:
+    """LRU + TTL cache with canonical keys, copy-on-read values and an optional SQLite tier.
+
+    The SQLite tier drops expired rows and keeps the ``disk_maxsize`` newest ones;
+    it is pruned when opened and then every PRUNE_EVERY writes.
+    """
+
+    def __init__(self, maxsize: int = 8192, ttl: Optional[float] = None, digits: int = 12,
+                 path: Optional[str] = None, disk_maxsize: int = 65536):
+        self.maxsize = int(maxsize)
+        self.disk_maxsize = int(disk_maxsize)
+        self._writes = 0
+        self.ttl = ttl
+        self.digits = digits
+        self._data: "OrderedDict[str, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.disk_hits = 0
+        self.evictions = 0
+        self._db = None
+        if path:
+            self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("CREATE TABLE IF NOT EXISTS results (key TEXT PRIMARY KEY, value TEXT, expires REAL)")
+            with self._lock:
+                self._prune()
+
+    def key(self, p: Params, *extra) -> str:
+        q = canonical_params(p, self.digits)
+        return json.dumps([list(q.__dict__.values()), list(extra)])
+
+    def _expires(self) -> float:
+        return time.time() + self.ttl if self.ttl else float("inf")
+
+    def _get(self, key: str):
+        now = time.time()
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                if entry[0] > now:
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    return entry[1]
+                del self._data[key]
+        if self._db is not None:
+            with self._lock:
+                row = self._db.execute("SELECT value, expires FROM results WHERE key = ?", (key,)).fetchone()
+            if row is not None and (row[1] is None or row[1] > now):
+                value = json.loads(row[0])
+                self._put(key, value, row[1] if row[1] is not None else float("inf"), disk=False)
+                with self._lock:
+                    self.hits += 1
+                    self.disk_hits += 1
+                return value
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def _put(self, key: str, value: Any, expires: float, disk: bool = True):
+        with self._lock:
+            self._data[key] = (expires, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+            if disk and self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO results (key, value, expires) VALUES (?, ?, ?)",
+                    (key, json.dumps(value), None if expires == float("inf") else expires),
+                )
+                self._writes += 1
+                if self._writes % PRUNE_EVERY == 0:
+                    self._prune()
+
+    def _prune(self):
+        # INSERT OR REPLACE gives every write a fresh rowid, so rowid order is write order.
+        self._db.execute("DELETE FROM results WHERE expires <= ?", (time.time(),))
+        self._db.execute(
+            "DELETE FROM results WHERE rowid <= (SELECT rowid FROM results ORDER BY rowid DESC LIMIT 1 OFFSET ?)",
+            (self.disk_maxsize,),
+        )
+
+    def get_or_compute(self, key: str, compute: Callable[[], Any]) -> Any:
+        value = self._get(key)
+        if value is None:
+            value = compute()
+            self._put(key, value, self._expires())
+        return _copy(value)
+
+    def plan(self, p: Params, curve=None) -> Dict[str, Any]:
+        q = canonical_params(p, self.digits)
+        key = self.key(q, "plan") if curve is None else self.key(q, "plan", curve.key)
+        out = self.get_or_compute(key, lambda: plan(q, curve))
+        out["inputs"] = asdict(p)
+        return out
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM results")
+
+    def __len__(self):
+        return len(self._data)
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "disk_hits": self.disk_hits,
+            "evictions": self.evictions,
+            "hit_ratio": self.hits / total if total else 0.0,
+            "shared": self._db is not None,
+        }
+
+
+_default: Optional[ResultCache] = None
+
+
+def default_cache() -> ResultCache:
+    global _default
+    if _default is None:
+        ttl = float(os.getenv("PLAN_CACHE_TTL", "0")) or None
+        _default = ResultCache(
+            maxsize=int(os.getenv("PLAN_CACHE_SIZE", "8192")),
+            ttl=ttl,
+            path=os.getenv("PLAN_CACHE_DB") or None,
+            disk_maxsize=int(os.getenv("PLAN_CACHE_DB_SIZE", "65536")),
+        )
+    return _default
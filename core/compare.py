@@ -0,0 +1,93 @@
+from typing import Dict, Any, List, Optional, Sequence
+
+import numpy as np
+
+from .model import Params
+from .batch import FIELDS, plan_batch
+from .loadcurve import min_servers_batch
+from .pricing import PRICE_FIELDS, default_registry
+from .throughput import MAX_BATCH, ThroughputCurve, apply_curves
+
+
+def _profile_columns(p: Params, profiles: Sequence[Dict[str, Any]]) -> Dict[str, np.ndarray]:
+    n = len(profiles)
+    cols = {f: np.full(n, float(getattr(p, f))) for f in FIELDS}
+    for f in PRICE_FIELDS:
+        cols[f] = np.fromiter((float(prof[f]) for prof in profiles), dtype=float, count=n)
+    return cols
+
+
+def cheapest_config(cols: Dict[str, np.ndarray], sla_p95: Optional[float], rho_target: Optional[float],
+                    batch_max: int = 64, curves: Sequence[Optional[ThroughputCurve]] = (None,),
+                    which: Optional[np.ndarray] = None) -> Dict[str, np.ndarray]:
+    """Per row: the batch in 1..batch_max and smallest fleet with the lowest cost meeting the targets.
+
+    Every batch is tried with its minimum fleet; ties on cost go to the smaller batch.
+    Rows with no feasible configuration get batch = servers = 0. Row i uses
+    ``curves[which[i]]`` (see ``throughput.apply_curves``).
+    """
+    n = len(cols["qps"])
+    batches = np.arange(1, max(1, int(batch_max)) + 1)
+    nb = len(batches)
+    grid = {f: np.repeat(v, nb) for f, v in cols.items()}
+    grid["batch"] = np.tile(batches, n).astype(float)
+    grid_which = np.repeat(np.zeros(n, np.int64) if which is None else which, nb)
+    out = plan_batch(apply_curves(grid, curves, grid_which))
+    lam = np.maximum(0.0, grid["qps"]) * np.maximum(1.0, grid["burst_factor"])
+    slots = min_servers_batch(lam, out["latency"]["service_base_s"], sla_p95, rho_target)
+    # With a curve each server holds `batch` slots; the slot count is monotone, so round up.
+    per_server = np.where(np.array([cv is not None for cv in curves])[grid_which],
+                          np.minimum(grid["batch"], MAX_BATCH), 1.0)
+    k = np.ceil(slots / per_server).astype(np.int64).reshape(n, nb)
+    cost = np.where(k > 0, out["cost"]["per_query"].reshape(n, nb), np.inf)
+    best = np.argmin(cost, axis=1)
+    rows = np.arange(n)
+    feasible = np.isfinite(cost[rows, best])
+    return {
+        "batch": np.where(feasible, batches[best], 0),
+        "servers": np.where(feasible, k[rows, best], 0),
+    }
+
+
+def compare_profiles(p: Params, names: Optional[Sequence[str]] = None, optimize: bool = False,
+                     sla_p95: Optional[float] = 2.0, rho_target: Optional[float] = 0.7,
+                     batch_max: int = 64) -> Dict[str, Any]:
+    """Evaluate one workload under many pricing profiles in a single plan_batch pass, cheapest first.
+
+    With ``optimize`` each profile is re-sized to its cheapest batch/servers meeting the
+    targets; profiles that cannot meet them keep the input configuration and sort last.
+    """
+    index = default_registry().index()
+    names = list(index.names if names is None else names)
+    cols = _profile_columns(p, [index.get(name) for name in names])
+    curves = [index.curves.get(name) for name in names]
+    which = np.arange(len(names))
+    feasible = None
+    if optimize and names:
+        cfg = cheapest_config(cols, sla_p95, rho_target, batch_max, curves, which)
+        feasible = cfg["servers"] > 0
+        cols["batch"] = np.where(feasible, cfg["batch"], cols["batch"])
+        cols["servers"] = np.where(feasible, cfg["servers"], cols["servers"])
+    out = plan_batch(apply_curves(cols, curves, which) if names else cols)
+    lat = out["latency"]
+    if feasible is None:
+        feasible = lat["stable"].copy()
+        if sla_p95 is not None:
+            feasible &= lat["p95_s"] <= sla_p95
+        if rho_target is not None:
+            feasible &= lat["rho"] <= rho_target
+    order = np.lexsort((out["cost"]["per_query"], ~feasible))
+    cost_cols = {k: out["cost"][k].tolist() for k in ("per_query", "per_1k", "per_month")}
+    lat_cols = {k: lat[k].tolist() for k in ("p50_s", "p95_s", "rho", "mu_qps")}
+    batch, servers, ok = cols["batch"].tolist(), cols["servers"].tolist(), feasible.tolist()
+    results: List[Dict[str, Any]] = []
+    for i in order.tolist():
+        results.append({
+            "profile": names[i],
+            "batch": int(batch[i]),
+            "servers": int(servers[i]),
+            "meets_targets": ok[i],
+            "cost": {k: v[i] for k, v in cost_cols.items()},
+            "latency": {k: v[i] for k, v in lat_cols.items()},
+        })
+    return {"count": len(results), "optimized": bool(optimize), "results": results}
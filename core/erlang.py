@@ -0,0 +1,80 @@
+import math
+from typing import Dict, Iterable, Tuple
+
+
+def erlang_b(a: float, k: int) -> float:
+    if a <= 0.0:
+        return 0.0
+    b = 1.0
+    for n in range(1, int(k) + 1):
+        ab = a * b
+        b = ab / (n + ab)
+    return b
+
+
+def erlang_c(a: float, k: int) -> float:
+    """Probability of waiting in M/M/k with offered load ``a`` (requires a < k).
+
+    The Poisson(a) mass is summed in a window of about 10 standard deviations
+    around its mode, so the work is O(sqrt(a)) float operations, not O(k).
+    """
+    return _erlang_c_p0(a, k)[0]
+
+
+def _erlang_c_p0(a: float, k: int) -> Tuple[float, float]:
+    k = int(k)
+    if a <= 0.0:
+        return 0.0, 1.0
+    rho = a / k
+    if rho >= 1.0:
+        return 1.0, 0.0
+    log_a = math.log(a)
+    log_pk = k * log_a - a - math.lgamma(k + 1)
+    width = int(10.0 * math.sqrt(a)) + 20
+    lo = max(0, int(a) - width)
+    hi = min(k - 1, int(a) + width)
+    t = math.exp(lo * log_a - a - math.lgamma(lo + 1))
+    s = 0.0
+    for n in range(lo, hi + 1):
+        s += t
+        t *= a / (n + 1)
+    pn = math.exp(log_pk) / (1.0 - rho)
+    return pn / (s + pn), math.exp(-a) / (s + pn)
+
+
+class ErlangTable:
+    """Memoized Erlang C keyed by (k, utilization bucket), linearly interpolated."""
+
+    def __init__(self, buckets: int = 4096):
+        self.buckets = int(buckets)
+        self._values: Dict[Tuple[int, int], float] = {}
+
+    def _point(self, k: int, i: int) -> float:
+        key = (k, i)
+        v = self._values.get(key)
+        if v is None:
+            v = erlang_c(k * i / self.buckets, k) if i < self.buckets else 1.0
+            self._values[key] = v
+        return v
+
+    def lookup(self, a: float, k: int) -> float:
+        k = int(k)
+        rho = a / k
+        if rho <= 0.0:
+            return 0.0
+        if rho >= 1.0:
+            return 1.0
+        x = rho * self.buckets
+        i = int(x)
+        lo = self._point(k, i)
+        hi = self._point(k, i + 1)
+        return lo + (hi - lo) * (x - i)
+
+    def warm(self, ks: Iterable[int]):
+        for k in ks:
+            for i in range(self.buckets + 1):
+                self._point(int(k), i)
+        return self
+
+    def __len__(self):
+        return len(self._values)
@@ -0,0 +1,236 @@
+import csv
+import io
+import json
+import math
+import zlib
+from typing import Dict, Any, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .model import Params
+from .batch import FIELDS, DEFAULTS, params_to_columns, plan_batch, flatten_columns
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc as pa_ipc
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+
+EXPORT_FIELDS = {
+    "cost_per_query": "cost.per_query",
+    "cost_per_1k": "cost.per_1k",
+    "p50_s": "latency.p50_s",
+    "p95_s": "latency.p95_s",
+    "rho": "latency.rho",
+    "mu_qps": "latency.mu_qps",
+}
+FORMATS = ("csv", "json", "ndjson", "arrow", "parquet")
+
+
+def iter_export_chunks(items: Iterable[Tuple[str, Params]], chunk_size: int = 4096) -> Iterator[Dict[str, Any]]:
+    """Evaluate ``(name, params)`` pairs in chunks; yields ``{"name": [...], <column>: array}``."""
+    buf: List[Tuple[str, Params]] = []
+    for item in items:
+        buf.append(item)
+        if len(buf) >= chunk_size:
+            yield _evaluate(buf)
+            buf = []
+    if buf:
+        yield _evaluate(buf)
+
+
+def cached_export_chunk(items: Iterable[Tuple[str, Params]], cache) -> Dict[str, Any]:
+    """One export chunk from ``cache.plan`` (a ``core.cache.ResultCache``) instead of plan_batch."""
+    items = list(items)
+    plans = [cache.plan(p) for _, p in items]
+    out: Dict[str, Any] = {"name": [name for name, _ in items]}
+    for col, field in EXPORT_FIELDS.items():
+        group, key = field.split(".")
+        out[col] = np.array([r[group][key] for r in plans], dtype=float)
+    return out
+
+
+def _evaluate(items: List[Tuple[str, Params]]) -> Dict[str, Any]:
+    return export_columns(params_to_columns(p for _, p in items), [name for name, _ in items])
+
+
+def export_columns(cols: Mapping[str, Any], names: Sequence[str]) -> Dict[str, Any]:
+    flat = flatten_columns(plan_batch(cols), EXPORT_FIELDS.values())
+    out: Dict[str, Any] = {"name": names}
+    out.update({col: flat[field] for col, field in EXPORT_FIELDS.items()})
+    return out
+
+
+def iter_column_chunks(cols: Mapping[str, Any], names: Optional[Sequence[str]] = None,
+                       chunk_size: int = 65536) -> Iterator[Dict[str, Any]]:
+    """Export chunks straight from parameter columns, e.g. as returned by ``read_scenarios``."""
+    n = len(cols["qps"])
+    for start in range(0, n, chunk_size):
+        stop = min(n, start + chunk_size)
+        part = names[start:stop] if names is not None else np.char.add("s", np.arange(start, stop).astype(str))
+        yield export_columns({k: v[start:stop] for k, v in cols.items()}, part)
+
+
+def _rows(chunk: Dict[str, Any]) -> Iterator[list]:
+    return zip(*(v.tolist() if isinstance(v, np.ndarray) else v for v in chunk.values()))
+
+
+def _finite(v):
+    return v if not isinstance(v, float) or math.isfinite(v) else None
+
+
+def encode_csv(chunks: Iterable[Dict[str, Any]]) -> Iterator[str]:
+    buf = io.StringIO()
+    writer = csv.writer(buf, lineterminator="\n")
+    writer.writerow(["name", *EXPORT_FIELDS])
+    for chunk in chunks:
+        writer.writerows(_rows(chunk))
+        yield buf.getvalue()
+        buf.seek(0)
+        buf.truncate()
+    yield buf.getvalue()
+
+
+def _json_rows(chunk: Dict[str, Any]) -> Iterator[str]:
+    keys = ["name", *EXPORT_FIELDS]
+    return (json.dumps(dict(zip(keys, map(_finite, row))), ensure_ascii=False) for row in _rows(chunk))
+
+
+def encode_ndjson(chunks: Iterable[Dict[str, Any]]) -> Iterator[str]:
+    for chunk in chunks:
+        yield "".join(row + "\n" for row in _json_rows(chunk))
+
+
+def encode_json(chunks: Iterable[Dict[str, Any]]) -> Iterator[str]:
+    # A JSON array written incrementally, so it never exists in memory as a whole.
+    sep = "["
+    for chunk in chunks:
+        part = ",".join(_json_rows(chunk))
+        if part:
+            yield sep + part
+            sep = ","
+    yield "[]" if sep == "[" else "]"
+
+
+def _require_arrow():
+    if pa is None:
+        raise ImportError("pyarrow is required for Arrow and Parquet support (pip install pyarrow)")
+
+
+class _Drain:
+    """Write-only sink whose buffered bytes are handed out between record batches."""
+
+    closed = False
+
+    def __init__(self):
+        self._parts: List[bytes] = []
+        self._pos = 0
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self._parts.append(data)
+        self._pos += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._pos
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def drain(self) -> bytes:
+        out = b"".join(self._parts)
+        self._parts = []
+        return out
+
+
+def arrow_schema():
+    _require_arrow()
+    return pa.schema([("name", pa.string())] + [(col, pa.float64()) for col in EXPORT_FIELDS])
+
+
+def arrow_batch(chunk: Mapping[str, Any]):
+    _require_arrow()
+    arrays = [pa.array(chunk["name"], pa.string())]
+    arrays += [pa.array(np.asarray(chunk[col], dtype=float)) for col in EXPORT_FIELDS]
+    return pa.record_batch(arrays, schema=arrow_schema())
+
+
+def _encode_columnar(chunks: Iterable[Dict[str, Any]], fmt: str) -> Iterator[bytes]:
+    sink = _Drain()
+    schema = arrow_schema()
+    writer = pa_ipc.new_stream(sink, schema) if fmt == "arrow" else pq.ParquetWriter(sink, schema)
+    for chunk in chunks:
+        writer.write_batch(arrow_batch(chunk))
+        data = sink.drain()
+        if data:
+            yield data
+    writer.close()
+    yield sink.drain()
+
+
+def encode_arrow(chunks: Iterable[Dict[str, Any]]) -> Iterator[bytes]:
+    _require_arrow()
+    return _encode_columnar(chunks, "arrow")
+
+
+def encode_parquet(chunks: Iterable[Dict[str, Any]]) -> Iterator[bytes]:
+    _require_arrow()
+    return _encode_columnar(chunks, "parquet")
+
+
+ENCODERS = {"csv": encode_csv, "json": encode_json, "ndjson": encode_ndjson,
+            "arrow": encode_arrow, "parquet": encode_parquet}
+
+
+def write_scenarios(path, cols: Mapping[str, Any], names: Optional[Sequence[str]] = None):
+    """Write scenario parameters as Parquet (``.parquet``) or Arrow IPC (anything else)."""
+    _require_arrow()
+    data = {} if names is None else {"name": pa.array(list(names), pa.string())}
+    data.update({f: pa.array(np.asarray(cols[f], dtype=float)) for f in FIELDS if f in cols})
+    table = pa.table(data)
+    if str(path).endswith(".parquet"):
+        pq.write_table(table, path)
+    else:
+        with pa_ipc.new_file(path, table.schema) as writer:
+            writer.write_table(table)
+
+
+def read_scenarios(path) -> Dict[str, np.ndarray]:
+    """Scenario columns from a Parquet or Arrow IPC file, memory-mapped.
+
+    Numeric columns without nulls come back as zero-copy views over the mapping
+    when the file holds a single chunk (Arrow IPC file format).
+    """
+    _require_arrow()
+    if str(path).endswith(".parquet"):
+        table = pq.read_table(path, memory_map=True)
+    else:
+        source = pa.memory_map(str(path))
+        try:
+            table = pa_ipc.open_file(source).read_all()
+        except pa.ArrowInvalid:
+            source.seek(0)
+            table = pa_ipc.open_stream(source).read_all()
+    out = {}
+    for name in table.column_names:
+        if name == "name" or name in FIELDS:
+            col = table.column(name)
+            out[name] = col.to_numpy(zero_copy_only=False) if name == "name" else col.to_numpy()
+    missing = [f for f in FIELDS if f not in out and f not in DEFAULTS]
+    if missing:
+        raise KeyError(f"missing columns: {', '.join(missing)}")
+    return out
+
+
+def gzip_stream(parts: Iterable, level: int = 6) -> Iterator[bytes]:
+    z = zlib.compressobj(level, zlib.DEFLATED, 31)
+    for part in parts:
+        data = z.compress(part if isinstance(part, bytes) else part.encode("utf-8"))
+        if data:
+            yield data
+    yield z.flush()
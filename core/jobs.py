@@ -0,0 +1,201 @@
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, Future
+from typing import Dict, Any, List, Mapping, Optional, Sequence
+
+from .model import Params
+from .batch import plan_batch, flatten_columns
+from .pareto import space_chunk, space_size
+from .presets import get_presets
+from .pricing import apply_profile, list_profiles
+
+DEFAULT_FIELDS = ("cost.per_query", "cost.per_month", "latency.p95_s", "latency.rho")
+
+
+def run_shard(params: Dict[str, Any], space: Mapping[str, Sequence[float]], start: int, stop: int,
+              fields: Sequence[str]) -> Dict[str, List[float]]:
+    cols = space_chunk(Params(**params), space, start, stop)
+    out = flatten_columns(plan_batch(cols), fields)
+    rows = {name: cols[name].tolist() for name in space}
+    rows.update({name: arr.tolist() for name, arr in out.items()})
+    return rows
+
+
+def expand_sweep(spec: Mapping[str, Any]) -> List[Dict[str, Any]]:
+    """One base scenario per preset x pricing profile; ``params`` overrides presets."""
+    if spec.get("params") is not None:
+        bases = {"custom": Params(**spec["params"])}
+    else:
+        presets = get_presets()
+        names = spec.get("presets") or list(presets)
+        bases = {name: presets[name] for name in names}
+    profiles = spec.get("profiles")
+    if profiles == ["*"]:
+        profiles = list_profiles()
+    out = []
+    for preset, p in bases.items():
+        for profile in profiles or [None]:
+            q = apply_profile(p, profile) if profile else p
+            out.append({"preset": preset, "profile": profile, "params": dict(q.__dict__)})
+    return out
+
+
+class Job:
+    def __init__(self, job_id: str, spec: Mapping[str, Any]):
+        self.id = job_id
+        self.spec = spec
+        self.status = "queued"
+        self.created = time.time()
+        self.finished: Optional[float] = None
+        self.error: Optional[str] = None
+        self.shards_total = 0
+        self.rows_total = 0
+        self.results: List[Dict[str, Any]] = []
+        self.futures: List[Future] = []
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "status": self.status,
+            "shards_total": self.shards_total,
+            "shards_done": len(self.results),
+            "rows_total": self.rows_total,
+            "rows_done": sum(r["rows"] for r in self.results),
+            "created": self.created,
+            "finished": self.finished,
+            "error": self.error,
+        }
+
+
+class JobManager:
+    """Runs sweeps in a process pool; shard results are kept in this process as lists.
+
+    Finished jobs are evicted oldest first once there are more than ``max_jobs`` or
+    they hold more than ``max_rows`` rows in total (~200 bytes a row with the default
+    fields). Queued and running jobs are never evicted.
+    """
+
+    def __init__(self, workers: Optional[int] = None, shard_rows: int = 65536, max_jobs: int = 64,
+                 max_rows: int = 10_000_000):
+        self.workers = workers or int(os.getenv("JOB_WORKERS", "0")) or os.cpu_count() or 1
+        self.shard_rows = shard_rows
+        self.max_jobs = max_jobs
+        self.max_rows = max_rows
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _executor(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.workers)
+        return self._pool
+
+    def submit(self, spec: Mapping[str, Any]) -> Job:
+        space = dict(spec.get("grid") or {})
+        fields = list(spec.get("fields") or DEFAULT_FIELDS)
+        bases = expand_sweep(spec)
+        if bases:
+            # Fail fast on unknown axes or result fields before anything is queued.
+            run_shard(bases[0]["params"], space, 0, 1, fields)
+        job = Job(uuid.uuid4().hex, spec)
+        per_base = space_size(space)
+        job.rows_total = per_base * len(bases)
+        shards = [
+            (base, start, min(per_base, start + self.shard_rows))
+            for base in bases
+            for start in range(0, per_base, self.shard_rows)
+        ]
+        job.shards_total = len(shards)
+        with self._lock:
+            self._jobs[job.id] = job
+            self._evict()
+        if not shards:
+            job.status = "done"
+            job.finished = time.time()
+            return job
+        job.status = "running"
+        pool = self._executor()
+        # A failing shard cancels job.futures from its callback, so the list must be complete first.
+        job.futures = [pool.submit(run_shard, base["params"], space, start, stop, fields)
+                       for base, start, stop in shards]
+        for fut, (base, start, stop) in zip(job.futures, shards):
+            fut.add_done_callback(lambda f, b=base, s=start, e=stop: self._collect(job, b, s, e, f))
+        return job
+
+    def _evict(self):
+        rows = sum(j.rows_total for j in self._jobs.values())
+        for old_id, old in list(self._jobs.items()):
+            if len(self._jobs) <= self.max_jobs and rows <= self.max_rows:
+                break
+            if old.status not in ("queued", "running"):
+                del self._jobs[old_id]
+                rows -= old.rows_total
+
+    def _collect(self, job: Job, base: Dict[str, Any], start: int, stop: int, fut: Future):
+        if fut.cancelled():
+            return
+        err = fut.exception()
+        with self._lock:
+            if job.status != "running":
+                return
+            if err is not None:
+                job.status = "failed"
+                job.error = str(err)
+                job.finished = time.time()
+            else:
+                job.results.append({
+                    "preset": base["preset"], "profile": base["profile"],
+                    "start": start, "rows": stop - start, "columns": fut.result(),
+                })
+                if len(job.results) == job.shards_total:
+                    job.status = "done"
+                    job.finished = time.time()
+        if err is not None:
+            # Cancelling runs done-callbacks synchronously, so do it outside the lock.
+            for f in job.futures:
+                f.cancel()
+
+    def get(self, job_id: str) -> Optional[Job]:
+        return self._jobs.get(job_id)
+
+    def results(self, job_id: str, offset: int = 0) -> List[Dict[str, Any]]:
+        job = self._jobs[job_id]
+        with self._lock:
+            return job.results[offset:]
+
+    def cancel(self, job_id: str) -> Job:
+        """Drops queued shards; shards already running in a worker process cannot be
+        interrupted, they finish and their results are discarded."""
+        job = self._jobs[job_id]
+        with self._lock:
+            if job.status not in ("queued", "running"):
+                return job
+            job.status = "cancelled"
+            job.finished = time.time()
+        for f in job.futures:
+            f.cancel()
+        return job
+
+    def list(self) -> List[Dict[str, Any]]:
+        return [j.summary() for j in list(self._jobs.values())]
+
+    def active(self) -> int:
+        return sum(1 for j in list(self._jobs.values()) if j.status in ("queued", "running"))
+
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+
+_default: Optional[JobManager] = None
+
+
+def default_manager() -> JobManager:
+    global _default
+    if _default is None:
+        _default = JobManager()
+    return _default
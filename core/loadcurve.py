@@ -0,0 +1,154 @@
+import math
+from typing import Dict, Any, Optional, Sequence
+
+import numpy as np
+
+from .model import Params
+from .batch import plan_batch, erlang_c_batch
+from .solve import _service_base, min_servers, MAX_SERVERS
+
+
+def _p95_batch(lam: np.ndarray, s_base: float, k: np.ndarray) -> np.ndarray:
+    a = lam * s_base
+    stable = a < k
+    C = np.ones_like(a)
+    if stable.any():
+        C[stable] = erlang_c_batch(a[stable], k[stable])
+    C = np.where(k == 1, np.minimum(a, 0.999999), C)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        wq = C / (k / s_base - lam)
+    return np.where(stable, s_base + 3.0 * wq, np.inf)
+
+
+def capacity_thresholds(s_base: float, k_max: int, sla_p95: Optional[float], rho_target: Optional[float],
+                        iterations: int = 48) -> np.ndarray:
+    """Largest arrival rate each fleet size 1..k_max can take within the targets."""
+    k = np.arange(1, k_max + 1)
+    hi = k / s_base
+    if rho_target is not None:
+        hi = np.minimum(hi, rho_target * k / s_base)
+    if sla_p95 is None:
+        return hi
+    lo = np.zeros_like(hi)
+    ok_hi = _p95_batch(hi, s_base, k) <= sla_p95
+    for _ in range(iterations):
+        mid = 0.5 * (lo + hi)
+        ok = _p95_batch(mid, s_base, k) <= sla_p95
+        lo = np.where(ok, mid, lo)
+        hi = np.where(ok, hi, mid)
+    return np.where(ok_hi, hi, lo)
+
+
+def min_servers_batch(lam: np.ndarray, s_base: np.ndarray, sla_p95: Optional[float], rho_target: Optional[float],
+                      k_max: int = MAX_SERVERS) -> np.ndarray:
+    """Vectorized ``solve.min_servers``: smallest fleet per row, 0 where no fleet up to ``k_max`` works."""
+    lam, s_base = np.broadcast_arrays(np.asarray(lam, dtype=float), np.asarray(s_base, dtype=float))
+    a = lam * s_base
+
+    def ok(rows, k):
+        good = _p95_batch(lam[rows], s_base[rows], k) <= sla_p95 if sla_p95 is not None else np.ones(len(k), bool)
+        if rho_target is not None:
+            good &= a[rows] / k <= rho_target
+        return good
+
+    lo = np.floor(a).astype(np.int64) + 1
+    if rho_target is not None and rho_target > 0:
+        lo = np.maximum(lo, np.ceil(a / rho_target).astype(np.int64))
+    possible = np.ones(len(a), bool) if sla_p95 is None else s_base <= sla_p95
+    # Square-root staffing bracket, as in min_servers: grow [lo, hi] until hi is feasible.
+    step = np.maximum(1, np.sqrt(a).astype(np.int64))
+    hi = lo.copy()
+    bad = np.flatnonzero(possible)
+    bad = bad[~ok(bad, hi[bad])]
+    while bad.size:
+        lo[bad] = hi[bad] + 1
+        hi[bad] = lo[bad] + step[bad]
+        step[bad] *= 2
+        over = hi[bad] > k_max
+        possible[bad[over]] = False
+        bad = bad[~over]
+        bad = bad[~ok(bad, hi[bad])]
+    open_ = np.flatnonzero(possible & (lo < hi))
+    while open_.size:
+        mid = (lo[open_] + hi[open_]) // 2
+        good = ok(open_, mid)
+        hi[open_] = np.where(good, mid, hi[open_])
+        lo[open_] = np.where(good, lo[open_], mid + 1)
+        open_ = open_[lo[open_] < hi[open_]]
+    return np.where(possible, hi, 0)
+
+
+def plan_load_curve(p: Params, qps: Sequence[float], interval_s: float = 3600.0, sla_p95: Optional[float] = 2.0,
+                    rho_target: Optional[float] = 0.7, server_cost_per_hour: float = 0.0,
+                    autoscale: bool = True, min_fleet: int = 1) -> Dict[str, Any]:
+    qps = np.maximum(0.0, np.asarray(qps, dtype=float))
+    n = len(qps)
+    if n == 0:
+        raise ValueError("qps series is empty")
+    interval_s = float(interval_s)
+    if not (interval_s > 0 and math.isfinite(interval_s)):
+        raise ValueError("interval_s must be a positive number of seconds")
+    burst = max(1.0, float(p.burst_factor))
+    lam = qps * burst
+    s_base = _service_base(p)
+
+    if autoscale:
+        peak = Params(**{**p.__dict__, "qps": float(qps.max())})
+        top = min_servers(peak, sla_p95=sla_p95, rho_target=rho_target)
+        if top["servers"] is None:
+            raise ValueError(top["reason"])
+        k_peak = max(int(min_fleet), top["servers"])
+        thr = capacity_thresholds(s_base, k_peak, sla_p95, rho_target)
+        # Guard against bisection round-off at the very top of the table.
+        thr = np.maximum.accumulate(thr)
+        thr[-1] = max(thr[-1], float(lam.max()))
+        servers = np.searchsorted(thr, lam, side="left") + 1
+        servers = np.maximum(servers, int(min_fleet))
+    else:
+        k_peak = max(1, int(p.servers))
+        servers = np.full(n, k_peak)
+
+    cols = {f: getattr(p, f) for f in p.__dict__}
+    cols["qps"] = qps
+    cols["servers"] = servers
+    out = plan_batch(cols)
+    hours = interval_s / 3600.0
+    cost_tokens = qps * interval_s * out["cost"]["per_query"]
+    cost_servers = servers * hours * server_cost_per_hour
+    per_day = max(1, int(round(86400.0 / interval_s)))
+    day = np.arange(n) // per_day
+
+    def daily(x):
+        return np.bincount(day, weights=x)
+
+    duration_days = n * interval_s / 86400.0
+    tokens_total = float(cost_tokens.sum())
+    servers_total = float(cost_servers.sum())
+    static_total = k_peak * n * hours * server_cost_per_hour
+    scale = 30.0 / duration_days
+    return {
+        "intervals": {
+            "qps": qps,
+            "servers": servers,
+            "p95_s": out["latency"]["p95_s"],
+            "rho": out["latency"]["rho"],
+            "cost_tokens": cost_tokens,
+            "cost_servers": cost_servers,
+        },
+        "daily": {
+            "cost_tokens": daily(cost_tokens),
+            "cost_servers": daily(cost_servers),
+            "server_hours": daily(servers * hours),
+        },
+        "totals": {
+            "days": duration_days,
+            "peak_servers": int(servers.max()),
+            "mean_servers": float(servers.mean()),
+            "cost_tokens": tokens_total,
+            "cost_servers": servers_total,
+            "cost_servers_static": static_total,
+            "autoscaling_savings": static_total - servers_total,
+            "cost_total": tokens_total + servers_total,
+            "per_month": (tokens_total + servers_total) * scale,
+        },
+    }
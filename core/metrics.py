@@ -0,0 +1,158 @@
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+# Starts at 0 so cached /optimize responses (0 evaluations) get their own bucket.
+COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000)
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+class Histogram:
+    """Fixed-bucket histogram; counts live in a pre-allocated list.
+
+    Updates take no lock. Under the GIL a concurrent increment can very rarely
+    be lost, which is fine for monitoring and keeps observe() at ~1us.
+    """
+
+    __slots__ = ("buckets", "counts", "sum")
+
+    def __init__(self, buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+
+    def observe(self, v: float):
+        self.counts[bisect_left(self.buckets, v)] += 1
+        self.sum += v
+
+    @property
+    def count(self) -> int:
+        return sum(self.counts)
+
+
+class Registry:
+    def __init__(self):
+        self._hists: Dict[str, Dict[Labels, Histogram]] = {}
+        self._counters: Dict[str, Dict[Labels, float]] = {}
+        self._buckets: Dict[str, Sequence[float]] = {}
+        self._help: Dict[str, str] = {}
+        self._gauges: Dict[str, Callable[[], Iterable[Tuple[Labels, float]]]] = {}
+
+    def histogram(self, name: str, help: str, buckets: Sequence[float] = LATENCY_BUCKETS):
+        self._hists.setdefault(name, {})
+        self._buckets[name] = buckets
+        self._help[name] = help
+
+    def counter(self, name: str, help: str):
+        self._counters.setdefault(name, {})
+        self._help[name] = help
+
+    def gauge(self, name: str, help: str, fn: Callable[[], Iterable[Tuple[Labels, float]]]):
+        self._gauges[name] = fn
+        self._help[name] = help
+
+    def observe(self, name: str, v: float, **labels: str):
+        series = self._hists[name]
+        key = tuple(sorted(labels.items()))
+        h = series.get(key)
+        if h is None:
+            h = series.setdefault(key, Histogram(self._buckets[name]))
+        h.observe(v)
+
+    def inc(self, name: str, v: float = 1.0, **labels: str):
+        series = self._counters[name]
+        key = tuple(sorted(labels.items()))
+        series[key] = series.get(key, 0.0) + v
+
+    def get(self, name: str, **labels: str) -> Optional[Histogram]:
+        return self._hists.get(name, {}).get(tuple(sorted(labels.items())))
+
+    def render(self) -> str:
+        """Prometheus text exposition format (version 0.0.4)."""
+        out: List[str] = []
+        for name, series in self._counters.items():
+            out += [f"# HELP {name} {self._help[name]}", f"# TYPE {name} counter"]
+            out += [f"{name}{_fmt(key)} {_num(v)}" for key, v in list(series.items())]
+        for name, fn in self._gauges.items():
+            out += [f"# HELP {name} {self._help[name]}", f"# TYPE {name} gauge"]
+            out += [f"{name}{_fmt(key)} {_num(v)}" for key, v in fn()]
+        for name, series in self._hists.items():
+            out += [f"# HELP {name} {self._help[name]}", f"# TYPE {name} histogram"]
+            for key, h in list(series.items()):
+                counts = list(h.counts)
+                cum = 0
+                for le, c in zip(h.buckets, counts):
+                    cum += c
+                    out.append(f"{name}_bucket{_fmt(key + (('le', _num(le)),))} {cum}")
+                cum += counts[-1]
+                out.append(f"{name}_bucket{_fmt(key + (('le', '+Inf'),))} {cum}")
+                out.append(f"{name}_sum{_fmt(key)} {_num(h.sum)}")
+                out.append(f"{name}_count{_fmt(key)} {cum}")
+        return "\n".join(out) + "\n"
+
+
+def _num(v: float) -> str:
+    v = float(v)
+    return str(int(v)) if v.is_integer() else repr(v)
+
+
+def _fmt(key: Labels) -> str:
+    if not key:
+        return ""
+    return "{" + ",".join(f'{k}="{v}"' for k, v in key) + "}"
+
+
+class RequestTiming:
+    __slots__ = ("start", "compute_start", "compute_end", "compute")
+
+    def __init__(self, start: float):
+        self.start = start
+        self.compute_start: Optional[float] = None
+        self.compute_end: Optional[float] = None
+        self.compute = 0.0
+
+
+_current: ContextVar[Optional[RequestTiming]] = ContextVar("request_timing", default=None)
+
+
+def begin_request() -> RequestTiming:
+    t = RequestTiming(time.perf_counter())
+    _current.set(t)
+    return t
+
+
+@contextmanager
+def stage():
+    """Marks the compute part of a handler.
+
+    Time from request start to the first ``stage()`` counts as validation
+    (routing, body parsing, pydantic) and time after the last one as
+    serialization, so one block per handler splits a request into three stages.
+    The timing object is shared by reference, so this also works inside the
+    threadpool that runs sync endpoints.
+    """
+    t = _current.get()
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        if t is not None:
+            t1 = time.perf_counter()
+            if t.compute_start is None:
+                t.compute_start = t0
+            t.compute_end = t1
+            t.compute += t1 - t0
+
+
+def stages(t: RequestTiming, end: float) -> Dict[str, float]:
+    if t.compute_start is None:
+        return {}
+    return {
+        "validate": t.compute_start - t.start,
+        "compute": t.compute,
+        "serialize": end - t.compute_end,
+    }
@@ -1,6 +1,7 @@
 from dataclasses import dataclass, asdict
-import math
-from typing import Dict, Any
+from typing import Dict, Any, List
+
+from .erlang import _erlang_c_p0
 
 @dataclass
 class Params:
@@ -35,16 +36,113 @@ def _erlang_c(lam, mu, k):
     rho_k = a / k if k > 0 else 1.0
     if rho_k >= 1.0:
         return rho_k, 1.0, 0.0, float("inf")
-    s = 0.0
-    for n in range(k):
-        s += (a**n) / math.factorial(n)
-    pn = (a**k) / math.factorial(k) * (1.0 / (1.0 - rho_k))
-    p0 = 1.0 / (s + pn)
-    pw = pn * p0
+    pw, p0 = _erlang_c_p0(a, k)
     wq = pw / (k * mu - lam)
     return rho_k, pw, p0, wq
 
-def plan(p: Params) -> Dict[str, Any]:
+class PlanResult:
+    """Scalar outputs of one plan evaluation; the nested plan() dict is built by to_dict().
+
+    Holds a reference to the input Params rather than a copy of them.
+    """
+
+    __slots__ = ("inputs", "T_ctx_eff", "T_ctx_eff_batch", "T_in_per_query", "T_out_per_query",
+                 "in_per_query", "out_per_query", "per_query", "per_day", "prefill_s", "decode_s",
+                 "service_base_s", "p50_s", "p95_s", "rho", "mu_qps", "stable", "p_wait", "slots")
+
+    def __init__(self, inputs: Params, T_ctx_eff, T_ctx_eff_batch, T_in_per_query, T_out_per_query,
+                 in_per_query, out_per_query, per_query, per_day, prefill_s, decode_s, service_base_s,
+                 p50_s, p95_s, rho, mu_qps, stable, p_wait, slots=None):
+        self.inputs = inputs
+        self.T_ctx_eff = T_ctx_eff
+        self.T_ctx_eff_batch = T_ctx_eff_batch
+        self.T_in_per_query = T_in_per_query
+        self.T_out_per_query = T_out_per_query
+        self.in_per_query = in_per_query
+        self.out_per_query = out_per_query
+        self.per_query = per_query
+        self.per_day = per_day
+        self.prefill_s = prefill_s
+        self.decode_s = decode_s
+        self.service_base_s = service_base_s
+        self.p50_s = p50_s
+        self.p95_s = p95_s
+        self.rho = rho
+        self.mu_qps = mu_qps
+        self.stable = stable
+        self.p_wait = p_wait
+        self.slots = slots
+
+    @property
+    def per_1k(self) -> float:
+        return 1000.0 * self.per_query
+
+    @property
+    def per_month(self) -> float:
+        return 30.0 * self.per_day
+
+    @property
+    def safe_qps(self) -> float:
+        return self.mu_qps * 0.7
+
+    def recommendations(self) -> List[str]:
+        p = self.inputs
+        recs = []
+        if not self.stable:
+            recs.append("Queue is unstable: increase servers or reduce QPS.")
+        if max(0.0, float(p.T_ctx)) > 2000 and _clamp(p.cache_hit, 0.0, 1.0) < 0.5:
+            recs.append("Input cost is dominant: prune context or improve cache hit/savings.")
+        if self.p95_s != float("inf") and self.p95_s > 2.0:
+            recs.append("p95 exceeds 2s: reduce response length or use a faster decode model.")
+        if self.out_per_query > self.in_per_query:
+            recs.append("Output cost dominates: reduce T_resp or return a more compact format.")
+        return recs
+
+    def to_dict(self) -> Dict[str, Any]:
+        latency = {
+            "prefill_s": self.prefill_s,
+            "decode_s": self.decode_s,
+            "service_base_s": self.service_base_s,
+            "p50_s": self.p50_s,
+            "p95_s": self.p95_s,
+            "rho": self.rho,
+            "mu_qps": self.mu_qps,
+            "stable": self.stable,
+            "safe_qps": self.safe_qps,
+            "p_wait": self.p_wait
+        }
+        if self.slots is not None:
+            latency["slots"] = self.slots
+        return {
+            "inputs": asdict(self.inputs),
+            "tokens": {
+                "T_ctx_eff": self.T_ctx_eff,
+                "T_ctx_eff_batch": self.T_ctx_eff_batch,
+                "T_in_per_query": self.T_in_per_query,
+                "T_out_per_query": self.T_out_per_query
+            },
+            "cost": {
+                "in_per_query": self.in_per_query,
+                "out_per_query": self.out_per_query,
+                "per_query": self.per_query,
+                "per_1k": self.per_1k,
+                "per_day": self.per_day,
+                "per_month": self.per_month
+            },
+            "latency": latency,
+            "recommendations": self.recommendations(),
+            "version": "stage1-core-2.0"
+        }
+
+
+def plan_result(p: Params, curve=None) -> PlanResult:
+    if curve is not None:
+        # Batch-aware speeds and slots from a core.throughput.ThroughputCurve.
+        eff = curve.effective(p)
+        r = plan_result(eff)
+        r.inputs = p
+        r.slots = eff.servers
+        return r
     h = _clamp(p.cache_hit, 0.0, 1.0)
     s = _clamp(p.cache_savings, 0.0, 1.0)
     b = max(1, int(p.batch))
@@ -65,7 +163,6 @@ def plan(p: Params) -> Dict[str, Any]:
     cost_in = (T_in_per_query / 1000.0) * P_in
     cost_out = (T_out_per_query / 1000.0) * P_out
     cost_q = cost_in + cost_out
-    cost_1k = 1000.0 * cost_q
     s_prefill = T_in_per_query / tps_prefill
     s_decode = T_out_per_query / tps_decode
     s_base = s_prefill + s_decode + net_rtt_s
@@ -81,67 +178,16 @@ def plan(p: Params) -> Dict[str, Any]:
         L_p95 = float("inf")
     qpd = (lam / max(1.0, float(p.burst_factor))) * 86400.0
     cost_day = qpd * cost_q
-    cost_month = 30.0 * cost_day
     mu_total = k * mu
     rho_total = lam / mu_total if mu_total > 0 else 1.0
-    safe_qps = mu_total * 0.7
-    recs = []
-    if not stable:
-        recs.append("Queue is unstable: increase servers or reduce QPS.")
-    if T_ctx > 2000 and h < 0.5:
-        recs.append("Input cost is dominant: prune context or improve cache hit/savings.")
-    if L_p95 != float("inf") and L_p95 > 2.0:
-        recs.append("p95 exceeds 2s: reduce response length or use a faster decode model.")
-    if cost_out > cost_in:
-        recs.append("Output cost dominates: reduce T_resp or return a more compact format.")
-    return {
-        "inputs": asdict(p),
-        "tokens": {
-            "T_ctx_eff": T_ctx_eff,
-            "T_ctx_eff_batch": T_ctx_eff_batch,
-            "T_in_per_query": T_in_per_query,
-            "T_out_per_query": T_out_per_query
-        },
-        "cost": {
-            "in_per_query": cost_in,
-            "out_per_query": cost_out,
-            "per_query": cost_q,
-            "per_1k": cost_1k,
-            "per_day": cost_day,
-            "per_month": cost_month
-        },
-        "latency": {
-            "prefill_s": s_prefill,
-            "decode_s": s_decode,
-            "service_base_s": s_base,
-            "p50_s": L_p50,
-            "p95_s": L_p95,
-            "rho": rho_total,
-            "mu_qps": mu_total,
-            "stable": stable,
-            "safe_qps": safe_qps,
-            "p_wait": p_wait
-        },
-        "recommendations": recs,
-        "version": "stage1-core-2.0"
-    }
-from functools import lru_cache
-
-def _key_from_params(p: Params):
-    return (
-        p.T_ctx, p.T_prompt, p.T_resp, p.qps, p.cache_hit, p.cache_savings, int(p.batch),
-        p.price_in, p.price_out, p.tps_prefill, p.tps_decode, p.net_ms_one_way,
-        int(getattr(p, "servers", 1)), float(getattr(p, "burst_factor", 1.0))
-    )
-
-@lru_cache(maxsize=8192)
-def _plan_cached_key(key):
-    return plan(Params(
-        T_ctx=key[0], T_prompt=key[1], T_resp=key[2], qps=key[3],
-        cache_hit=key[4], cache_savings=key[5], batch=key[6],
-        price_in=key[7], price_out=key[8], tps_prefill=key[9], tps_decode=key[10],
-        net_ms_one_way=key[11], servers=key[12], burst_factor=key[13]
-    ))
-
-def plan_cached(p: Params):
-    return _plan_cached_key(_key_from_params(p))
+    return PlanResult(p, T_ctx_eff, T_ctx_eff_batch, T_in_per_query, T_out_per_query, cost_in, cost_out,
+                      cost_q, cost_day, s_prefill, s_decode, s_base, L_p50, L_p95, rho_total, mu_total,
+                      stable, p_wait)
+
+
+def plan(p: Params, curve=None) -> Dict[str, Any]:
+    return plan_result(p, curve).to_dict()
+
+def plan_cached(p: Params) -> Dict[str, Any]:
+    from .cache import default_cache
+    return default_cache().plan(p)
@@ -0,0 +1,100 @@
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Any, List, Mapping, Optional, Sequence
+
+import numpy as np
+
+from .model import Params
+from .batch import FIELDS, plan_batch, flatten_columns, params_to_columns
+from .throughput import apply_curves
+
+OUTPUTS = ("cost.per_month", "latency.p95_s")
+QUANTILES = (0.05, 0.5, 0.95)
+SHARD_SIZE = 262144
+INT_FIELDS = ("batch", "servers")
+
+
+def draw(spec: Mapping[str, Any], n: int, rng: np.random.Generator) -> np.ndarray:
+    """``n`` samples of one distribution spec, optionally clipped to ``min``/``max``.
+
+    Specs: ``{"dist": "normal", "mean", "std"}``, ``{"dist": "lognormal", "median", "sigma"}``,
+    ``{"dist": "triangular", "low", "mode", "high"}`` or ``{"dist": "empirical", "samples": [...]}``
+    (resampled with replacement).
+    """
+    kind = spec.get("dist")
+    try:
+        if kind == "normal":
+            x = rng.normal(float(spec["mean"]), float(spec["std"]), n)
+        elif kind == "lognormal":
+            x = rng.lognormal(np.log(float(spec["median"])), float(spec["sigma"]), n)
+        elif kind == "triangular":
+            x = rng.triangular(float(spec["low"]), float(spec["mode"]), float(spec["high"]), n)
+        elif kind == "empirical":
+            samples = np.asarray(spec["samples"], dtype=float)
+            if samples.ndim != 1 or samples.size == 0:
+                raise ValueError("empirical samples must be a non-empty list of numbers")
+            x = samples[rng.integers(0, samples.size, n)]
+        else:
+            raise ValueError(f"unknown distribution: {kind!r}")
+    except KeyError as e:
+        raise ValueError(f"{kind} distribution needs {e.args[0]!r}") from None
+    if "min" in spec or "max" in spec:
+        x = np.clip(x, spec.get("min", -np.inf), spec.get("max", np.inf))
+    return x
+
+
+def run_shard(params: Dict[str, Any], dists: Mapping[str, Mapping[str, Any]], n: int, seed,
+              outputs: Sequence[str], curve=None) -> Dict[str, np.ndarray]:
+    rng = np.random.default_rng(seed)
+    cols: Dict[str, Any] = {f: v[0] for f, v in params_to_columns([Params(**params)]).items()}
+    for field in sorted(dists):
+        x = draw(dists[field], n, rng)
+        if field in INT_FIELDS:
+            x = np.rint(x)
+            if not np.all(x >= 1):
+                raise ValueError(f"{field} samples must be whole numbers >= 1; add \"min\": 1 to its distribution")
+        cols[field] = x
+    cols["qps"] = np.broadcast_to(cols["qps"], (n,))
+    return flatten_columns(plan_batch(apply_curves(cols, [curve])), outputs)
+
+
+def _band(x: np.ndarray) -> Dict[str, Optional[float]]:
+    q = np.quantile(x, QUANTILES, method="inverted_cdf")
+    band = {f"p{round(100 * k)}": (float(v) if np.isfinite(v) else None) for k, v in zip(QUANTILES, q)}
+    finite = x[np.isfinite(x)]
+    band["mean"] = float(finite.mean()) if finite.size == x.size else None
+    return band
+
+
+def montecarlo(p: Params, dists: Mapping[str, Mapping[str, Any]], n: int = 100000, seed: Optional[int] = 0,
+               sla_p95: Optional[float] = None, outputs: Sequence[str] = OUTPUTS, curve=None,
+               workers: int = 1) -> Dict[str, Any]:
+    """P5/P50/P95 bands of ``outputs`` with the given Params fields drawn from ``dists``.
+
+    Samples are drawn and evaluated in shards of SHARD_SIZE rows, each with its own
+    child seed of ``seed``, so the result does not depend on ``workers``; with
+    ``workers > 1`` the shards run in a process pool. Unstable samples count as
+    infinite latency and as SLA breaches.
+    """
+    unknown = [f for f in dists if f not in FIELDS]
+    if unknown:
+        raise KeyError(f"unknown field: {', '.join(unknown)}")
+    fields = list(dict.fromkeys(list(outputs) + ["latency.p95_s"]))
+    n = max(1, int(n))
+    sizes = [min(SHARD_SIZE, n - start) for start in range(0, n, SHARD_SIZE)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    args = [(p.__dict__, dists, size, s, fields, curve) for size, s in zip(sizes, seeds)]
+    if workers > 1 and len(args) > 1:
+        with ProcessPoolExecutor(max_workers=min(workers, len(args))) as pool:
+            parts: List[Dict[str, np.ndarray]] = list(pool.map(run_shard, *zip(*args)))
+    else:
+        parts = [run_shard(*a) for a in args]
+    out = {name: np.concatenate([part[name] for part in parts]) for name in fields}
+    p95 = out["latency.p95_s"]
+    return {
+        "n": n,
+        "seed": seed,
+        "bands": {name: _band(out[name]) for name in outputs},
+        "unstable_probability": float(np.mean(~np.isfinite(p95))),
+        "sla_p95": sla_p95,
+        "sla_breach_probability": None if sla_p95 is None else float(np.mean(~(p95 <= sla_p95))),
+    }
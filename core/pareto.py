@@ -0,0 +1,148 @@
+import math
+from bisect import bisect_left, bisect_right
+from typing import Dict, Any, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .model import Params
+from .batch import plan_batch, flatten_columns, FIELDS
+from .recommend import _default_opts
+
+# (group, key, sense): utilization is maximized so fleet size trades off against p95.
+OBJECTIVES: Tuple[Tuple[str, str, str], ...] = (
+    ("cost", "per_query", "min"),
+    ("latency", "p95_s", "min"),
+    ("latency", "rho", "max"),
+)
+
+
+def pareto_mask(F: np.ndarray) -> np.ndarray:
+    """Non-dominated rows of ``F`` (n x 3, all minimized); duplicates keep one row.
+
+    A lexicographic sort plus a bisect sweep over the (y, z) staircase. Lookups are
+    O(log s) for a staircase of s points, but inserting into the Python lists shifts
+    them, so the worst case is O(n log n + n * s), i.e. O(n^2) when most points
+    stay on the front. The shifts are memmoves, cheap next to plan_batch.
+    """
+    n = len(F)
+    keep = np.zeros(n, dtype=bool)
+    if n == 0:
+        return keep
+    order = np.lexsort((F[:, 2], F[:, 1], F[:, 0]))
+    ys: List[float] = []
+    zs: List[float] = []
+    for i, y, z in zip(order.tolist(), F[order, 1].tolist(), F[order, 2].tolist()):
+        # Staircase over (y, z): ys ascending, zs strictly descending.
+        j = bisect_right(ys, y)
+        if j and zs[j - 1] <= z:
+            continue
+        keep[i] = True
+        j = bisect_left(ys, y)
+        end = j
+        while end < len(ys) and zs[end] >= z:
+            end += 1
+        ys[j:end] = [y]
+        zs[j:end] = [z]
+    return keep
+
+
+class ParetoFront:
+    def __init__(self, objectives=OBJECTIVES):
+        self.objectives = tuple(objectives)
+        self.signs = np.array([1.0 if sense == "min" else -1.0 for _, _, sense in self.objectives])
+        self.F = np.empty((0, len(self.objectives)))
+        self.cols: Dict[str, np.ndarray] = {f: np.empty(0) for f in FIELDS}
+        self.seen = 0
+
+    def add(self, cols: Mapping[str, np.ndarray], out: Mapping[str, Mapping[str, np.ndarray]], mask: Optional[np.ndarray] = None):
+        F = np.column_stack([out[g][k] for g, k, _ in self.objectives]) * self.signs
+        n = len(F)
+        self.seen += n
+        ok = np.isfinite(F).all(axis=1)
+        if mask is not None:
+            ok &= mask
+        F = F[ok]
+        part = {f: np.broadcast_to(cols[f], (n,))[ok] for f in FIELDS}
+        local = pareto_mask(F)
+        F = np.concatenate([self.F, F[local]])
+        merged = {f: np.concatenate([self.cols[f], part[f][local]]) for f in FIELDS}
+        keep = pareto_mask(F)
+        self.F = F[keep]
+        self.cols = {f: merged[f][keep] for f in FIELDS}
+        return self
+
+    def __len__(self):
+        return len(self.F)
+
+    def items(self) -> List[Dict[str, Any]]:
+        order = np.lexsort(self.F.T[::-1])
+        values = self.F * self.signs
+        out = []
+        for i in order.tolist():
+            p = {f: float(self.cols[f][i]) for f in FIELDS}
+            p["batch"] = int(p["batch"])
+            p["servers"] = int(p["servers"])
+            item = {"params": p}
+            for j, (g, k, _) in enumerate(self.objectives):
+                item[f"{g}.{k}"] = float(values[i, j])
+            out.append(item)
+        return out
+
+
+def default_space(params: Params) -> Dict[str, List[float]]:
+    T_ctx_opts, T_resp_opts = _default_opts(params)
+    k = max(1, int(params.servers))
+    return {
+        "T_ctx": T_ctx_opts,
+        "T_resp": T_resp_opts,
+        "batch": list(range(1, 65)),
+        "servers": list(range(1, max(8, 2 * k) + 1)),
+    }
+
+
+def space_size(space: Mapping[str, Sequence[float]]) -> int:
+    # Python ints: np.prod wraps silently past int64 and would slip under size caps.
+    return math.prod(len(v) for v in space.values())
+
+
+def space_chunk(params: Params, space: Mapping[str, Sequence[float]], start: int, stop: int) -> Dict[str, Any]:
+    axes = [(name, np.asarray(list(values), dtype=float)) for name, values in space.items()]
+    unknown = [name for name, _ in axes if name not in FIELDS]
+    if unknown:
+        raise KeyError(f"unknown search axes: {', '.join(unknown)}")
+    cols: Dict[str, Any] = {f: np.float64(getattr(params, f)) for f in FIELDS}
+    if not axes:
+        cols["qps"] = np.full(stop - start, cols["qps"])
+        return cols
+    idx = np.unravel_index(np.arange(start, stop), tuple(len(v) for _, v in axes))
+    for (name, values), ix in zip(axes, idx):
+        cols[name] = values[ix]
+    return cols
+
+
+def iter_space(params: Params, space: Mapping[str, Sequence[float]], chunk_size: int = 65536):
+    total = space_size(space)
+    for start in range(0, total, chunk_size):
+        yield space_chunk(params, space, start, min(total, start + chunk_size))
+
+
+def sweep_grid(params: Params, space: Mapping[str, Sequence[float]], fields: Sequence[str]) -> Dict[str, np.ndarray]:
+    """Evaluate the full space in one plan_batch call; each field comes back shaped like the axes."""
+    shape = tuple(len(v) for v in space.values())
+    out = flatten_columns(plan_batch(space_chunk(params, space, 0, space_size(space))), fields)
+    return {name: arr.reshape(shape) for name, arr in out.items()}
+
+
+def pareto_frontier(params: Params, space: Optional[Mapping[str, Sequence[float]]] = None,
+                    sla_p95: Optional[float] = None, rho_target: Optional[float] = None,
+                    chunk_size: int = 65536) -> Dict[str, Any]:
+    front = ParetoFront()
+    for cols in iter_space(params, space or default_space(params), chunk_size):
+        out = plan_batch(cols)
+        mask = np.ones(len(out["latency"]["p95_s"]), dtype=bool)
+        if sla_p95 is not None:
+            mask &= out["latency"]["p95_s"] <= sla_p95
+        if rho_target is not None:
+            mask &= out["latency"]["rho"] <= rho_target
+        front.add(cols, out, mask)
+    return {"frontier": front.items(), "size": len(front), "evaluated": front.seen}
@@ -1,6 +1,10 @@
+from dataclasses import replace
+from functools import lru_cache
+
 from .model import Params
 
-def get_presets():
+@lru_cache(maxsize=1)
+def _presets():
     return {
         "POC": Params(
             T_ctx=1000,
@@ -46,8 +50,12 @@ def get_presets():
         )
     }
 
+def get_presets():
+    # Copies, so callers may modify the Params without touching the cached registry.
+    return {name: replace(p) for name, p in _presets().items()}
+
 def list_presets():
-    return list(get_presets().keys())
+    return list(_presets().keys())
 
 def get_preset(name: str) -> Params:
-    return get_presets()[name]
+    return replace(_presets()[name])
@@ -1,25 +1,167 @@
 import json
+import os
 import pathlib
-from typing import Dict, Any
+import threading
+import time
+from bisect import bisect_left, bisect_right
+from typing import TYPE_CHECKING, Dict, Any, List, Optional, Tuple
+
 from .model import Params
 
+if TYPE_CHECKING:
+    from .throughput import ThroughputCurve
+
+PRICE_FIELDS = ("price_in", "price_out", "tps_prefill", "tps_decode")
+FALLBACK = {"default": {"price_in": 0.5, "price_out": 1.5, "tps_prefill": 20000, "tps_decode": 150}}
+
+
 def _profiles_path():
     return pathlib.Path(__file__).resolve().parents[1] / "data" / "pricing_profiles.json"
 
+
+class ProfileIndex:
+    """Immutable snapshot of the profile file with lookups by provider, model and price."""
+
+    def __init__(self, profiles: Dict[str, Dict[str, Any]]):
+        if not isinstance(profiles, dict):
+            raise ValueError("pricing profiles must be a JSON object keyed by name")
+        for name, prof in profiles.items():
+            missing = [f for f in PRICE_FIELDS if f not in prof]
+            if missing:
+                raise ValueError(f"pricing profile {name!r} is missing {', '.join(missing)}")
+        self.profiles = profiles
+        self.names = tuple(sorted(profiles))
+        self.curves: Dict[str, "ThroughputCurve"] = {}
+        if any("throughput" in prof for prof in profiles.values()):
+            # numpy-backed; only imported when some profile actually declares a curve.
+            from .throughput import ThroughputCurve
+            self.curves = {name: ThroughputCurve(prof["throughput"]) for name, prof in profiles.items()
+                           if "throughput" in prof}
+        self.by_provider: Dict[str, List[str]] = {}
+        self.by_model: Dict[str, List[str]] = {}
+        for name in self.names:
+            prof = profiles[name]
+            if "provider" in prof:
+                self.by_provider.setdefault(prof["provider"], []).append(name)
+            if "model" in prof:
+                self.by_model.setdefault(prof["model"], []).append(name)
+        self._by_price = {}
+        for field in ("price_in", "price_out"):
+            order = sorted(self.names, key=lambda n: float(profiles[n][field]))
+            self._by_price[field] = ([float(profiles[n][field]) for n in order], order)
+
+    def get(self, name: str) -> Dict[str, Any]:
+        try:
+            return dict(self.profiles[name])
+        except KeyError:
+            raise KeyError(f"unknown pricing profile: {name!r}") from None
+
+    def curve(self, name: str) -> Optional["ThroughputCurve"]:
+        self.get(name)
+        return self.curves.get(name)
+
+    def _price_range(self, field: str, lo: Optional[float], hi: Optional[float]) -> List[str]:
+        values, order = self._by_price[field]
+        i = 0 if lo is None else bisect_left(values, lo)
+        j = len(values) if hi is None else bisect_right(values, hi)
+        return order[i:j]
+
+    def find(self, provider: Optional[str] = None, model: Optional[str] = None,
+             price_in: Tuple[Optional[float], Optional[float]] = (None, None),
+             price_out: Tuple[Optional[float], Optional[float]] = (None, None)) -> List[str]:
+        candidates = []
+        if provider is not None:
+            candidates.append(self.by_provider.get(provider, ()))
+        if model is not None:
+            candidates.append(self.by_model.get(model, ()))
+        if price_in != (None, None):
+            candidates.append(self._price_range("price_in", *price_in))
+        if price_out != (None, None):
+            candidates.append(self._price_range("price_out", *price_out))
+        if not candidates:
+            return list(self.names)
+        candidates.sort(key=len)
+        keep = set(candidates[0])
+        for other in candidates[1:]:
+            keep.intersection_update(other)
+        return sorted(keep)
+
+
+class ProfileRegistry:
+    """Loads the profile file once and reloads it when its mtime or size changes.
+
+    The file is stat'ed at most every ``check_interval`` seconds. A reload builds
+    a new ProfileIndex and swaps the reference, so readers never see a partial
+    state; a file that fails to parse keeps the previous snapshot.
+    """
+
+    def __init__(self, path=None, check_interval: float = 1.0):
+        self.path = pathlib.Path(path) if path else _profiles_path()
+        self.check_interval = check_interval
+        self._index: Optional[ProfileIndex] = None
+        self._stamp = None
+        self._checked = 0.0
+        self._lock = threading.Lock()
+
+    def _stat(self):
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
+
+    def index(self) -> ProfileIndex:
+        now = time.monotonic()
+        if self._index is not None and now - self._checked < self.check_interval:
+            return self._index
+        with self._lock:
+            self._checked = now
+            stamp = self._stat()
+            if self._index is None or stamp != self._stamp:
+                self._reload(stamp)
+            return self._index
+
+    def _reload(self, stamp):
+        if stamp is None:
+            self._index, self._stamp = ProfileIndex(dict(FALLBACK)), None
+            return
+        try:
+            index = ProfileIndex(json.loads(self.path.read_text()))
+        except ValueError:
+            if self._index is None:
+                raise
+            return
+        self._index, self._stamp = index, stamp
+
+
+_registry = ProfileRegistry()
+
+
+def default_registry() -> ProfileRegistry:
+    return _registry
+
+
 def load_profiles() -> Dict[str, Dict[str, float]]:
-    p = _profiles_path()
-    if not p.exists():
-        return {
-            "default": {"price_in": 0.5, "price_out": 1.5, "tps_prefill": 20000, "tps_decode": 150}
-        }
-    return json.loads(p.read_text())
+    return {name: dict(prof) for name, prof in _registry.index().profiles.items()}
+
 
 def list_profiles():
-    return sorted(load_profiles().keys())
+    return list(_registry.index().names)
+
+
+def find_profiles(provider: Optional[str] = None, model: Optional[str] = None,
+                  min_price_in: Optional[float] = None, max_price_in: Optional[float] = None,
+                  min_price_out: Optional[float] = None, max_price_out: Optional[float] = None) -> List[str]:
+    return _registry.index().find(provider, model, (min_price_in, max_price_in), (min_price_out, max_price_out))
+
 
 def get_profile(name: str) -> Dict[str, float]:
-    profiles = load_profiles()
-    return profiles.get(name, profiles["default"])
+    return _registry.index().get(name)
+
+
+def get_curve(name: str) -> Optional["ThroughputCurve"]:
+    return _registry.index().curve(name)
+
 
 def apply_profile(p: Params, profile_name: str) -> Params:
     prof = get_profile(profile_name)
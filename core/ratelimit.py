@@ -0,0 +1,94 @@
+import math
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+
+class LocalBuckets:
+    """In-process token buckets; the least recently seen client is evicted past ``max_keys``."""
+
+    def __init__(self, max_keys: int = 100_000):
+        self.max_keys = int(max_keys)
+        self._state: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.evictions = 0
+
+    blocking = False
+
+    def take(self, key: str, rate: float, burst: float, now: float) -> Tuple[bool, float]:
+        with self._lock:
+            tokens, t = self._state.pop(key, (burst, now))
+            # Wall-clock time can step back; never refill by a negative amount.
+            tokens = min(burst, tokens + max(0.0, now - t) * rate)
+            ok = tokens >= 1.0
+            if ok:
+                tokens -= 1.0
+            self._state[key] = (tokens, now)
+            if len(self._state) > self.max_keys:
+                self._state.popitem(last=False)
+                self.evictions += 1
+        return ok, 0.0 if ok else (1.0 - tokens) / rate
+
+    def __len__(self):
+        return len(self._state)
+
+
+class SQLiteBuckets:
+    """Token buckets in a SQLite WAL file shared by several worker processes.
+
+    Rows idle long enough to have refilled completely are pruned every
+    ``prune_every`` calls, so the table stays bounded by the active clients.
+    ``take`` may wait on the file lock, so async callers run it in a worker thread.
+    """
+
+    blocking = True
+
+    def __init__(self, path: str, prune_every: int = 1024):
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=5.0)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute("CREATE TABLE IF NOT EXISTS buckets (key TEXT PRIMARY KEY, tokens REAL, t REAL)")
+        self._db.execute("CREATE INDEX IF NOT EXISTS buckets_t ON buckets (t)")
+        self._lock = threading.Lock()
+        self.prune_every = prune_every
+        self._calls = 0
+
+    def take(self, key: str, rate: float, burst: float, now: float) -> Tuple[bool, float]:
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._db.execute("SELECT tokens, t FROM buckets WHERE key = ?", (key,)).fetchone()
+                tokens, t = row if row is not None else (burst, now)
+                tokens = min(burst, tokens + max(0.0, now - t) * rate)
+                ok = tokens >= 1.0
+                if ok:
+                    tokens -= 1.0
+                self._db.execute("INSERT OR REPLACE INTO buckets (key, tokens, t) VALUES (?, ?, ?)", (key, tokens, now))
+                self._calls += 1
+                if self._calls % self.prune_every == 0:
+                    self._db.execute("DELETE FROM buckets WHERE t < ?", (now - burst / rate,))
+                self._db.execute("COMMIT")
+            except Exception:
+                self._db.execute("ROLLBACK")
+                raise
+        return ok, 0.0 if ok else (1.0 - tokens) / rate
+
+    def __len__(self):
+        return self._db.execute("SELECT COUNT(*) FROM buckets").fetchone()[0]
+
+
+class RateLimiter:
+    """``rate`` requests per second per client with bursts of up to ``burst``."""
+
+    def __init__(self, rate: float, burst: Optional[float] = None, backend=None):
+        self.rate = float(rate)
+        self.burst = float(burst) if burst else max(1.0, self.rate)
+        self.backend = backend if backend is not None else LocalBuckets()
+        self.blocking = getattr(self.backend, "blocking", True)
+
+    def check(self, key: str, now: Optional[float] = None) -> Tuple[bool, int]:
+        """Returns ``(allowed, retry_after_seconds)``."""
+        ok, wait = self.backend.take(key, self.rate, self.burst, time.time() if now is None else now)
+        return ok, 0 if ok else max(1, math.ceil(wait))
@@ -1,4 +1,8 @@
-from .model import plan, Params
+import numpy as np
+
+from .model import plan, plan_result, Params
+from .batch import FIELDS, plan_batch
+from .throughput import apply_curves
 
 def suggest(params, res, sla_p95=2.0, rho_target=0.7):
     rec = []
@@ -14,23 +18,123 @@ def suggest(params, res, sla_p95=2.0, rho_target=0.7):
         rec.append("Configuration looks balanced for the current load.")
     return rec
 
-def optimize(params, sla_p95=2.0, rho_target=0.7):
-    base = plan(params)
-    base_cost = base["cost"]["per_query"]
+def _default_opts(params):
     T_resp_opts = sorted(set([max(1, int(params.T_resp * x)) for x in (0.5, 0.75, 1.0, 1.25)]))
     T_ctx_opts = sorted(set([max(0, int(params.T_ctx * x)) for x in (1.0, 0.75, 0.5)]))
-    batch_opts = list(range(1, 65))
+    return T_ctx_opts, T_resp_opts
+
+
+def optimize(params, sla_p95=2.0, rho_target=0.7, mode="pruned", T_ctx_opts=None, T_resp_opts=None, batch_max=64,
+             curve=None):
+    base_cost = plan_result(params, curve).per_query
+    ctx_default, resp_default = _default_opts(params)
+    T_ctx_opts = sorted(set(T_ctx_opts)) if T_ctx_opts is not None else ctx_default
+    T_resp_opts = sorted(set(T_resp_opts)) if T_resp_opts is not None else resp_default
+    batch_max = max(1, int(batch_max))
+    if mode not in ("grid", "pruned"):
+        raise ValueError(f"unknown optimize mode: {mode}")
+    if curve is not None:
+        # A throughput curve makes latency non-monotone in batch, so pruning is unsafe.
+        out = _optimize_curve(params, sla_p95, rho_target, T_ctx_opts, T_resp_opts, batch_max, curve)
+    elif mode == "grid":
+        out = _optimize_grid(params, sla_p95, rho_target, T_ctx_opts, T_resp_opts, batch_max)
+    else:
+        out = _optimize_pruned(params, sla_p95, rho_target, T_ctx_opts, T_resp_opts, batch_max)
+    out["base_cost"] = base_cost
+    out["evals"] += 1
+    return out
+
+
+def _optimize_grid(params, sla_p95, rho_target, T_ctx_opts, T_resp_opts, batch_max):
     best = None
     count = 0
+    evals = 0
     for ctx in T_ctx_opts:
         for resp in T_resp_opts:
-            for b in batch_opts:
+            for b in range(1, batch_max + 1):
                 p = Params(**{**params.__dict__, "T_ctx": ctx, "T_resp": resp, "batch": b})
-                r = plan(p)
-                if r["latency"]["p95_s"] <= sla_p95 and r["latency"]["rho"] <= rho_target:
+                r = plan_result(p)
+                evals += 1
+                if r.p95_s <= sla_p95 and r.rho <= rho_target:
                     count += 1
-                    score = (r["cost"]["per_query"], r["latency"]["p95_s"])
-                    item = {"params": p, "result": r, "score": score}
+                    score = (r.per_query, r.p95_s)
                     if best is None or score < best["score"]:
-                        best = item
-    return {"best": best, "base_cost": base_cost, "count": count}
+                        best = {"params": p, "result": r, "score": score}
+    if best is not None:
+        best["result"] = best["result"].to_dict()
+    return {"best": best, "count": count, "evals": evals}
+
+
+def _optimize_curve(params, sla_p95, rho_target, T_ctx_opts, T_resp_opts, batch_max, curve):
+    # The full grid in one plan_batch call; same order and tie-breaking as _optimize_grid.
+    ctx, resp, b = np.meshgrid(T_ctx_opts, T_resp_opts, np.arange(1, batch_max + 1), indexing="ij")
+    cols = {f: getattr(params, f) for f in FIELDS}
+    cols.update({"T_ctx": ctx.ravel(), "T_resp": resp.ravel(), "batch": b.ravel()})
+    out = plan_batch(apply_curves(cols, [curve]))
+    cost, p95 = out["cost"]["per_query"], out["latency"]["p95_s"]
+    ok = (p95 <= sla_p95) & (out["latency"]["rho"] <= rho_target)
+    best = None
+    if ok.any():
+        idx = np.flatnonzero(ok)
+        i = int(idx[np.lexsort((idx, p95[idx], cost[idx]))[0]])
+        p = Params(**{**params.__dict__, "T_ctx": ctx.flat[i].item(), "T_resp": resp.flat[i].item(), "batch": int(b.flat[i])})
+        r = plan(p, curve)
+        best = {"params": p, "result": r, "score": (r["cost"]["per_query"], r["latency"]["p95_s"])}
+    return {"best": best, "count": int(ok.sum()), "evals": int(ok.size)}
+
+
+def _optimize_pruned(params, sla_p95, rho_target, T_ctx_opts, T_resp_opts, batch_max):
+    # Cost, p95 and rho are non-decreasing in T_ctx and T_resp and non-increasing in
+    # batch, so each cell's feasible batches form a suffix [b_min, batch_max] and
+    # b_min only grows with T_ctx / T_resp. The optimum sits in the first cell.
+    cache = {}
+
+    def evaluate(ctx, resp, b):
+        key = (ctx, resp, b)
+        if key not in cache:
+            p = Params(**{**params.__dict__, "T_ctx": ctx, "T_resp": resp, "batch": b})
+            cache[key] = (p, plan_result(p))
+        return cache[key]
+
+    def feasible(ctx, resp, b):
+        r = evaluate(ctx, resp, b)[1]
+        return r.p95_s <= sla_p95 and r.rho <= rho_target
+
+    def first_true(lo, hi, pred):
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if pred(mid):
+                hi = mid
+            else:
+                lo = mid + 1
+        return lo
+
+    count = 0
+    prev_row = {}
+    for ctx in T_ctx_opts:
+        row = {}
+        lo = 1
+        for resp in T_resp_opts:
+            if prev_row and resp not in prev_row:
+                break
+            lo = max(lo, prev_row.get(resp, 1))
+            if not feasible(ctx, resp, lo):
+                if not feasible(ctx, resp, batch_max):
+                    break
+                lo = first_true(lo + 1, batch_max, lambda b: feasible(ctx, resp, b))
+            row[resp] = lo
+            count += batch_max - lo + 1
+        if not row:
+            break
+        prev_row = row
+
+    best = None
+    if count:
+        ctx, resp = T_ctx_opts[0], T_resp_opts[0]
+        top = evaluate(ctx, resp, batch_max)[1]
+        score_of = lambda r: (r.per_query, r.p95_s)
+        target = score_of(top)
+        b = first_true(1, batch_max, lambda b: score_of(evaluate(ctx, resp, b)[1]) == target)
+        p, r = evaluate(ctx, resp, b)
+        best = {"params": p, "result": r.to_dict(), "score": target}
+    return {"best": best, "count": count, "evals": len(cache)}
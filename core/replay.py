@@ -0,0 +1,145 @@
+import json
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Dict, Any, Iterator, Tuple
+
+import numpy as np
+
+from .model import Params, plan
+from .simulate import LogHistogram, run_queue
+
+try:
+    import orjson as _orjson
+    _loads = _orjson.loads
+except ImportError:
+    _loads = json.loads
+
+COLUMNS = ("timestamp", "context_tokens", "prompt_tokens", "response_tokens", "cache_hit")
+
+
+def _timestamp(v) -> float:
+    if isinstance(v, str):
+        return datetime.fromisoformat(v.replace("Z", "+00:00")).timestamp()
+    return float(v)
+
+
+def iter_blocks(path, block_bytes: int = 8 << 20) -> Iterator[Tuple[int, int]]:
+    size = os.path.getsize(path)
+    with open(path, "rb") as f:
+        start = 0
+        while start < size:
+            f.seek(min(size, start + block_bytes))
+            f.readline()
+            end = min(size, f.tell()) if start + block_bytes < size else size
+            yield start, end - start
+            start = end
+
+
+def parse_block(path, offset: int, length: int) -> Dict[str, np.ndarray]:
+    with open(path, "rb") as f:
+        f.seek(offset)
+        data = f.read(length)
+    cols = {c: [] for c in COLUMNS}
+    ts, ctx, prompt, resp, hit = (cols[c].append for c in COLUMNS)
+    for line in data.splitlines():
+        if not line.strip():
+            continue
+        g = _loads(line).get
+        t = g("timestamp", g("ts", 0.0))
+        ts(_timestamp(t) if isinstance(t, str) else t)
+        ctx(g("context_tokens", g("T_ctx", 0)))
+        prompt(g("prompt_tokens", g("T_prompt", 0)))
+        resp(g("response_tokens", g("T_resp", 0)))
+        hit(g("cache_hit", np.nan))
+    return {c: np.asarray(v, dtype=float) for c, v in cols.items()}
+
+
+def iter_trace(path, workers: int = 0, block_bytes: int = 8 << 20) -> Iterator[Dict[str, np.ndarray]]:
+    blocks = iter_blocks(path, block_bytes)
+    if workers <= 1:
+        for offset, length in blocks:
+            yield parse_block(path, offset, length)
+        return
+    # Keep at most 2 blocks per worker in flight so memory stays bounded.
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        for offset, length in blocks:
+            pending.append(pool.submit(parse_block, path, offset, length))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def replay(path, p: Params, workers: int = 0, block_bytes: int = 8 << 20) -> Dict[str, Any]:
+    s = min(1.0, max(0.0, float(p.cache_savings)))
+    b = max(1, int(p.batch))
+    k = max(1, int(p.servers))
+    P_in = max(0.0, float(p.price_in))
+    P_out = max(0.0, float(p.price_out))
+    tps_prefill = max(1e-9, float(p.tps_prefill))
+    tps_decode = max(1e-9, float(p.tps_decode))
+    net_rtt_s = max(0.0, 2.0 * float(p.net_ms_one_way)) / 1000.0
+
+    latency = LogHistogram()
+    free = [0.0] * k
+    n = 0
+    cost_total = 0.0
+    sums = {c: 0.0 for c in COLUMNS[1:]}
+    t0 = None
+    last = -np.inf
+    for chunk in iter_trace(path, workers, block_bytes):
+        m = len(chunk["timestamp"])
+        if m == 0:
+            continue
+        if t0 is None:
+            t0 = float(chunk["timestamp"][0])
+        # Out-of-order records are treated as arriving with their predecessor.
+        arrivals = np.maximum.accumulate(np.maximum(chunk["timestamp"], last)) - t0
+        last = float(arrivals[-1]) + t0
+        hit = np.clip(np.nan_to_num(chunk["cache_hit"]), 0.0, 1.0)
+        T_in = (1.0 - hit * s) * chunk["context_tokens"] / b + chunk["prompt_tokens"]
+        T_out = chunk["response_tokens"]
+        cost_total += float(((T_in / 1000.0) * P_in + (T_out / 1000.0) * P_out).sum())
+        services = T_in / tps_prefill + T_out / tps_decode + net_rtt_s
+        waits = np.asarray(run_queue(arrivals.tolist(), services.tolist(), free))
+        latency.add(waits + services)
+        for c in sums:
+            sums[c] += float(np.nansum(chunk[c]))
+        n += m
+
+    duration = last - t0 if n else 0.0
+    qps = n / duration if duration > 0 else 0.0
+    cost_q = cost_total / n if n else 0.0
+    means = {c: (v / n if n else 0.0) for c, v in sums.items()}
+    analytic = plan(Params(
+        T_ctx=means["context_tokens"], T_prompt=means["prompt_tokens"], T_resp=means["response_tokens"],
+        qps=qps, cache_hit=means["cache_hit"], cache_savings=p.cache_savings, batch=p.batch,
+        price_in=p.price_in, price_out=p.price_out, tps_prefill=p.tps_prefill, tps_decode=p.tps_decode,
+        net_ms_one_way=p.net_ms_one_way, servers=p.servers,
+    ))
+    return {
+        "requests": n,
+        "duration_s": duration,
+        "qps": qps,
+        "means": means,
+        "cost": {
+            "total": cost_total,
+            "per_query": cost_q,
+            "per_day": qps * 86400.0 * cost_q,
+            "per_month": 30.0 * qps * 86400.0 * cost_q,
+        },
+        "latency": {
+            "p50_s": latency.quantile(0.50),
+            "p95_s": latency.quantile(0.95),
+            "p99_s": latency.quantile(0.99),
+            "mean_s": latency.mean(),
+        },
+        "analytic": {
+            "cost_per_query": analytic["cost"]["per_query"],
+            "p50_s": analytic["latency"]["p50_s"],
+            "p95_s": analytic["latency"]["p95_s"],
+        },
+    }
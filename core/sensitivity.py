@@ -0,0 +1,72 @@
+import math
+from typing import Dict, Any, Optional, Sequence
+
+import numpy as np
+
+from .model import Params
+from .batch import FIELDS, plan_batch, flatten_columns, params_to_columns
+from .throughput import apply_curves
+
+OUTPUTS = ("cost.per_month", "latency.p95_s")
+INT_FIELDS = ("batch", "servers")
+BOUNDS = {"cache_hit": (0.0, 1.0), "cache_savings": (0.0, 1.0), "burst_factor": (1.0, math.inf),
+          "batch": (1.0, math.inf), "servers": (1.0, math.inf), "tps_prefill": (1e-9, math.inf),
+          "tps_decode": (1e-9, math.inf)}
+
+
+def _steps(name: str, x: float, rel: float):
+    lo_b, hi_b = BOUNDS.get(name, (0.0, math.inf))
+    if name in INT_FIELDS:
+        h = max(1.0, round(abs(x) * rel))
+    else:
+        h = abs(x) * rel if x != 0 else rel
+    return max(lo_b, x - h), min(hi_b, x + h)
+
+
+def _finite(v: float) -> Optional[float]:
+    return v if math.isfinite(v) else None
+
+
+def sensitivity(p: Params, outputs: Sequence[str] = OUTPUTS, rel_step: float = 0.01, swing: float = 0.1,
+                curve=None) -> Dict[str, Any]:
+    """Elasticities and +/-``swing`` ranges of ``outputs`` for every Params field.
+
+    Central finite differences (one-sided at bounds; +/-1 for batch and servers)
+    and the tornado swings are evaluated as one plan_batch call of 4 * 14 + 1 rows.
+    Elasticity is (dY/Y) / (dX/X); it is None where the output is 0 or infinite.
+    """
+    base = params_to_columns([p])
+    x0 = {f: float(base[f][0]) for f in FIELDS}
+    rows = [dict(x0)]
+    spans = {}
+    for f in FIELDS:
+        spans[f] = (_steps(f, x0[f], rel_step), _steps(f, x0[f], swing))
+        for v in spans[f][0] + spans[f][1]:
+            rows.append({**x0, f: v})
+    cols = {f: np.fromiter((r[f] for r in rows), dtype=float, count=len(rows)) for f in FIELDS}
+    out = flatten_columns(plan_batch(apply_curves(cols, [curve])), outputs)
+    y = {o: out[o].tolist() for o in outputs}
+
+    fields = []
+    for i, f in enumerate(FIELDS):
+        (d_lo, d_hi), (s_lo, s_hi) = spans[f]
+        j = 1 + 4 * i
+        item = {"field": f, "value": x0[f], "elasticity": {}, "derivative": {},
+                "low": {"value": s_lo}, "high": {"value": s_hi}}
+        for o in outputs:
+            y0, y_lo, y_hi = y[o][0], y[o][j], y[o][j + 1]
+            d = (y_hi - y_lo) / (d_hi - d_lo) if d_hi > d_lo else 0.0
+            item["derivative"][o] = _finite(d) if math.isfinite(y_lo) and math.isfinite(y_hi) else None
+            e = None
+            if item["derivative"][o] is not None and math.isfinite(y0) and y0 != 0:
+                e = d * x0[f] / y0
+            item["elasticity"][o] = e
+            item["low"][o] = _finite(y[o][j + 2])
+            item["high"][o] = _finite(y[o][j + 3])
+        fields.append(item)
+
+    ranking = {
+        o: [it["field"] for it in sorted(fields, key=lambda it: -abs(it["elasticity"][o] or 0.0))]
+        for o in outputs
+    }
+    return {"base": {o: _finite(y[o][0]) for o in outputs}, "fields": fields, "ranking": ranking}
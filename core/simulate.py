@@ -0,0 +1,180 @@
+import heapq
+import math
+from typing import Dict, Any, Iterable, Optional
+
+import numpy as np
+
+from .model import Params, plan, plan_result
+
+
+class LogHistogram:
+    """Fixed log-spaced buckets (about 1% wide) for streaming latency percentiles."""
+
+    def __init__(self, lo: float = 1e-6, hi: float = 1e6, ratio: float = 1.01):
+        self.lo = lo
+        self.hi = hi
+        self.ratio = ratio
+        self.log_ratio = math.log(ratio)
+        self.size = int(math.ceil(math.log(hi / lo) / self.log_ratio)) + 2
+        self.counts = np.zeros(self.size, dtype=np.int64)
+        self.n = 0
+        self.total = 0.0
+        self.total_sq = 0.0
+        self.max = 0.0
+
+    def add(self, values: np.ndarray):
+        values = np.asarray(values, dtype=float)
+        if values.size == 0:
+            return self
+        with np.errstate(divide="ignore"):
+            idx = np.floor(np.log(np.maximum(values, 0.0) / self.lo) / self.log_ratio) + 1
+        idx = np.clip(np.nan_to_num(idx, neginf=0.0), 0, self.size - 1).astype(np.int64)
+        self.counts += np.bincount(idx, minlength=self.size)
+        self.n += values.size
+        self.total += float(values.sum())
+        self.total_sq += float(np.dot(values, values))
+        self.max = max(self.max, float(values.max()))
+        return self
+
+    def merge(self, other: "LogHistogram"):
+        if (self.lo, self.hi, self.ratio) != (other.lo, other.hi, other.ratio):
+            raise ValueError("cannot merge histograms with different bucket layouts")
+        self.counts += other.counts
+        self.n += other.n
+        self.total += other.total
+        self.total_sq += other.total_sq
+        self.max = max(self.max, other.max)
+        return self
+
+    def quantile(self, q: float) -> float:
+        if self.n == 0:
+            return float("nan")
+        i = int(np.searchsorted(np.cumsum(self.counts), q * self.n, side="left"))
+        if i == 0:
+            return 0.0
+        return min(self.max, self.lo * math.exp((i - 0.5) * self.log_ratio))
+
+    def mean(self) -> float:
+        return self.total / self.n if self.n else float("nan")
+
+    def var(self) -> float:
+        if self.n == 0:
+            return float("nan")
+        m = self.total / self.n
+        return max(0.0, self.total_sq / self.n - m * m)
+
+    def sample(self, n: int, rng: np.random.Generator) -> np.ndarray:
+        if self.n == 0:
+            return np.zeros(n)
+        idx = rng.choice(self.size, size=n, p=self.counts / self.n)
+        # Log-uniform within each bucket; bucket 0 holds values below ``lo``.
+        x = self.lo * np.exp((idx - 1 + rng.random(n)) * self.log_ratio)
+        return np.where(idx == 0, 0.0, np.minimum(x, self.max))
+
+    def to_dict(self) -> Dict[str, Any]:
+        nz = np.flatnonzero(self.counts)
+        return {
+            "lo": self.lo, "hi": self.hi, "ratio": self.ratio,
+            "buckets": {int(i): int(self.counts[i]) for i in nz},
+            "n": self.n, "total": self.total, "total_sq": self.total_sq, "max": self.max,
+        }
+
+    def load(self, d: Dict[str, Any]) -> "LogHistogram":
+        """Fill this empty histogram from ``to_dict`` output with the same bucket layout.
+
+        Anything else (another layout, out-of-range buckets, counts that do not
+        add up to ``n``) raises ValueError.
+        """
+        try:
+            if (float(d["lo"]), float(d["hi"]), float(d["ratio"])) != (self.lo, self.hi, self.ratio):
+                raise ValueError(f"histogram layout must be lo={self.lo}, hi={self.hi}, ratio={self.ratio}")
+            buckets = d["buckets"]
+            idx = np.array([int(i) for i in buckets], dtype=np.int64)
+            counts = np.array([int(c) for c in buckets.values()], dtype=np.int64)
+            n, total, total_sq, hmax = int(d["n"]), float(d["total"]), float(d["total_sq"]), float(d["max"])
+        except (KeyError, TypeError, AttributeError, OverflowError) as e:
+            raise ValueError(f"malformed histogram: {e!r}") from None
+        if idx.size and (idx.min() < 0 or idx.max() >= self.size):
+            raise ValueError(f"histogram bucket index out of range 0..{self.size - 1}")
+        if np.any(counts < 0) or counts.sum() != n:
+            raise ValueError("histogram bucket counts must be non-negative and sum to n")
+        if not all(map(math.isfinite, (total, total_sq, hmax))):
+            raise ValueError("histogram totals must be finite")
+        np.add.at(self.counts, idx, counts)
+        self.n, self.total, self.total_sq, self.max = n, total, total_sq, hmax
+        return self
+
+    @classmethod
+    def from_dict(cls, d: Dict[str, Any]) -> "LogHistogram":
+        return cls(d["lo"], d["hi"], d["ratio"]).load(d)
+
+
+def service_times(p: Params, n: int, rng: np.random.Generator, service_cv: float = 0.0) -> np.ndarray:
+    s = plan_result(p).service_base_s
+    if service_cv <= 0.0:
+        return np.full(n, s)
+    shape = 1.0 / (service_cv * service_cv)
+    return rng.gamma(shape, s / shape, n)
+
+
+def run_queue(arrivals: Iterable[float], services: Iterable[float], free) -> list:
+    # FCFS on k servers: ``free`` is a heap of the times each server becomes idle.
+    waits = []
+    append = waits.append
+    replace = heapq.heapreplace
+    for a, s in zip(arrivals, services):
+        f = free[0]
+        if f > a:
+            replace(free, f + s)
+            append(f - a)
+        else:
+            replace(free, a + s)
+            append(0.0)
+    return waits
+
+
+def simulate(p: Params, n: int = 200_000, seed: Optional[int] = 0, service_cv: float = 0.0,
+             warmup: float = 0.1, chunk_size: int = 65536) -> Dict[str, Any]:
+    ref = plan(p)
+    lam = max(0.0, float(p.qps)) * max(1.0, float(p.burst_factor))
+    k = max(1, int(p.servers))
+    rng = np.random.default_rng(seed)
+    latency = LogHistogram()
+    wait = LogHistogram()
+    waited = 0
+    free = [0.0] * k
+    t = 0.0
+    skip = int(n * warmup)
+    done = 0
+    if lam > 0.0:
+        while done < n:
+            m = min(chunk_size, n - done)
+            arrivals = t + np.cumsum(rng.exponential(1.0 / lam, m))
+            t = float(arrivals[-1])
+            services = service_times(p, m, rng, service_cv)
+            w = np.asarray(run_queue(arrivals.tolist(), services.tolist(), free))
+            lo = max(0, skip - done)
+            done += m
+            if lo >= m:
+                continue
+            w = w[lo:]
+            wait.add(w)
+            latency.add(w + services[lo:])
+            waited += int(np.count_nonzero(w > 0.0))
+    return {
+        "n": latency.n,
+        "empirical": {
+            "p50_s": latency.quantile(0.50),
+            "p95_s": latency.quantile(0.95),
+            "p99_s": latency.quantile(0.99),
+            "mean_s": latency.mean(),
+            "mean_wait_s": wait.mean(),
+            "p_wait": waited / latency.n if latency.n else 0.0,
+        },
+        "analytic": {
+            "p50_s": ref["latency"]["p50_s"],
+            "p95_s": ref["latency"]["p95_s"],
+            "p_wait": ref["latency"]["p_wait"],
+            "stable": ref["latency"]["stable"],
+        },
+    }
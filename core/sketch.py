@@ -0,0 +1,148 @@
+import math
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Any, Iterable, Mapping, Optional
+
+import numpy as np
+
+from .model import Params, plan, _erlang_c
+from .replay import iter_blocks, parse_block
+from .simulate import LogHistogram
+
+DIMENSIONS = ("context_tokens", "prompt_tokens", "response_tokens")
+
+
+def token_histogram() -> LogHistogram:
+    # 2% buckets from 1 token to 10M tokens; 0-token requests land in bucket 0.
+    return LogHistogram(lo=1.0, hi=1e7, ratio=1.02)
+
+
+class WorkloadSketch:
+    """Mergeable token-length histograms plus the observed cache-hit rate.
+
+    ``hit_samples`` counts the requests that reported ``cache_hit``, so a trace
+    that saw no hits is told apart from one that carried no cache data at all.
+    """
+
+    def __init__(self, hists: Optional[Mapping[str, LogHistogram]] = None, hits: float = 0.0,
+                 hit_samples: int = 0):
+        self.hists = {d: (hists or {}).get(d) or token_histogram() for d in DIMENSIONS}
+        self.hits = float(hits)
+        self.hit_samples = int(hit_samples)
+
+    @property
+    def n(self) -> int:
+        return self.hists["response_tokens"].n
+
+    def add(self, cols: Mapping[str, Iterable[float]]):
+        for d in DIMENSIONS:
+            self.hists[d].add(cols[d])
+        if "cache_hit" in cols:
+            hit = np.asarray(cols["cache_hit"], dtype=float)
+            hit = hit[~np.isnan(hit)]  # parse_block leaves NaN where a record has no cache_hit
+            self.hits += float(np.clip(hit, 0.0, 1.0).sum())
+            self.hit_samples += hit.size
+        return self
+
+    def merge(self, other: "WorkloadSketch"):
+        for d in DIMENSIONS:
+            self.hists[d].merge(other.hists[d])
+        self.hits += other.hits
+        self.hit_samples += other.hit_samples
+        return self
+
+    def cache_hit(self) -> float:
+        return self.hits / self.hit_samples if self.hit_samples else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"hits": self.hits, "hit_samples": self.hit_samples,
+                **{d: self.hists[d].to_dict() for d in DIMENSIONS}}
+
+    @classmethod
+    def from_dict(cls, d: Mapping[str, Any]) -> "WorkloadSketch":
+        hists = {k: token_histogram().load(d[k]) for k in DIMENSIONS}
+        n = hists["response_tokens"].n
+        try:
+            hits = float(d.get("hits", 0.0))
+            # Older sketches have no hit_samples; their hits were counted over every request.
+            hit_samples = int(d.get("hit_samples", n if hits else 0))
+        except (TypeError, ValueError, OverflowError):
+            raise ValueError("sketch hits and hit_samples must be numbers") from None
+        if not 0.0 <= hits <= hit_samples <= n:
+            raise ValueError("sketch needs 0 <= hits <= hit_samples <= n")
+        return cls(hists, hits, hit_samples)
+
+
+def _sketch_block(path, offset: int, length: int) -> WorkloadSketch:
+    return WorkloadSketch().add(parse_block(path, offset, length))
+
+
+def sketch_trace(path, workers: int = 0, block_bytes: int = 8 << 20) -> WorkloadSketch:
+    out = WorkloadSketch()
+    blocks = list(iter_blocks(path, block_bytes))
+    if workers <= 1 or len(blocks) <= 1:
+        for offset, length in blocks:
+            out.merge(_sketch_block(path, offset, length))
+        return out
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for part in pool.map(_sketch_block, [path] * len(blocks), *zip(*blocks)):
+            out.merge(part)
+    return out
+
+
+def plan_distribution(p: Params, w: WorkloadSketch, samples: int = 20000, seed: Optional[int] = 0) -> Dict[str, Any]:
+    """Plan from token-length distributions instead of scalar averages.
+
+    Cost is linear in tokens, so its expectation is plan() at the mean lengths.
+    Waiting time uses the Allen-Cunneen M/G/k correction Wq * (1 + cs^2) / 2
+    and latency percentiles add that wait to sampled service-time quantiles.
+    """
+    if w.n == 0:
+        raise ValueError("workload sketch is empty")
+    h = w.cache_hit() if w.hit_samples else p.cache_hit
+    ctx, prompt, resp = (w.hists[d] for d in DIMENSIONS)
+    mean = Params(**{**p.__dict__, "T_ctx": ctx.mean(), "T_prompt": prompt.mean(),
+                     "T_resp": resp.mean(), "cache_hit": h})
+    res = plan(mean)
+
+    shrink = (1.0 - min(1.0, max(0.0, h)) * min(1.0, max(0.0, p.cache_savings))) / max(1, int(p.batch))
+    tps_prefill = max(1e-9, float(p.tps_prefill))
+    tps_decode = max(1e-9, float(p.tps_decode))
+    var_in = shrink * shrink * ctx.var() + prompt.var()
+    var_s = var_in / tps_prefill ** 2 + resp.var() / tps_decode ** 2
+    s_mean = res["latency"]["service_base_s"]
+    cs2 = var_s / s_mean ** 2 if s_mean > 0 else 0.0
+
+    lam = max(0.0, float(p.qps)) * max(1.0, float(p.burst_factor))
+    k = max(1, int(p.servers))
+    _, p_wait, _, wq_mmk = _erlang_c(lam, 1.0 / max(1e-9, s_mean), k)
+    wq = wq_mmk * (1.0 + cs2) / 2.0
+
+    rng = np.random.default_rng(seed)
+    T_in = shrink * ctx.sample(samples, rng) + prompt.sample(samples, rng)
+    T_out = resp.sample(samples, rng)
+    net_rtt_s = max(0.0, 2.0 * float(p.net_ms_one_way)) / 1000.0
+    svc = T_in / tps_prefill + T_out / tps_decode + net_rtt_s
+    cost = (T_in / 1000.0) * max(0.0, p.price_in) + (T_out / 1000.0) * max(0.0, p.price_out)
+    s50, s95, s99 = np.quantile(svc, [0.5, 0.95, 0.99]).tolist()
+    c50, c95, c99 = np.quantile(cost, [0.5, 0.95, 0.99]).tolist()
+
+    stable = res["latency"]["stable"]
+    inf = float("inf")
+    res["latency"].update({
+        "p50_s": s50 + wq if stable else inf,
+        "p95_s": s95 + 3.0 * wq if stable else inf,
+        "p99_s": s99 + 3.0 * wq if stable else inf,
+        "p_wait": p_wait,
+        "service_cv": math.sqrt(cs2),
+        "wq_s": wq,
+    })
+    res["cost"].update({"p50_per_query": c50, "p95_per_query": c95, "p99_per_query": c99})
+    res["distribution"] = {
+        "requests": w.n,
+        "cache_hit": h,
+        "quantiles": {
+            d: {"p50": hist.quantile(0.5), "p95": hist.quantile(0.95), "p99": hist.quantile(0.99)}
+            for d, hist in w.hists.items()
+        },
+    }
+    return res
@@ -0,0 +1,112 @@
+from typing import Dict, Any, Optional
+
+from .model import Params, _erlang_c
+
+MAX_SERVERS = 1 << 24
+SECONDS_PER_MONTH = 30.0 * 86400.0
+
+
+def _service_base(p: Params, T_ctx: Optional[float] = None) -> float:
+    h = min(1.0, max(0.0, p.cache_hit))
+    s = min(1.0, max(0.0, p.cache_savings))
+    b = max(1, int(p.batch))
+    ctx = max(0.0, float(p.T_ctx if T_ctx is None else T_ctx))
+    T_in = (1.0 - h * s) * ctx / b + max(0.0, float(p.T_prompt))
+    s_base = (T_in / max(1e-9, float(p.tps_prefill))
+              + max(0.0, float(p.T_resp)) / max(1e-9, float(p.tps_decode))
+              + max(0.0, 2.0 * float(p.net_ms_one_way)) / 1000.0)
+    return max(1e-9, s_base)
+
+
+def _arrival_rate(p: Params, qps: Optional[float] = None) -> float:
+    return max(0.0, float(p.qps if qps is None else qps)) * max(1.0, float(p.burst_factor))
+
+
+def _p95(lam: float, s_base: float, k: int) -> float:
+    mu = 1.0 / s_base
+    if lam >= k * mu:
+        return float("inf")
+    return s_base + 3.0 * _erlang_c(lam, mu, k)[3]
+
+
+def _ok(lam, s_base, k, sla_p95, rho_target) -> bool:
+    if rho_target is not None and lam * s_base / k > rho_target:
+        return False
+    return sla_p95 is None or _p95(lam, s_base, k) <= sla_p95
+
+
+def _bisect(lo: float, hi: float, ok, rel_tol: float = 1e-6) -> float:
+    # Largest x in [lo, hi] with ok(x), given ok(lo) and monotone ok.
+    while hi - lo > rel_tol * max(1.0, abs(hi)):
+        mid = 0.5 * (lo + hi)
+        if ok(mid):
+            lo = mid
+        else:
+            hi = mid
+    return lo
+
+
+def min_servers(p: Params, sla_p95: Optional[float] = None, rho_target: Optional[float] = None) -> Dict[str, Any]:
+    lam = _arrival_rate(p)
+    s_base = _service_base(p)
+    if sla_p95 is not None and sla_p95 < s_base:
+        return {"servers": None, "reason": f"SLA {sla_p95:.3f}s is below the service time {s_base:.3f}s"}
+    lo = max(1, int(lam * s_base) + 1)
+    if rho_target is not None and rho_target > 0:
+        lo = max(lo, int(-(-lam * s_base // rho_target)))
+    # Square-root staffing: the answer is usually within a few sqrt(a) of the load.
+    step = max(1, int((lam * s_base) ** 0.5))
+    hi = lo
+    while not _ok(lam, s_base, hi, sla_p95, rho_target):
+        lo = hi + 1
+        hi = lo + step
+        step *= 2
+        if hi > MAX_SERVERS:
+            return {"servers": None, "reason": "no fleet size up to the search limit meets the target"}
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if _ok(lam, s_base, mid, sla_p95, rho_target):
+            hi = mid
+        else:
+            lo = mid + 1
+    return {"servers": hi, "p95_s": _p95(lam, s_base, hi), "rho": lam * s_base / hi}
+
+
+def max_qps(p: Params, sla_p95: Optional[float] = None, rho_target: Optional[float] = None) -> Dict[str, Any]:
+    s_base = _service_base(p)
+    k = max(1, int(p.servers))
+    burst = max(1.0, float(p.burst_factor))
+    if sla_p95 is not None and sla_p95 < s_base:
+        return {"qps": None, "reason": f"SLA {sla_p95:.3f}s is below the service time {s_base:.3f}s"}
+    hi = k / s_base / burst
+    if rho_target is not None:
+        hi = min(hi, max(0.0, rho_target) * k / s_base / burst)
+        if sla_p95 is None:
+            return {"qps": hi, "p95_s": _p95(hi * burst, s_base, k), "rho": hi * burst * s_base / k}
+    qps = _bisect(0.0, hi, lambda q: _ok(q * burst, s_base, k, sla_p95, rho_target))
+    return {"qps": qps, "p95_s": _p95(qps * burst, s_base, k), "rho": qps * burst * s_base / k}
+
+
+def max_T_ctx(p: Params, budget_month: Optional[float] = None, sla_p95: Optional[float] = None,
+              rho_target: Optional[float] = None, T_ctx_max: float = 1e7) -> Dict[str, Any]:
+    lam = _arrival_rate(p)
+    k = max(1, int(p.servers))
+    h = min(1.0, max(0.0, p.cache_hit))
+    s = min(1.0, max(0.0, p.cache_savings))
+    b = max(1, int(p.batch))
+    hi = T_ctx_max
+    if budget_month is not None:
+        # Cost is linear in T_ctx, so the budget bound is closed form.
+        qpm = max(0.0, float(p.qps)) * SECONDS_PER_MONTH
+        fixed = (max(0.0, float(p.T_prompt)) * max(0.0, p.price_in) + max(0.0, float(p.T_resp)) * max(0.0, p.price_out)) / 1000.0
+        per_ctx = (1.0 - h * s) / b * max(0.0, p.price_in) / 1000.0
+        if qpm * fixed > budget_month:
+            return {"T_ctx": None, "reason": "budget is below the cost of prompt and response tokens alone"}
+        if qpm > 0 and per_ctx > 0:
+            hi = min(hi, (budget_month / qpm - fixed) / per_ctx)
+    ok = lambda ctx: _ok(lam, _service_base(p, ctx), k, sla_p95, rho_target)
+    if not ok(0.0):
+        return {"T_ctx": None, "reason": "latency target is not met even with no context"}
+    ctx = hi if ok(hi) else _bisect(0.0, hi, ok)
+    s_base = _service_base(p, ctx)
+    return {"T_ctx": ctx, "p95_s": _p95(lam, s_base, k), "rho": lam * s_base / k}
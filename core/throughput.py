@@ -0,0 +1,89 @@
+import json
+from typing import Dict, Any, Mapping, Optional, Sequence
+
+import numpy as np
+
+from .model import Params
+from .batch import _broadcast
+
+MAX_BATCH = 1024
+
+
+def _scale_points(batch: Sequence[float], tps: Sequence[float]) -> np.ndarray:
+    b = np.asarray(batch, dtype=float)
+    t = np.asarray(tps, dtype=float)
+    if b.ndim != 1 or b.shape != t.shape or len(b) == 0:
+        raise ValueError("throughput points need matching, non-empty batch and tps lists")
+    if b[0] != 1 or np.any(np.diff(b) <= 0) or np.any(t <= 0):
+        raise ValueError("throughput batches must start at 1 and increase, with positive tps")
+    grid = np.arange(1, MAX_BATCH + 1, dtype=float)
+    # Aggregate tokens/s is interpolated linearly and held flat past the last point.
+    agg = np.interp(grid, b, t)
+    return agg / grid / t[0]
+
+
+def _scale_parametric(half_batch: float) -> np.ndarray:
+    if half_batch <= 0:
+        raise ValueError("half_batch must be positive")
+    grid = np.arange(1, MAX_BATCH + 1, dtype=float)
+    return 1.0 / (1.0 + (grid - 1.0) / float(half_batch))
+
+
+class ThroughputCurve:
+    """Per-request token speed versus batch size for continuously batched servers.
+
+    A spec either lists measured aggregate tokens/s per server
+    (``{"batch": [1, 8, 32], "decode_tps": [...], "prefill_tps": [...]}``) or uses
+    the saturating form aggregate(b) ~ b / (1 + (b - 1) / half_batch)
+    (``{"half_batch": 16, "prefill_half_batch": 4}``). Only the shape is used:
+    speeds are scaled relative to batch 1, so ``tps_decode``/``tps_prefill`` keep
+    meaning the single-request speed. A server with batch b runs b requests at
+    once, so the queue has servers * b slots. Scales are tabulated for
+    b = 1..MAX_BATCH up front; lookups are an index. Larger batches are capped at
+    MAX_BATCH for both speed and slots.
+    """
+
+    def __init__(self, spec: Mapping[str, Any]):
+        self.spec = dict(spec)
+        ones = np.ones(MAX_BATCH)
+        if "batch" in spec:
+            self.decode_scale = _scale_points(spec["batch"], spec["decode_tps"]) if "decode_tps" in spec else ones
+            self.prefill_scale = _scale_points(spec["batch"], spec["prefill_tps"]) if "prefill_tps" in spec else ones
+        elif "half_batch" in spec:
+            self.decode_scale = _scale_parametric(spec["half_batch"])
+            self.prefill_scale = (_scale_parametric(spec["prefill_half_batch"])
+                                  if "prefill_half_batch" in spec else ones)
+        else:
+            raise ValueError("throughput spec needs either batch/decode_tps points or half_batch")
+        self.key = json.dumps(self.spec, sort_keys=True)
+
+    def effective(self, p: Params) -> Params:
+        b = min(max(1, int(p.batch)), MAX_BATCH)
+        return Params(**{
+            **p.__dict__,
+            "tps_decode": float(p.tps_decode) * float(self.decode_scale[b - 1]),
+            "tps_prefill": float(p.tps_prefill) * float(self.prefill_scale[b - 1]),
+            "servers": max(1, int(p.servers)) * b,
+        })
+
+
+def apply_curves(cols: Mapping[str, Any], curves: Sequence[Optional[ThroughputCurve]],
+                 which: Optional[np.ndarray] = None) -> Dict[str, np.ndarray]:
+    """Columns with per-row effective speeds and slots; row i uses ``curves[which[i]]``.
+
+    Rows whose curve is None are left unchanged.
+    """
+    c = dict(_broadcast(cols))
+    n = len(c["qps"])
+    which = np.zeros(n, dtype=np.int64) if which is None else np.asarray(which, dtype=np.int64)
+    has = np.array([cv is not None for cv in curves], dtype=bool)
+    if not has.any():
+        return c
+    dec = np.stack([cv.decode_scale if cv is not None else np.ones(MAX_BATCH) for cv in curves])
+    pre = np.stack([cv.prefill_scale if cv is not None else np.ones(MAX_BATCH) for cv in curves])
+    b = np.clip(np.trunc(c["batch"]), 1, MAX_BATCH).astype(np.int64)
+    on = has[which]
+    c["tps_decode"] = c["tps_decode"] * dec[which, b - 1]
+    c["tps_prefill"] = c["tps_prefill"] * pre[which, b - 1]
+    c["servers"] = np.where(on, np.maximum(1, np.trunc(c["servers"])) * b, c["servers"])
+    return c
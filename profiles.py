@@ -1,7 +1,26 @@
+"""Saved planner profiles: ``profiles.json`` plus an append-only change log.
+
+``profiles.json`` stays the human-readable snapshot. save/delete append one line
+to ``profiles.json.log``, and the log is folded back into the snapshot (temp file
++ rename) once it outgrows the number of profiles, so updates are O(1) amortized.
+Writers hold an exclusive lock on ``profiles.json.lock``, so several processes can
+share the store. Each process keeps the merged profiles in memory and only reads
+what changed on disk since its last look.
+"""
+from contextlib import contextmanager
 from pathlib import Path
 import json
+import os
+import threading
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
 
 PROFILES_FILE = Path("profiles.json")
+COMPACT_MIN = 1024
 
 DEFAULTS = {
     "Default": {
@@ -15,41 +34,214 @@ DEFAULTS = {
     }
 }
 
-def _ensure():
-    if not PROFILES_FILE.exists():
-        PROFILES_FILE.write_text(json.dumps(DEFAULTS, indent=2))
-        return DEFAULTS.copy()
+
+def _defaults():
+    return {name: dict(p) for name, p in DEFAULTS.items()}
+
+
+def _stamp(path):
     try:
-        data = json.loads(PROFILES_FILE.read_text())
-        if not isinstance(data, dict) or not data:
-            raise ValueError("invalid structure")
-        return data
-    except Exception:
-        PROFILES_FILE.write_text(json.dumps(DEFAULTS, indent=2))
-        return DEFAULTS.copy()
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+
+class ProfileStore:
+    """A file that fails to parse is never rewritten: reads fall back to the last good
+    state (or DEFAULTS) and ``error`` says why, while writes raise ValueError."""
+
+    def __init__(self, path=PROFILES_FILE, compact_min: int = COMPACT_MIN):
+        self.path = Path(path)
+        self.log_path = self.path.with_name(self.path.name + ".log")
+        self.lock_path = self.path.with_name(self.path.name + ".lock")
+        self.compact_min = compact_min
+        self.error = None
+        self._profiles = None
+        self._names = None
+        self._stamp = None
+        self._log_ino = None
+        self._offset = 0
+        self._entries = 0
+        self._mutex = threading.RLock()
+
+    @contextmanager
+    def _locked(self, exclusive: bool):
+        with self._mutex, open(self.lock_path, "a+b") as f:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+                yield
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+                try:
+                    yield
+                finally:
+                    f.seek(0)
+                    msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+    def _log_state(self):
+        log = _stamp(self.log_path)
+        return (log[0], log[2]) if log else (None, 0)
+
+    def _stale(self) -> bool:
+        return (self._profiles is None or _stamp(self.path) != self._stamp
+                or self._log_state() != (self._log_ino, self._offset))
+
+    def _sync(self):
+        stamp = _stamp(self.path)
+        log_ino, log_size = self._log_state()
+        if self._profiles is None or stamp != self._stamp or log_ino != self._log_ino or log_size < self._offset:
+            self._load_snapshot(stamp)
+            self._log_ino, self._offset, self._entries = log_ino, 0, 0
+        if log_size > self._offset:
+            self._replay(log_size)
+
+    def _load_snapshot(self, stamp):
+        self._stamp, self._names, self.error = stamp, None, None
+        if stamp is None:
+            self._profiles = _defaults()
+            return
+        try:
+            data = json.loads(self.path.read_text())
+            if not isinstance(data, dict) or not data:
+                raise ValueError("invalid structure")
+        except ValueError as e:
+            self.error = f"{self.path}: {e}"
+            if self._profiles is None:
+                self._profiles = _defaults()
+            return
+        self._profiles = data
+
+    def _replay(self, end: int):
+        with open(self.log_path, "rb") as f:
+            f.seek(self._offset)
+            chunk = f.read(end - self._offset)
+        lines = chunk.split(b"\n")
+        # A last line without a newline was torn by a crashed writer; the next write drops it.
+        tail = lines.pop()
+        for line in lines:
+            try:
+                op = json.loads(line)
+            except ValueError:
+                continue
+            self._apply(op)
+        self._offset += len(chunk) - len(tail)
+        self._entries += len(lines)
+
+    def _apply(self, op):
+        if op[0] == "put":
+            if op[1] not in self._profiles:
+                self._names = None
+            self._profiles[op[1]] = op[2]
+        elif self._profiles.pop(op[1], None) is not None:
+            self._names = None
+
+    def _check_writable(self):
+        if self.error:
+            raise ValueError(f"not writing over an unreadable profile file ({self.error}); fix or move it first")
+
+    @contextmanager
+    def _writing(self):
+        with self._locked(True):
+            self._sync()
+            self._check_writable()
+            yield
+
+    def _write(self, ops):
+        data = b"".join(json.dumps(op, separators=(",", ":")).encode() + b"\n" for op in ops)
+        with open(self.log_path, "ab") as f:
+            if f.tell() != self._offset:
+                f.truncate(self._offset)
+            f.write(data)
+            self._log_ino = os.fstat(f.fileno()).st_ino
+        self._offset += len(data)
+        self._entries += len(ops)
+        for op in ops:
+            self._apply(op)
+        if self._entries > max(self.compact_min, len(self._profiles)):
+            self._compact()
+
+    def _compact(self):
+        tmp = self.path.with_name(f".{self.path.name}.{os.getpid()}.tmp")
+        # One profile per line: still readable, and about twice as fast as indent=2 at 10k+ profiles.
+        enc = json.JSONEncoder(separators=(", ", ": "))
+        body = ",\n".join(f"  {enc.encode(name)}: {enc.encode(p)}" for name, p in self._profiles.items())
+        with open(tmp, "w") as f:
+            f.write("{\n" + body + "\n}\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.path)
+        # Replaying a log that is already folded in is harmless, so a crash here loses nothing.
+        self.log_path.unlink(missing_ok=True)
+        self._stamp, self._log_ino, self._offset, self._entries = _stamp(self.path), None, 0, 0
+
+    def profiles(self) -> dict:
+        """The live mapping; callers must not modify it."""
+        with self._mutex:
+            if self._stale():
+                with self._locked(False):
+                    self._sync()
+            return self._profiles
+
+    def names(self):
+        with self._mutex:
+            profiles = self.profiles()
+            if self._names is None:
+                self._names = sorted(profiles)
+            return self._names
+
+    def get(self, name: str):
+        p = self.profiles().get(name)
+        return dict(p) if p is not None else None
+
+    def put(self, name: str, data: dict):
+        with self._writing():
+            self._write([["put", name, data]])
+
+    def delete(self, name: str):
+        with self._writing():
+            ops = [["del", name]]
+            if len(self._profiles) == 1 and name in self._profiles:
+                ops += [["put", n, p] for n, p in DEFAULTS.items()]
+            self._write(ops)
+
+    def replace(self, profiles: dict):
+        with self._writing():
+            self._profiles, self._names = dict(profiles) or _defaults(), None
+            self._compact()
+
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def default_store() -> ProfileStore:
+    key = os.path.abspath(PROFILES_FILE)
+    store = _stores.get(key)
+    if store is None:
+        with _stores_lock:
+            store = _stores.setdefault(key, ProfileStore(key))
+    return store
+
 
 def load_profiles():
-    return _ensure()
+    return {name: dict(p) for name, p in default_store().profiles().items()}
 
 def save_profiles(profiles: dict):
-    PROFILES_FILE.write_text(json.dumps(profiles, indent=2))
+    default_store().replace(profiles)
 
 def list_profiles(profiles: dict | None = None):
     if profiles is None:
-        profiles = load_profiles()
+        return list(default_store().names())
     return sorted(profiles.keys())
 
 def load_profile(name: str):
-    return load_profiles().get(name, DEFAULTS["Default"])
+    p = default_store().get(name)
+    return p if p is not None else dict(DEFAULTS["Default"])
 
 def save_profile(name: str, data: dict):
-    profiles = load_profiles()
-    profiles[name] = data
-    save_profiles(profiles)
+    default_store().put(name, data)
 
 def delete_profile(name: str):
-    profiles = load_profiles()
-    profiles.pop(name, None)
-    if not profiles:
-        profiles = DEFAULTS.copy()
-    save_profiles(profiles)
+    default_store().delete(name)
@@ -0,0 +1,38 @@
+import math
+import time
+from fractions import Fraction
+
+from core.erlang import ErlangTable, erlang_b, erlang_c
+
+
+def exact_erlang_c(a: Fraction, k: int) -> float:
+    b = Fraction(1)
+    for n in range(1, k + 1):
+        b = a * b / (n + a * b)
+    return float(k * b / (k - a * (1 - b)))
+
+
+def timed(fn, reps):
+    t0 = time.perf_counter()
+    for _ in range(reps):
+        fn()
+    return (time.perf_counter() - t0) / reps * 1e6
+
+
+print(f"{'k':>6} {'rho':>5} {'erlang_c':>12} {'rel_err':>9} {'window us':>10} {'recur us':>9} {'table us':>9}")
+table = ErlangTable()
+for k in (1, 8, 64, 170, 171, 1024, 4096, 10000):
+    for rho in (0.5, 0.9, 0.99):
+        a = rho * k
+        c = erlang_c(a, k)
+        ref = exact_erlang_c(Fraction(a), k) if k <= 1024 else None
+        if ref is None:
+            b = erlang_b(a, k)
+            ref = k * b / (k - a * (1.0 - b))
+        err = abs(c - ref) / ref if ref else 0.0
+        table.lookup(a, k)
+        t_win = timed(lambda: erlang_c(a, k), 200)
+        t_rec = timed(lambda: erlang_b(a, k), 20)
+        t_tab = timed(lambda: table.lookup(a, k), 2000)
+        assert math.isfinite(c) and err < 1e-9, (k, rho, c, ref)
+        print(f"{k:>6} {rho:>5.2f} {c:>12.6e} {err:>9.1e} {t_win:>10.1f} {t_rec:>9.1f} {t_tab:>9.2f}")
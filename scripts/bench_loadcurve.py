@@ -0,0 +1,25 @@
+import time
+
+import numpy as np
+
+from core.model import Params
+from core.loadcurve import plan_load_curve
+
+# A year of per-minute intervals with a daily cycle; peaks chosen so fleets span the
+# Erlang B recurrence (k <= 256) and the Poisson-tail path (k > 256).
+BASE = Params(3000, 120, 180, 20.0, 0.6, 0.9, 8, 0.5, 1.5, 20000, 150, 40)
+minutes = np.arange(365 * 1440)
+day = 0.55 + 0.45 * np.sin(minutes * 2 * np.pi / 1440)
+
+print(f"{'peak qps':>9} {'peak servers':>13} {'autoscale s':>12} {'static s':>9}")
+for peak in (30, 300, 3000, 30000):
+    qps = peak * day
+    t0 = time.perf_counter()
+    out = plan_load_curve(BASE, qps, interval_s=60.0)
+    t_auto = time.perf_counter() - t0
+    k = out["totals"]["peak_servers"]
+    t0 = time.perf_counter()
+    static = plan_load_curve(Params(**{**BASE.__dict__, "servers": k}), qps, interval_s=60.0, autoscale=False)
+    t_static = time.perf_counter() - t0
+    assert not np.isnan(out["intervals"]["p95_s"]).any() and not np.isnan(static["intervals"]["p95_s"]).any()
+    print(f"{peak:>9} {k:>13} {t_auto:>12.2f} {t_static:>9.2f}")
@@ -0,0 +1,41 @@
+import time
+
+import numpy as np
+
+from core.model import Params, plan
+from core.batch import plan_batch, FIELDS
+
+N = 100_000
+rng = np.random.default_rng(0)
+cols = {
+    "T_ctx": rng.uniform(0, 8000, N),
+    "T_prompt": rng.uniform(0, 500, N),
+    "T_resp": rng.uniform(1, 800, N),
+    "qps": rng.uniform(0, 40, N),
+    "cache_hit": rng.uniform(0, 1, N),
+    "cache_savings": rng.uniform(0, 1, N),
+    "batch": rng.integers(1, 65, N).astype(float),
+    "price_in": rng.uniform(0, 2, N),
+    "price_out": rng.uniform(0, 4, N),
+    "tps_prefill": rng.uniform(5000, 40000, N),
+    "tps_decode": rng.uniform(50, 400, N),
+    "net_ms_one_way": rng.uniform(0, 100, N),
+    "servers": rng.integers(1, 33, N).astype(float),
+    "burst_factor": rng.uniform(1, 3, N),
+}
+
+t0 = time.perf_counter()
+out = plan_batch(cols)
+t_batch = time.perf_counter() - t0
+
+t0 = time.perf_counter()
+for i in range(N):
+    kw = {f: float(cols[f][i]) for f in FIELDS}
+    kw["batch"] = int(kw["batch"])
+    kw["servers"] = int(kw["servers"])
+    plan(Params(**kw))
+t_loop = time.perf_counter() - t0
+
+print(f"plan loop : {t_loop * 1000:9.1f} ms ({N} scenarios)")
+print(f"plan_batch: {t_batch * 1000:9.1f} ms")
+print(f"speedup   : {t_loop / t_batch:9.1f}x")
@@ -0,0 +1,66 @@
+import time
+import tracemalloc
+from typing import Any, Dict
+
+import numpy as np
+import orjson
+from pydantic import TypeAdapter
+
+from core.model import Params, plan, plan_result
+from core.batch import plan_batch, flatten_columns
+from core.recommend import optimize
+
+N = 20_000
+p = Params(3000, 120, 180, 2.0, 0.6, 0.9, 8, 0.5, 1.5, 20000, 150, 40, 4)
+grid = [Params(**{**p.__dict__, "T_ctx": 1000 + i % 4000, "batch": 1 + i % 64}) for i in range(N)]
+
+
+def timed(fn, n=1):
+    t0 = time.perf_counter()
+    for _ in range(n):
+        out = fn()
+    return (time.perf_counter() - t0) / n, out
+
+
+def retained(fn):
+    tracemalloc.start()
+    keep = fn()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del keep
+    return size
+
+
+t_dict, _ = timed(lambda: [plan(q) for q in grid])
+t_slot, _ = timed(lambda: [plan_result(q) for q in grid])
+m_dict = retained(lambda: [plan(q) for q in grid])
+m_slot = retained(lambda: [plan_result(q) for q in grid])
+print(f"plan() dict     : {t_dict / N * 1e6:6.1f} us/call {m_dict / N:7.0f} B/result")
+print(f"plan_result()   : {t_slot / N * 1e6:6.1f} us/call {m_slot / N:7.0f} B/result")
+
+for mode in ("grid", "pruned"):
+    t_opt, _ = timed(lambda: optimize(p, mode=mode, T_ctx_opts=range(500, 4001, 100)), 5)
+    tracemalloc.start()
+    optimize(p, mode=mode, T_ctx_opts=range(500, 4001, 100))
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    print(f"optimize({mode:<6}): {t_opt * 1000:6.1f} ms       peak {peak / 1024:7.0f} KiB")
+
+# FastAPI's default path for a Dict[str, Any] return: validate, then dump_json in pydantic-core.
+adapter = TypeAdapter(Dict[str, Any])
+pydantic_json = lambda payload: adapter.dump_json(adapter.validate_python(payload))
+fast_json = lambda payload: orjson.dumps(payload, option=orjson.OPT_SERIALIZE_NUMPY)
+
+single = plan(p)
+cols = {f: np.array([getattr(q, f) for q in grid], dtype=float) for f in p.__dict__}
+out = flatten_columns(plan_batch(cols), ["cost.per_query", "cost.per_month", "latency.p95_s", "latency.rho"])
+listed = lambda: {"n": N, "columns": {k: v.tolist() for k, v in out.items()}}
+for name, slow, fast in (
+    ("/plan", lambda: pydantic_json(single), lambda: fast_json(single)),
+    ("/plan/batch", lambda: pydantic_json(listed()), lambda: fast_json({"n": N, "columns": out})),
+):
+    t_std, body = timed(slow, 200)
+    t_fast, body_fast = timed(fast, 200)
+    print(f"{name:<16}: default {t_std * 1e6:9.1f} us ({t_std / len(body) * 1e9:5.1f} ns/B) "
+          f"FAST_JSON {t_fast * 1e6:9.1f} us ({t_fast / len(body_fast) * 1e9:5.1f} ns/B) "
+          f"{len(body_fast)} bytes")
@@ -1,8 +1,35 @@
-import json, pathlib
+import argparse, json, pathlib, time
 from core.model import Params, plan
+from core.batch import params_to_columns
+from core.export import ENCODERS, iter_column_chunks, read_scenarios
 
-path = pathlib.Path(__file__).resolve().parents[1] / "examples" / "scenarios.json"
-scenarios = json.loads(path.read_text())
+default = pathlib.Path(__file__).resolve().parents[1] / "examples" / "scenarios.json"
+parser = argparse.ArgumentParser(description="Plan the example scenarios, or export a scenario file.")
+parser.add_argument("--scenarios", default=str(default), help="JSON list, .parquet or Arrow IPC file")
+parser.add_argument("--out", default=None, help="write results to .csv/.json/.ndjson/.arrow/.parquet instead of printing")
+args = parser.parse_args()
+
+if args.scenarios.endswith(".json"):
+    scenarios = json.loads(pathlib.Path(args.scenarios).read_text())
+    names = [s["name"] for s in scenarios]
+    cols = params_to_columns(Params(**s["params"]) for s in scenarios)
+else:
+    cols = read_scenarios(args.scenarios)
+    names = cols.pop("name", None)
+    scenarios = None
+    if not args.out:
+        parser.error("--out is required for Parquet/Arrow scenario files")
+
+if args.out:
+    fmt = pathlib.Path(args.out).suffix.lstrip(".")
+    if fmt not in ENCODERS:
+        parser.error(f"unsupported output format: {fmt}")
+    t0 = time.perf_counter()
+    with open(args.out, "w" if fmt in ("csv", "json", "ndjson") else "wb") as f:
+        for part in ENCODERS[fmt](iter_column_chunks(cols, names)):
+            f.write(part)
+    print(f"wrote {len(cols['qps'])} scenarios to {args.out} in {time.perf_counter() - t0:.2f}s")
+    raise SystemExit
 
 for s in scenarios:
     p = Params(**s["params"])
@@ -0,0 +1,27 @@
+import argparse
+import json
+import time
+
+from core.presets import get_preset, list_presets
+from core.pricing import apply_profile
+from core.replay import replay
+
+parser = argparse.ArgumentParser(description="Replay a JSONL request trace through the cost and queue model.")
+parser.add_argument("trace")
+parser.add_argument("--preset", default="Prod", choices=list_presets())
+parser.add_argument("--profile", default=None)
+parser.add_argument("--servers", type=int, default=None)
+parser.add_argument("--workers", type=int, default=0)
+args = parser.parse_args()
+
+p = get_preset(args.preset)
+if args.profile:
+    p = apply_profile(p, args.profile)
+if args.servers:
+    p.servers = args.servers
+
+t0 = time.perf_counter()
+out = replay(args.trace, p, workers=args.workers)
+dt = time.perf_counter() - t0
+print(json.dumps(out, indent=2))
+print(f"{out['requests']} requests in {dt:.2f}s ({out['requests'] / max(dt, 1e-9):,.0f} lines/s)")
@@ -0,0 +1,95 @@
+import math
+import random
+
+import numpy as np
+import pytest
+
+from core.model import Params, plan
+from core.batch import plan_batch, params_to_columns, erlang_c_batch
+from core.erlang import erlang_c
+
+
+def _random_params(rng, n):
+    out = []
+    for _ in range(n):
+        out.append(Params(
+            T_ctx=rng.uniform(0, 8000), T_prompt=rng.uniform(0, 500), T_resp=rng.uniform(0, 800),
+            qps=rng.uniform(0, 40), cache_hit=rng.uniform(0, 1), cache_savings=rng.uniform(0, 1),
+            batch=rng.randint(1, 64), price_in=rng.uniform(0, 2), price_out=rng.uniform(0, 4),
+            tps_prefill=rng.uniform(5000, 40000), tps_decode=rng.uniform(50, 400),
+            net_ms_one_way=rng.uniform(0, 100), servers=rng.randint(1, 120),
+            burst_factor=rng.uniform(1, 3),
+        ))
+    return out
+
+
+def test_plan_batch_matches_plan():
+    items = _random_params(random.Random(7), 300)
+    out = plan_batch(params_to_columns(items))
+    for i, p in enumerate(items):
+        ref = plan(p)
+        for group in ("tokens", "cost", "latency"):
+            for key, val in ref[group].items():
+                got = out[group][key][i]
+                if isinstance(val, bool):
+                    assert bool(got) == val
+                elif math.isinf(val):
+                    assert math.isinf(got)
+                else:
+                    assert math.isclose(got, val, rel_tol=1e-9, abs_tol=1e-12), (group, key, i)
+
+
+def test_plan_batch_broadcasts_scalars():
+    out = plan_batch({
+        "T_ctx": np.linspace(0, 4000, 5), "T_prompt": 100, "T_resp": 150, "qps": 1.0,
+        "cache_hit": 0.2, "cache_savings": 0.8, "batch": 2, "price_in": 0.5, "price_out": 1.5,
+        "tps_prefill": 20000, "tps_decode": 150,
+    })
+    assert out["cost"]["per_query"].shape == (5,)
+    assert np.all(np.diff(out["cost"]["per_query"]) > 0)
+
+
+def test_erlang_c_batch_large_fleets_match_scalar():
+    rng = random.Random(3)
+    k = np.array([rng.choice([rng.randint(1, 256), rng.randint(257, 5000), rng.randint(5000, 2_000_000)])
+                  for _ in range(400)])
+    a = k * np.array([rng.uniform(0.3, 0.999) for _ in range(len(k))])
+    a[:4] = 0.0
+    k[:4] = [1, 10, 1000, 10**6]
+    got = erlang_c_batch(a, k)
+    ref = np.array([erlang_c(x, n) for x, n in zip(a, k)])
+    assert np.allclose(got, ref, rtol=1e-7, atol=1e-12)
+    # Cost follows the offered load, not the fleet size.
+    p = Params(3000,120,180,2.0,0.6,0.9,8,0.5,1.5,20000,150,40,servers=10**9)
+    assert plan_batch(params_to_columns([p]))["latency"]["p_wait"][0] == plan(p)["latency"]["p_wait"]
+    idle = Params(1000,100,150,0.0,0.2,0.8,2,0.5,1.5,20000,150,50,servers=1000)
+    assert plan_batch(params_to_columns([idle]))["latency"]["p95_s"][0] == pytest.approx(plan(idle)["latency"]["p95_s"])
+
+
+def test_flatten_columns_field_mask():
+    from core.batch import flatten_columns
+    out = plan_batch(params_to_columns([Params(1000,100,150,1,0.2,0.8,2,0.5,1.5,20000,150,50)]))
+    flat = flatten_columns(out, ["cost.per_query", "latency.p95_s"])
+    assert list(flat) == ["cost.per_query", "latency.p95_s"]
+    assert "tokens.T_ctx_eff" in flatten_columns(out)
+    with pytest.raises(KeyError):
+        flatten_columns(out, ["cost.nope"])
+
+
+def test_plan_batch_endpoint_roundtrip():
+    from fastapi.testclient import TestClient
+    from api.main import app
+
+    items = [Params(1000,100,150,1,0.2,0.8,2,0.5,1.5,20000,150,50),
+             Params(3000,120,180,2.0,0.6,0.9,8,0.5,1.5,20000,150,40,4)]
+    c = TestClient(app)
+    r = c.post("/plan/batch", json={"items": [p.__dict__ for p in items], "fields": ["cost.per_query", "latency.p95_s"]})
+    assert r.status_code == 200
+    body = r.json()
+    assert body["n"] == 2 and list(body["columns"]) == ["cost.per_query", "latency.p95_s"]
+    # The first item is unstable: its infinite p95 comes back as null.
+    assert body["columns"]["latency.p95_s"][0] is None
+    assert math.isclose(body["columns"]["latency.p95_s"][1], plan(items[1])["latency"]["p95_s"], rel_tol=1e-9)
+    assert math.isclose(body["columns"]["cost.per_query"][0], plan(items[0])["cost"]["per_query"], rel_tol=1e-9)
+    assert c.post("/plan/batch", json={"items": [items[0].__dict__], "fields": ["cost.nope"]}).status_code == 400
+    assert c.post("/plan/batch", json={}).status_code == 400
@@ -0,0 +1,53 @@
+import time
+
+from core.model import Params, plan
+from core.cache import ResultCache
+
+
+def _p(**kw):
+    base = Params(1000,100,150,1.0,0.3,0.8,2,0.5,1.5,20000,150,50)
+    return Params(**{**base.__dict__, **kw})
+
+
+def test_quantized_keys_share_entries_and_reads_are_copies():
+    c = ResultCache()
+    a = c.plan(_p(cache_hit=0.1 + 0.2))
+    a["cost"]["per_query"] = -1.0
+    b = c.plan(_p(cache_hit=0.3))
+    assert b["cost"]["per_query"] == plan(_p(cache_hit=0.3))["cost"]["per_query"]
+    assert c.stats()["hits"] == 1 and c.stats()["misses"] == 1
+    assert len(c) == 1
+
+
+def test_size_and_ttl_eviction():
+    c = ResultCache(maxsize=2, ttl=0.05)
+    for qps in (1.0, 2.0, 3.0):
+        c.plan(_p(qps=qps))
+    assert len(c) == 2 and c.stats()["evictions"] == 1
+    time.sleep(0.06)
+    c.plan(_p(qps=3.0))
+    assert c.stats()["hits"] == 0
+
+
+def test_sqlite_tier_is_shared_between_instances(tmp_path):
+    db = str(tmp_path / "cache.db")
+    ResultCache(path=db).plan(_p(qps=0.2))
+    other = ResultCache(path=db)
+    r = other.plan(_p(qps=0.2))
+    assert other.stats()["disk_hits"] == 1
+    assert r == plan(_p(qps=0.2))
+
+
+def test_plan_echoes_caller_inputs_and_sqlite_tier_is_pruned(tmp_path, monkeypatch):
+    c = ResultCache()
+    assert c.plan(_p(cache_hit=0.1 + 0.2))["inputs"]["cache_hit"] == 0.1 + 0.2
+    monkeypatch.setattr("core.cache.PRUNE_EVERY", 4)
+    db = str(tmp_path / "cache.db")
+    c = ResultCache(path=db, ttl=60, disk_maxsize=3)
+    for i in range(8):
+        c.plan(_p(qps=1.0 + i))
+    rows = c._db.execute("SELECT key FROM results").fetchall()
+    assert len(rows) == 3
+    assert ResultCache(path=db).plan(_p(qps=8.0)) == plan(_p(qps=8.0))
+    c._db.execute("UPDATE results SET expires = 1")
+    assert len(ResultCache(path=db)._db.execute("SELECT key FROM results").fetchall()) == 0
@@ -0,0 +1,29 @@
+from core.compare import compare_profiles
+from core.model import Params, plan
+from core.pricing import apply_profile, list_profiles
+from core.solve import min_servers
+
+BASE = Params(3000,120,180,20.0,0.6,0.9,8,0.5,1.5,20000,150,40)
+
+
+def test_compare_matches_plan_and_sorts_by_cost():
+    out = compare_profiles(BASE, sla_p95=None, rho_target=None)
+    assert out["count"] == len(list_profiles())
+    costs = [r["cost"]["per_query"] for r in out["results"]]
+    assert costs == sorted(costs)
+    for r in out["results"]:
+        assert abs(r["cost"]["per_month"] - plan(apply_profile(BASE, r["profile"]))["cost"]["per_month"]) < 1e-6
+
+
+def test_optimized_config_is_cheapest_feasible():
+    out = compare_profiles(BASE, ["default", "cheap-fast"], optimize=True, batch_max=16)
+    for r in out["results"]:
+        q = apply_profile(BASE, r["profile"])
+        best = None
+        for b in range(1, 17):
+            qb = Params(**{**q.__dict__, "batch": b})
+            k = min_servers(qb, sla_p95=2.0, rho_target=0.7)["servers"]
+            cost = plan(qb)["cost"]["per_query"]
+            if k and (best is None or cost < best[0]):
+                best = (cost, b, k)
+        assert r["meets_targets"] and (r["batch"], r["servers"]) == best[1:]
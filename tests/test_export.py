@@ -0,0 +1,75 @@
+import csv
+import gzip
+import io
+import json
+import math
+
+import numpy as np
+import pytest
+
+from core.batch import params_to_columns
+from core.cache import ResultCache
+from core.export import (cached_export_chunk, iter_export_chunks, iter_column_chunks, encode_csv, encode_json, encode_arrow,
+                         encode_parquet, gzip_stream, read_scenarios, write_scenarios)
+from core.model import Params, plan
+
+BASE = Params(3000,120,180,20.0,0.6,0.9,8,0.5,1.5,20000,150,40)
+
+
+def _items(n):
+    return [(f"s{i}", Params(**{**BASE.__dict__, "qps": 1.0 + i})) for i in range(n)]
+
+
+def test_csv_stream_matches_plan_across_chunks():
+    items = _items(7)
+    text = "".join(encode_csv(iter_export_chunks(items, chunk_size=3)))
+    rows = list(csv.DictReader(io.StringIO(text)))
+    assert [r["name"] for r in rows] == [name for name, _ in items]
+    for row, (_, p) in zip(rows, items):
+        r = plan(p)
+        assert abs(float(row["cost_per_query"]) - r["cost"]["per_query"]) < 1e-12
+        assert math.isclose(float(row["p95_s"]), r["latency"]["p95_s"], rel_tol=1e-9)
+
+
+def test_empty_export_and_gzip_roundtrip():
+    assert json.loads("".join(encode_json(iter_export_chunks([])))) == []
+    assert "".join(encode_csv(iter_export_chunks([]))).startswith("name,cost_per_query")
+    raw = b"".join(gzip_stream(encode_json(iter_export_chunks(_items(5), chunk_size=2))))
+    assert len(json.loads(gzip.decompress(raw))) == 5
+
+
+def test_json_keeps_names_with_unicode_line_separators():
+    names = ["a\u2028b", "c\u2029d", "e\u0085f"]
+    items = [(name, BASE) for name in names]
+    rows = json.loads("".join(encode_json(iter_export_chunks(items, chunk_size=2))))
+    assert [r["name"] for r in rows] == names
+
+
+def test_cached_chunk_matches_plan_batch_chunk():
+    items = _items(5) + [("unstable", Params(**{**BASE.__dict__, "qps": 1e6}))]
+    cache = ResultCache()
+    got = cached_export_chunk(items, cache)
+    ref = next(iter_export_chunks(items))
+    assert got["name"] == ref["name"] and len(cache) == len(items)
+    for col in ref:
+        if col != "name":
+            assert np.allclose(got[col], ref[col], rtol=1e-9), col
+    assert "".join(encode_csv(iter([got]))) == "".join(encode_csv(iter([ref])))
+
+
+def test_parquet_and_arrow_roundtrip(tmp_path):
+    pytest.importorskip("pyarrow")
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    items = _items(6)
+    cols = params_to_columns(p for _, p in items)
+    for suffix in (".parquet", ".arrow"):
+        path = tmp_path / f"scenarios{suffix}"
+        write_scenarios(path, cols, [name for name, _ in items])
+        back = read_scenarios(path)
+        assert list(back["name"]) == [name for name, _ in items]
+        assert np.array_equal(back["qps"], cols["qps"])
+    chunks = list(iter_column_chunks(back, back.pop("name"), chunk_size=4))
+    table = pq.read_table(io.BytesIO(b"".join(encode_parquet(chunks))))
+    assert table.column("p95_s").to_pylist() == pytest.approx([plan(p)["latency"]["p95_s"] for _, p in items])
+    assert pa.ipc.open_stream(b"".join(encode_arrow(chunks))).read_all().num_rows == 6
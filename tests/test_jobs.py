@@ -0,0 +1,74 @@
+import time
+
+import numpy as np
+import pytest
+
+from core.jobs import JobManager, expand_sweep, run_shard
+
+
+def _wait(manager, job, timeout=60.0):
+    deadline = time.time() + timeout
+    while job.status == "running" and time.time() < deadline:
+        time.sleep(0.02)
+    return job
+
+
+def test_job_shards_match_plan_batch():
+    manager = JobManager(workers=2, shard_rows=5)
+    grid = {"batch": [1, 2, 4], "servers": [1, 2, 3, 4]}
+    try:
+        job = _wait(manager, manager.submit({"presets": ["POC"], "grid": grid}))
+        assert job.status == "done"
+        assert job.summary()["rows_done"] == 12
+        parts = sorted(manager.results(job.id), key=lambda r: r["start"])
+        assert [r["start"] for r in parts] == [0, 5, 10]
+        got = np.concatenate([r["columns"]["cost.per_month"] for r in parts])
+        base = expand_sweep({"presets": ["POC"]})[0]["params"]
+        want = run_shard(base, grid, 0, 12, ["cost.per_month"])["cost.per_month"]
+        assert np.allclose(got, want)
+    finally:
+        manager.shutdown()
+
+
+def test_job_rejects_unknown_axis_and_cancels():
+    manager = JobManager(workers=1, shard_rows=1)
+    try:
+        with pytest.raises(KeyError):
+            manager.submit({"presets": ["POC"], "grid": {"nope": [1.0]}})
+        job = manager.submit({"presets": ["POC"], "grid": {"servers": list(range(1, 200))}})
+        assert manager.cancel(job.id).status == "cancelled"
+        assert manager.active() == 0
+    finally:
+        manager.shutdown()
+
+
+def test_stream_reports_eviction(monkeypatch):
+    from fastapi.testclient import TestClient
+    import api.main
+
+    manager = JobManager(workers=1)
+    job = manager.submit({"presets": ["POC"], "grid": {"servers": [1, 2]}})
+    lookups = iter([job])
+    monkeypatch.setattr(manager, "get", lambda job_id: next(lookups, None))
+    monkeypatch.setattr("core.jobs._default", manager)
+    try:
+        lines = TestClient(api.main.app).get(f"/jobs/{job.id}/stream").text.splitlines()
+        assert lines == ['{"status": "evicted", "error": "job was evicted before the stream finished"}']
+    finally:
+        manager.shutdown()
+
+
+def test_eviction_skips_active_jobs_and_bounds_rows():
+    from core.jobs import Job
+
+    manager = JobManager(workers=1, max_jobs=3, max_rows=100)
+    jobs = [Job(f"j{i}", {}) for i in range(5)]
+    for i, job in enumerate(jobs):
+        job.status = "running" if i == 0 else "done"
+        job.rows_total = 10
+        manager._jobs[job.id] = job
+    manager._evict()
+    assert list(manager._jobs) == ["j0", "j3", "j4"]
+    jobs[3].rows_total = 200
+    manager._evict()
+    assert list(manager._jobs) == ["j0", "j4"]
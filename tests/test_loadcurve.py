@@ -0,0 +1,41 @@
+import numpy as np
+import pytest
+
+from core.model import Params, plan
+from core.loadcurve import plan_load_curve
+from core.solve import min_servers
+
+BASE = Params(3000,120,180,20.0,0.6,0.9,8,0.5,1.5,20000,150,40)
+
+
+def test_hourly_curve_sizes_each_interval_like_min_servers():
+    qps = 20 + 15 * np.sin(np.arange(48) * 2 * np.pi / 24)
+    out = plan_load_curve(BASE, qps, server_cost_per_hour=2.0)
+    for q, k in zip(qps, out["intervals"]["servers"]):
+        assert k == min_servers(Params(**{**BASE.__dict__, "qps": float(q)}), sla_p95=2.0, rho_target=0.7)["servers"]
+    assert np.all(out["intervals"]["p95_s"] <= 2.0)
+    assert out["daily"]["cost_tokens"].shape == (2,)
+    t = out["totals"]
+    assert t["cost_servers"] < t["cost_servers_static"]
+    assert abs(t["cost_servers"] - 2.0 * out["intervals"]["servers"].sum()) < 1e-6
+
+
+def test_flat_curve_token_cost_matches_plan():
+    out = plan_load_curve(BASE, np.full(24, BASE.qps), autoscale=False)
+    assert abs(out["totals"]["cost_tokens"] - plan(BASE)["cost"]["per_day"]) < 1e-6 * plan(BASE)["cost"]["per_day"]
+    assert abs(out["totals"]["per_month"] - plan(BASE)["cost"]["per_month"]) < 1e-6 * plan(BASE)["cost"]["per_month"]
+
+
+def test_interval_must_be_positive():
+    for interval_s in (0.0, -60.0, float("nan")):
+        with pytest.raises(ValueError):
+            plan_load_curve(BASE, [1.0, 2.0], interval_s=interval_s)
+    out = plan_load_curve(BASE, np.full(5, 1.0), interval_s=1e-6, autoscale=False)
+    assert out["daily"]["cost_tokens"].shape == (1,)
+
+
+def test_large_static_fleet_matches_plan_including_idle_intervals():
+    p = Params(**{**BASE.__dict__, "servers": 400})
+    out = plan_load_curve(p, [0.0, 10.0, 150.0], autoscale=False)
+    for q, p95 in zip((0.0, 10.0, 150.0), out["intervals"]["p95_s"]):
+        assert np.isclose(p95, plan(Params(**{**p.__dict__, "qps": q}))["latency"]["p95_s"], rtol=1e-9)
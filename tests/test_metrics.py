@@ -0,0 +1,54 @@
+import time
+
+from core.metrics import COUNT_BUCKETS, Registry, Histogram, begin_request, stage, stages
+
+
+def test_histogram_buckets_and_prometheus_text():
+    h = Histogram((0.1, 1.0))
+    for v in (0.05, 0.1, 0.5, 3.0):
+        h.observe(v)
+    assert h.counts == [2, 1, 1] and h.count == 4
+    reg = Registry()
+    reg.histogram("lat_seconds", "Latency.", (0.1, 1.0))
+    reg.counter("requests_total", "Requests.")
+    reg.gauge("jobs", "Jobs.", lambda: [((), 3)])
+    reg.observe("lat_seconds", 0.5, route="/plan")
+    reg.inc("requests_total", route="/plan", status="200")
+    text = reg.render()
+    assert 'lat_seconds_bucket{route="/plan",le="0.1"} 0' in text
+    assert 'lat_seconds_bucket{route="/plan",le="+Inf"} 1' in text
+    assert 'requests_total{route="/plan",status="200"} 1' in text
+    assert "jobs 3" in text
+
+
+def test_stage_splits_request_time():
+    t = begin_request()
+    time.sleep(0.01)
+    with stage():
+        time.sleep(0.02)
+    s = stages(t, time.perf_counter())
+    assert s["validate"] >= 0.009 and s["compute"] >= 0.019 and s["serialize"] >= 0
+
+
+def test_optimize_evaluations_count_cache_hits_as_zero():
+    from fastapi.testclient import TestClient
+    from api.main import app, METRICS
+
+    body = {"params": dict(T_ctx=1234.5, T_prompt=100, T_resp=150, qps=1, cache_hit=0.2, cache_savings=0.8,
+                           batch=2, price_in=0.5, price_out=1.5, tps_prefill=20000, tps_decode=150),
+            "mode": "pruned"}
+    series = METRICS._hists["optimize_plan_evaluations"]
+
+    def counts():
+        h = series.get((("mode", "pruned"),))
+        return list(h.counts) if h else [0] * (len(COUNT_BUCKETS) + 1)
+
+    before = counts()
+    c = TestClient(app)
+    evals = [c.post("/optimize", json=body).json()["evals"] for _ in range(2)]
+    added = [a - b for a, b in zip(counts(), before)]
+    assert evals[0] == evals[1] > 1
+    assert COUNT_BUCKETS[0] == 0
+    assert sum(added) == 2 and added[0] == 1
+    text = METRICS.render()
+    assert 'optimize_plan_evaluations_bucket{mode="pruned",le="0"}' in text
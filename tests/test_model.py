@@ -1,4 +1,4 @@
-from core.model import Params, plan
+from core.model import Params, PlanResult, plan, plan_result
 
 def test_cost_increases_with_more_context():
     a = plan(Params(1000,100,150,1,0.0,0.0,1,0.5,1.5,20000,150,50))
@@ -20,3 +20,22 @@ def test_nonnegative_and_stability():
     assert res['cost']['per_query'] >= 0
     assert res['latency']['p50_s'] >= 0
     assert 0 <= res['latency']['rho'] < 1
+
+def test_erlang_c_matches_recurrence_and_handles_large_fleets():
+    from core.erlang import erlang_b, erlang_c
+    for k, a in [(2, 1.5), (17, 12.0), (170, 150.0), (1024, 1000.0), (10000, 9900.0)]:
+        b = erlang_b(a, k)
+        ref = k * b / (k - a * (1.0 - b))
+        assert abs(erlang_c(a, k) - ref) <= 1e-9 * max(ref, 1e-300)
+    res = plan(Params(1000,100,150,600,0.2,0.8,4,0.5,1.5,20000,150,50,servers=1024))
+    assert res['latency']['stable']
+    assert 0 <= res['latency']['p_wait'] <= 1
+
+def test_plan_result_is_slotted_and_matches_plan():
+    p = Params(3000,120,180,50,0.6,0.9,8,0.5,1.5,20000,150,40,2)
+    r = plan_result(p)
+    assert isinstance(r, PlanResult) and not hasattr(r, "__dict__")
+    assert r.inputs is p
+    d = plan(p)
+    assert r.to_dict() == d
+    assert (r.p95_s, r.rho, r.per_month) == (d['latency']['p95_s'], d['latency']['rho'], d['cost']['per_month'])
@@ -0,0 +1,40 @@
+import numpy as np
+import pytest
+
+from core.model import Params, plan
+from core.montecarlo import draw, montecarlo
+
+STABLE = Params(3000,120,180,2.0,0.6,0.9,8,0.5,1.5,20000,150,40,4)
+
+
+def test_degenerate_distributions_reproduce_plan_and_bands_bracket():
+    base = plan(STABLE)
+    fixed = montecarlo(STABLE, {"qps": {"dist": "empirical", "samples": [2.0]}}, n=1000, sla_p95=base["latency"]["p95_s"])
+    band = fixed["bands"]["cost.per_month"]
+    assert band["p5"] == band["p95"] == pytest.approx(base["cost"]["per_month"])
+    assert fixed["sla_breach_probability"] == 0.0
+
+    dists = {"qps": {"dist": "lognormal", "median": 2.0, "sigma": 0.2},
+             "cache_hit": {"dist": "triangular", "low": 0.4, "mode": 0.6, "high": 0.8}}
+    out = montecarlo(STABLE, dists, n=20000, seed=1, sla_p95=base["latency"]["p95_s"])
+    cost = out["bands"]["cost.per_month"]
+    assert cost["p5"] < base["cost"]["per_month"] * 1.05 < cost["p95"]
+    assert 0.0 < out["sla_breach_probability"] < 1.0
+    assert out == montecarlo(STABLE, dists, n=20000, seed=1, sla_p95=base["latency"]["p95_s"])
+
+
+def test_draw_specs_and_errors():
+    rng = np.random.default_rng(0)
+    x = draw({"dist": "normal", "mean": 0.5, "std": 1.0, "min": 0.0, "max": 1.0}, 5000, rng)
+    assert x.min() == 0.0 and x.max() == 1.0
+    assert set(draw({"dist": "empirical", "samples": [1, 3]}, 100, rng)) == {1.0, 3.0}
+    with pytest.raises(ValueError):
+        draw({"dist": "beta"}, 10, rng)
+    with pytest.raises(ValueError):
+        draw({"dist": "normal", "mean": 1.0}, 10, rng)
+    with pytest.raises(KeyError):
+        montecarlo(STABLE, {"bogus": {"dist": "normal", "mean": 1, "std": 1}})
+    with pytest.raises(ValueError):
+        montecarlo(STABLE, {"servers": {"dist": "normal", "mean": 2, "std": 3}}, n=1000)
+    out = montecarlo(STABLE, {"servers": {"dist": "triangular", "low": 3.6, "mode": 4, "high": 4.4}}, n=1000)
+    assert out["bands"]["latency.p95_s"]["p5"] == out["bands"]["latency.p95_s"]["p95"] == plan(STABLE)["latency"]["p95_s"]
@@ -0,0 +1,73 @@
+import itertools
+
+import numpy as np
+
+from core.model import Params, plan
+from core.pareto import pareto_mask, pareto_frontier, sweep_grid
+
+
+def test_pareto_mask_matches_brute_force():
+    rng = np.random.default_rng(3)
+    for _ in range(50):
+        F = rng.integers(0, 6, (40, 3)).astype(float)
+        keep = pareto_mask(F)
+        expected = {
+            tuple(a) for a in F
+            if not any(np.all(b <= a) and np.any(b < a) for b in F)
+        }
+        assert {tuple(a) for a in F[keep]} == expected
+        assert keep.sum() == len(expected)
+
+
+def test_pareto_frontier_points_are_non_dominated():
+    p = Params(2000,150,200,5.0,0.4,0.8,4,0.5,1.5,20000,150,50,servers=2)
+    space = {"T_resp": [100, 200], "batch": [1, 8, 64], "servers": [4, 6, 8]}
+    out = pareto_frontier(p, space, sla_p95=5.0, chunk_size=5)
+    assert out["evaluated"] == 18
+    front = out["frontier"]
+    assert 0 < out["size"] == len(front)
+    for it in front:
+        r = plan(Params(**it["params"]))
+        assert r["latency"]["p95_s"] <= 5.0
+        assert abs(r["cost"]["per_query"] - it["cost.per_query"]) < 1e-12
+    def objectives(r):
+        return tuple(round(v, 9) for v in (r["cost"]["per_query"], r["latency"]["p95_s"], -r["latency"]["rho"]))
+
+    def dominates(a, b):
+        return all(x <= y for x, y in zip(a, b)) and a != b
+
+    front_obj = [tuple(round(v, 9) for v in (it["cost.per_query"], it["latency.p95_s"], -it["latency.rho"])) for it in front]
+    for resp, b, k in itertools.product(*space.values()):
+        r = plan(Params(**{**p.__dict__, "T_resp": resp, "batch": b, "servers": k}))
+        if r["latency"]["p95_s"] > 5.0:
+            continue
+        obj = objectives(r)
+        assert not any(dominates(obj, f) for f in front_obj)
+        assert obj in front_obj or any(dominates(f, obj) for f in front_obj)
+
+
+def test_sweep_grid_matches_plan_per_point():
+    p = Params(2000,150,200,5.0,0.4,0.8,4,0.5,1.5,20000,150,50,servers=2)
+    space = {"batch": [1, 4, 16], "servers": [1, 2, 3, 5]}
+    out = sweep_grid(p, space, ["latency.p95_s", "cost.per_month"])
+    assert out["latency.p95_s"].shape == (3, 4)
+    for (i, b), (j, k) in itertools.product(enumerate(space["batch"]), enumerate(space["servers"])):
+        r = plan(Params(**{**p.__dict__, "batch": b, "servers": k}))
+        assert np.isclose(out["latency.p95_s"][i, j], r["latency"]["p95_s"]) or (
+            np.isinf(out["latency.p95_s"][i, j]) and np.isinf(r["latency"]["p95_s"]))
+        assert np.isclose(out["cost.per_month"][i, j], r["cost"]["per_month"])
+
+
+def test_space_size_does_not_wrap_and_api_caps_it():
+    from fastapi.testclient import TestClient
+    from api.main import app, PARETO_MAX_POINTS
+    from core.pareto import space_size
+
+    assert space_size({f"x{i}": range(1000) for i in range(7)}) == 1000 ** 7
+    assert space_size({f"x{i}": [0, 1] for i in range(64)}) == 2 ** 64
+    assert space_size({}) == 1
+    params = dict(T_ctx=1000, T_prompt=100, T_resp=150, qps=1, cache_hit=0.2, cache_savings=0.8, batch=2,
+                  price_in=0.5, price_out=1.5, tps_prefill=20000, tps_decode=150)
+    big = {"T_ctx": [1000.0] * 1000, "batch": [1.0] * (PARETO_MAX_POINTS // 1000 + 1)}
+    r = TestClient(app).post("/pareto", json={"params": params, "space": big})
+    assert r.status_code == 400 and "PARETO_MAX_POINTS" in r.json()["detail"]
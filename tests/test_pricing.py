@@ -0,0 +1,35 @@
+import json
+import os
+
+import pytest
+
+from core.pricing import ProfileRegistry, get_profile, list_profiles
+
+
+def _write(path, profiles, mtime):
+    path.write_text(json.dumps(profiles))
+    os.utime(path, ns=(mtime, mtime))
+
+
+def test_unknown_profile_is_an_error():
+    assert "default" in list_profiles()
+    with pytest.raises(KeyError, match="unknown pricing profile"):
+        get_profile("no-such-vendor")
+
+
+def test_registry_reloads_on_mtime_and_indexes(tmp_path):
+    path = tmp_path / "profiles.json"
+    profiles = {
+        f"p{i}": {"provider": "acme" if i % 2 else "other", "model": f"m{i % 3}",
+                  "price_in": i / 10, "price_out": i / 5, "tps_prefill": 1000, "tps_decode": 100}
+        for i in range(10)
+    }
+    _write(path, profiles, 1_000_000_000)
+    reg = ProfileRegistry(path, check_interval=0.0)
+    idx = reg.index()
+    assert idx.find(provider="acme", price_in=(0.2, 0.6)) == ["p3", "p5"]
+    assert idx.find(model="m0", price_out=(None, 1.0)) == ["p0", "p3"]
+    _write(path, {"only": profiles["p1"]}, 2_000_000_000)
+    assert reg.index().names == ("only",)
+    _write(path, {"broken": {"price_in": 1}}, 3_000_000_000)
+    assert reg.index().names == ("only",)
@@ -0,0 +1,52 @@
+import json
+import multiprocessing
+
+import pytest
+
+from profiles import DEFAULTS, ProfileStore
+
+
+def _writer(path, worker, n):
+    store = ProfileStore(path, compact_min=16)
+    for i in range(n):
+        store.put(f"w{worker}-{i}", {"rpm": i})
+        if i % 3 == 0:
+            store.delete(f"w{worker}-{i}")
+
+
+def test_concurrent_writers_lose_no_updates(tmp_path):
+    path = tmp_path / "profiles.json"
+    ctx = multiprocessing.get_context("fork")
+    procs = [ctx.Process(target=_writer, args=(path, w, 60)) for w in range(4)]
+    for p in procs:
+        p.start()
+    for p in procs:
+        p.join()
+    assert all(p.exitcode == 0 for p in procs)
+    expected = {f"w{w}-{i}" for w in range(4) for i in range(60) if i % 3}
+    fresh = ProfileStore(path)
+    assert set(fresh.profiles()) == expected | set(DEFAULTS)
+    assert fresh.get("w2-59") == {"rpm": 59}
+    # A torn last line from a crashed writer is ignored and then overwritten.
+    with open(fresh.log_path, "ab") as f:
+        f.write(b'["put","half"')
+    assert "half" not in ProfileStore(path).profiles()
+    fresh.put("after", {"rpm": 1})
+    assert ProfileStore(path).get("after") == {"rpm": 1}
+
+
+def test_unreadable_file_is_never_overwritten(tmp_path):
+    path = tmp_path / "profiles.json"
+    path.write_text('{"Mine": {"rpm": 3},')
+    store = ProfileStore(path)
+    assert store.profiles() == DEFAULTS and store.error
+    with pytest.raises(ValueError):
+        store.put("x", {"rpm": 1})
+    with pytest.raises(ValueError):
+        store.replace({"x": {}})
+    assert path.read_text() == '{"Mine": {"rpm": 3},'
+    path.write_text('{"Mine": {"rpm": 3}}')
+    store.put("x", {"rpm": 1})
+    assert set(store.profiles()) == {"Mine", "x"} and store.error is None
+    store.replace(store.profiles())
+    assert json.loads(path.read_text()) == {"Mine": {"rpm": 3}, "x": {"rpm": 1}}
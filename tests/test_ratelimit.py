@@ -0,0 +1,50 @@
+import threading
+
+from core.ratelimit import RateLimiter, LocalBuckets, SQLiteBuckets
+
+
+def test_token_bucket_refills_and_bounds_clients():
+    lim = RateLimiter(2.0, burst=2, backend=LocalBuckets(max_keys=3))
+    assert [lim.check("a", now=0.0)[0] for _ in range(3)] == [True, True, False]
+    assert lim.check("a", now=0.1) == (False, 1)
+    assert lim.check("a", now=0.5)[0]
+    # A backwards clock step neither refills nor drains the bucket.
+    assert lim.check("b", now=100.0)[0]
+    assert lim.check("b", now=40.0)[0]
+    assert not lim.check("b", now=40.0)[0]
+    for i in range(10):
+        lim.check(f"ip{i}", now=1.0)
+    assert len(lim.backend) == 3 and lim.backend.evictions == 9
+
+
+def test_sqlite_backend_is_shared(tmp_path):
+    path = str(tmp_path / "rl.db")
+    a = RateLimiter(1.0, burst=2, backend=SQLiteBuckets(path))
+    b = RateLimiter(1.0, burst=2, backend=SQLiteBuckets(path))
+    assert a.check("x", now=10.0)[0] and b.check("x", now=10.0)[0]
+    assert not a.check("x", now=10.0)[0]
+    assert b.check("x", now=11.0)[0]
+
+
+def test_sqlite_limiter_runs_off_the_event_loop(tmp_path):
+    import anyio
+    from api.main import AuthRateMiddleware
+
+    lim = RateLimiter(1.0, burst=1, backend=SQLiteBuckets(str(tmp_path / "rl.db")))
+    assert lim.blocking and not RateLimiter(1.0).blocking
+    threads, check = [], lim.check
+    lim.check = lambda key: threads.append(threading.get_ident()) or check(key)
+    served, sent = [], []
+
+    async def app(scope, receive, send):
+        served.append(scope["path"])
+
+    async def send(msg):
+        sent.append(msg)
+
+    mw = AuthRateMiddleware(app, limiter=lim)
+    scope = {"type": "http", "path": "/plan", "headers": [], "client": ("1.2.3.4", 1)}
+    for _ in range(2):
+        anyio.run(mw, scope, None, send)
+    assert served == ["/plan"] and sent[0]["status"] == 429
+    assert len(threads) == 2 and threading.get_ident() not in threads
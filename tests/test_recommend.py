@@ -11,3 +11,26 @@ def test_optimize_basic():
     p = Params(1000,100,150,1.0,0.2,0.8,2,0.5,1.5,20000,150,50)
     out = optimize(p, sla_p95=10.0, rho_target=0.95)
     assert isinstance(out, dict)
+
+def test_pruned_optimize_matches_grid_with_fewer_evals():
+    for p, sla, rho in [
+        (Params(1000,100,150,1.0,0.2,0.8,2,0.5,1.5,20000,150,50), 10.0, 0.95),
+        (Params(3000,120,180,6.0,0.6,0.9,8,0.5,1.5,20000,150,40,servers=4), 2.5, 0.7),
+        (Params(0,100,150,1.0,0.2,0.8,2,0.5,1.5,20000,150,50), 10.0, 0.95),
+        (Params(1000,100,150,50.0,0.2,0.8,2,0.5,1.5,20000,150,50), 2.0, 0.7),
+    ]:
+        grid = optimize(p, sla_p95=sla, rho_target=rho, mode="grid")
+        pruned = optimize(p, sla_p95=sla, rho_target=rho)
+        assert pruned["count"] == grid["count"]
+        assert (pruned["best"] is None) == (grid["best"] is None)
+        if grid["best"] is not None:
+            assert pruned["best"]["params"] == grid["best"]["params"]
+            assert pruned["best"]["score"] == grid["best"]["score"]
+        assert pruned["evals"] * 4 < grid["evals"]
+
+def test_optimize_accepts_finer_ranges():
+    p = Params(2000,100,150,0.5,0.2,0.8,2,0.5,1.5,20000,150,50)
+    out = optimize(p, sla_p95=5.0, rho_target=0.9, T_ctx_opts=range(500, 2001, 10), T_resp_opts=range(50, 301, 5), batch_max=256)
+    assert out["best"]["params"].T_ctx == 500
+    assert out["best"]["params"].T_resp == 50
+    assert out["evals"] < 5000
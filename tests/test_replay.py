@@ -0,0 +1,35 @@
+import json
+
+from core.model import Params, plan
+from core.replay import replay, iter_trace
+
+
+def _write_trace(path, n=200):
+    with open(path, "w") as f:
+        for i in range(n):
+            rec = {"timestamp": i * 0.5, "context_tokens": 1000, "prompt_tokens": 100,
+                   "response_tokens": 150, "cache_hit": i % 2 == 0}
+            f.write(json.dumps(rec) + "\n")
+        f.write("\n")
+
+
+def test_trace_blocks_cover_every_line(tmp_path):
+    path = tmp_path / "trace.jsonl"
+    _write_trace(path)
+    chunks = list(iter_trace(path, block_bytes=512))
+    assert len(chunks) > 1
+    assert sum(len(c["timestamp"]) for c in chunks) == 200
+    assert list(iter_trace(path, workers=2, block_bytes=512))[3]["timestamp"].tolist() == chunks[3]["timestamp"].tolist()
+
+
+def test_replay_cost_matches_plan_formulas(tmp_path):
+    path = tmp_path / "trace.jsonl"
+    _write_trace(path)
+    p = Params(0, 0, 0, 0, 0, 0.8, 2, 0.5, 1.5, 20000, 150, 50, servers=2)
+    out = replay(path, p, block_bytes=1024)
+    hit = plan(Params(1000, 100, 150, 1, 1.0, 0.8, 2, 0.5, 1.5, 20000, 150, 50))["cost"]["per_query"]
+    miss = plan(Params(1000, 100, 150, 1, 0.0, 0.8, 2, 0.5, 1.5, 20000, 150, 50))["cost"]["per_query"]
+    assert out["requests"] == 200
+    assert abs(out["cost"]["total"] - 100 * (hit + miss)) < 1e-9
+    assert abs(out["qps"] - 200 / 99.5) < 1e-9
+    assert out["latency"]["p50_s"] > 1.0
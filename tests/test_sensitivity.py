@@ -0,0 +1,26 @@
+import pytest
+
+from core.model import Params, plan
+from core.sensitivity import sensitivity
+
+STABLE = Params(3000,120,180,2.0,0.6,0.9,8,0.5,1.5,20000,150,40,4)
+
+
+def test_cost_elasticities_match_closed_form():
+    out = sensitivity(STABLE)
+    e = {it["field"]: it["elasticity"]["cost.per_month"] for it in out["fields"]}
+    assert e["qps"] == pytest.approx(1.0)
+    assert e["price_in"] + e["price_out"] == pytest.approx(1.0)
+    assert e["tps_decode"] == 0.0 and e["servers"] == 0.0
+    assert out["ranking"]["cost.per_month"][0] == "qps"
+
+
+def test_latency_derivative_and_swings():
+    out = sensitivity(STABLE)
+    by = {it["field"]: it for it in out["fields"]}
+    p95 = lambda ms: plan(Params(**{**STABLE.__dict__, "net_ms_one_way": ms}))["latency"]["p95_s"]
+    assert by["net_ms_one_way"]["derivative"]["latency.p95_s"] == pytest.approx((p95(40.4) - p95(39.6)) / 0.8)
+    hi = by["T_resp"]["high"]
+    assert hi["value"] == pytest.approx(198.0)
+    assert hi["latency.p95_s"] == pytest.approx(plan(Params(**{**STABLE.__dict__, "T_resp": 198.0}))["latency"]["p95_s"])
+    assert by["cache_hit"]["high"]["value"] <= 1.0 and by["servers"]["low"]["value"] == 3
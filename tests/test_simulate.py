@@ -0,0 +1,26 @@
+import math
+
+from core.model import Params
+from core.simulate import simulate, LogHistogram
+
+
+def test_log_histogram_quantiles():
+    h = LogHistogram().add([0.1 * i for i in range(1, 1001)])
+    assert abs(h.quantile(0.5) - 50.0) / 50.0 < 0.02
+    assert abs(h.quantile(0.95) - 95.0) / 95.0 < 0.02
+
+
+def test_mm1_tail_matches_exact_distribution():
+    # s_base = 1s, exponential service, lambda = 0.5 -> sojourn time ~ Exp(mu - lambda).
+    p = Params(0, 0, 100, 0.5, 0, 0, 1, 0.5, 1.5, 20000, 100, 0)
+    out = simulate(p, n=200_000, seed=1, service_cv=1.0)
+    assert abs(out["empirical"]["p95_s"] - math.log(20) / 0.5) / (math.log(20) / 0.5) < 0.05
+    assert abs(out["empirical"]["p_wait"] - 0.5) < 0.02
+    assert out["analytic"]["p95_s"] == 1.0 + 3 * 1.0
+
+
+def test_deterministic_service_without_load_never_waits():
+    p = Params(0, 0, 100, 0.01, 0, 0, 1, 0.5, 1.5, 20000, 100, 0, servers=64)
+    out = simulate(p, n=5_000)
+    assert out["empirical"]["p_wait"] == 0.0
+    assert abs(out["empirical"]["p99_s"] - 1.0) < 0.01
@@ -0,0 +1,77 @@
+import json
+
+import numpy as np
+import pytest
+
+from core.model import Params, plan
+from core.sketch import WorkloadSketch, plan_distribution, sketch_trace
+
+
+def _cols(rng, n):
+    return {
+        "context_tokens": rng.lognormal(7.0, 1.0, n),
+        "prompt_tokens": rng.lognormal(4.5, 0.5, n),
+        "response_tokens": rng.lognormal(5.0, 0.8, n),
+        "cache_hit": rng.random(n) < 0.4,
+    }
+
+
+def test_sketches_merge_across_shards():
+    rng = np.random.default_rng(0)
+    a, b = _cols(rng, 5000), _cols(rng, 7000)
+    whole = WorkloadSketch().add({k: np.concatenate([a[k], b[k]]) for k in a})
+    merged = WorkloadSketch().add(a).merge(WorkloadSketch.from_dict(json.loads(json.dumps(WorkloadSketch().add(b).to_dict()))))
+    assert merged.n == whole.n == 12000
+    for d in ("context_tokens", "response_tokens"):
+        assert merged.hists[d].quantile(0.95) == whole.hists[d].quantile(0.95)
+        assert abs(merged.hists[d].mean() - whole.hists[d].mean()) < 1e-6
+    assert merged.cache_hit() == whole.cache_hit()
+
+
+def test_distribution_cost_is_expectation_and_tail_is_heavier():
+    rng = np.random.default_rng(1)
+    w = WorkloadSketch().add(_cols(rng, 50000))
+    p = Params(1000, 100, 150, 5.0, 0.4, 0.8, 4, 0.5, 1.5, 20000, 150, 50, servers=10)
+    out = plan_distribution(p, w)
+    ctx, prompt, resp = (w.hists[d].mean() for d in ("context_tokens", "prompt_tokens", "response_tokens"))
+    ref = plan(Params(ctx, prompt, resp, 5.0, w.cache_hit(), 0.8, 4, 0.5, 1.5, 20000, 150, 50, servers=10))
+    assert abs(out["cost"]["per_query"] - ref["cost"]["per_query"]) < 1e-12
+    assert out["latency"]["service_cv"] > 0.5
+    assert out["latency"]["p95_s"] > ref["latency"]["p95_s"]
+    assert out["cost"]["p95_per_query"] > out["cost"]["per_query"]
+
+
+def test_zero_observed_hits_override_params():
+    rng = np.random.default_rng(2)
+    cols = {**_cols(rng, 2000), "cache_hit": np.zeros(2000, dtype=bool)}
+    p = Params(1000, 100, 150, 5.0, 0.4, 0.8, 4, 0.5, 1.5, 20000, 150, 50, servers=10)
+    assert plan_distribution(p, WorkloadSketch().add(cols))["distribution"]["cache_hit"] == 0.0
+    cols.pop("cache_hit")
+    assert plan_distribution(p, WorkloadSketch().add(cols))["distribution"]["cache_hit"] == 0.4
+
+
+def test_trace_without_cache_data_falls_back_to_params(tmp_path):
+    path = tmp_path / "trace.jsonl"
+    path.write_text("".join(json.dumps({"ts": i, "context_tokens": 900, "prompt_tokens": 80,
+                                        "response_tokens": 120}) + "\n" for i in range(50)))
+    w = sketch_trace(path)
+    assert (w.n, w.hit_samples) == (50, 0)
+    p = Params(1000, 100, 150, 5.0, 0.4, 0.8, 4, 0.5, 1.5, 20000, 150, 50, servers=10)
+    assert plan_distribution(p, w)["distribution"]["cache_hit"] == 0.4
+
+
+def test_from_dict_rejects_foreign_layouts_and_bad_buckets():
+    good = WorkloadSketch().add(_cols(np.random.default_rng(3), 100)).to_dict()
+    ctx = good["context_tokens"]
+    bad = [
+        {**ctx, "ratio": 1.0000001},
+        {**ctx, "buckets": {"999999": ctx["n"]}},
+        {**ctx, "buckets": {"-1": ctx["n"]}},
+        {**ctx, "n": ctx["n"] + 1},
+        {**ctx, "buckets": [1, 2]},
+    ]
+    for hist in bad:
+        with pytest.raises(ValueError):
+            WorkloadSketch.from_dict({**good, "context_tokens": hist})
+    with pytest.raises(ValueError):
+        WorkloadSketch.from_dict({**good, "hits": good["hit_samples"] + 1})
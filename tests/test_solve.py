@@ -0,0 +1,43 @@
+from core.model import Params, plan
+from core.solve import min_servers, max_qps, max_T_ctx
+
+BASE = Params(3000,120,180,20.0,0.6,0.9,8,0.5,1.5,20000,150,40)
+
+
+def _with(**kw):
+    return Params(**{**BASE.__dict__, **kw})
+
+
+def test_min_servers_matches_scan():
+    for qps, sla, rho in [(20.0, 2.0, None), (20.0, 1.5, 0.7), (300.0, 1.4, None), (0.0, 2.0, 0.7)]:
+        out = min_servers(_with(qps=qps), sla_p95=sla, rho_target=rho)
+        k = 1
+        while True:
+            r = plan(_with(qps=qps, servers=k))["latency"]
+            if r["p95_s"] <= sla and (rho is None or r["rho"] <= rho):
+                break
+            k += 1
+        assert out["servers"] == k
+
+
+def test_min_servers_reports_impossible_sla():
+    out = min_servers(BASE, sla_p95=0.5)
+    assert out["servers"] is None and "service time" in out["reason"]
+
+
+def test_max_qps_is_on_the_sla_boundary():
+    out = max_qps(_with(servers=30), sla_p95=2.0, rho_target=0.9)
+    assert plan(_with(servers=30, qps=out["qps"]))["latency"]["p95_s"] <= 2.0 + 1e-9
+    over = plan(_with(servers=30, qps=out["qps"] * 1.001))["latency"]
+    assert over["p95_s"] > 2.0 or over["rho"] > 0.9
+
+
+def test_max_T_ctx_respects_budget_and_sla():
+    p = _with(servers=30)
+    budget = plan(_with(servers=30, T_ctx=1500))["cost"]["per_month"]
+    out = max_T_ctx(p, budget_month=budget, sla_p95=2.0)
+    assert abs(out["T_ctx"] - 1500) < 1e-6
+    r = plan(_with(servers=30, T_ctx=out["T_ctx"]))
+    assert r["cost"]["per_month"] <= budget * (1 + 1e-9)
+    assert r["latency"]["p95_s"] <= 2.0
+    assert max_T_ctx(p, budget_month=1.0)["T_ctx"] is None
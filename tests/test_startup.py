@@ -0,0 +1,38 @@
+import os
+import pathlib
+import subprocess
+import sys
+import time
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+HEAVY = ("numpy", "pandas", "streamlit", "pyarrow", "altair")
+# Cold start (interpreter, imports, lifespan warm-up) plus the first /plan response.
+BUDGET_S = float(os.getenv("STARTUP_BUDGET_S", "3.0"))
+
+FIRST_PLAN = """
+from fastapi.testclient import TestClient
+import api.main
+p = dict(T_ctx=3000, T_prompt=120, T_resp=180, qps=2, cache_hit=0.6, cache_savings=0.9, batch=8,
+         price_in=0.5, price_out=1.5, tps_prefill=20000, tps_decode=150)
+with TestClient(api.main.app) as c:
+    assert c.post("/plan", json=p).status_code == 200
+"""
+
+
+def _run(*args):
+    env = {**os.environ, "PYTHONPATH": str(ROOT), "PYTHONDONTWRITEBYTECODE": "1"}
+    return subprocess.run([sys.executable, *args], cwd=ROOT, env=env, capture_output=True, text=True, check=True)
+
+
+def test_api_import_skips_heavy_modules():
+    out = _run("-X", "importtime", "-c", "import api.main")
+    modules = {line.rsplit("|", 1)[-1].strip().split(".")[0]
+               for line in out.stderr.splitlines() if line.startswith("import time:")}
+    assert "fastapi" in modules
+    assert not modules.intersection(HEAVY)
+
+
+def test_cold_start_and_first_plan_within_budget():
+    t = time.perf_counter()
+    _run("-W", "ignore", "-c", FIRST_PLAN)
+    assert time.perf_counter() - t < BUDGET_S
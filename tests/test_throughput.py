@@ -0,0 +1,57 @@
+import pathlib
+
+import numpy as np
+import pytest
+
+from core.batch import params_to_columns, plan_batch
+from core.model import Params, plan
+from core.pricing import ProfileRegistry
+from core.recommend import optimize
+from core.throughput import ThroughputCurve, apply_curves
+
+BASE = Params(3000,120,180,20.0,0.6,0.9,8,0.5,1.5,20000,150,40,2)
+EXAMPLE = pathlib.Path(__file__).resolve().parents[1] / "examples" / "pricing_profiles_throughput.json"
+
+
+def test_curve_scales_decode_and_adds_slots():
+    curve = ThroughputCurve({"batch": [1, 8, 64], "decode_tps": [150, 600, 1200]})
+    assert curve.decode_scale[0] == 1.0
+    assert curve.decode_scale[7] == pytest.approx(600 / 8 / 150)
+    assert curve.decode_scale[127] == pytest.approx(1200 / 128 / 150)
+    r = plan(BASE, curve)
+    assert r["latency"]["decode_s"] == pytest.approx(180 / (150 * 600 / 8 / 150))
+    assert r["latency"]["slots"] == 16 and r["inputs"]["servers"] == 2
+    batch = plan_batch(apply_curves(params_to_columns([BASE]), [curve]))
+    assert np.isclose(batch["latency"]["p95_s"][0], r["latency"]["p95_s"])
+    with pytest.raises(ValueError):
+        ThroughputCurve({"batch": [2, 4], "decode_tps": [1, 2]})
+
+
+def test_optimize_with_curve_avoids_slow_large_batches():
+    curve = ThroughputCurve({"half_batch": 4})
+    out = optimize(Params(**{**BASE.__dict__, "servers": 16}), sla_p95=2.5, curve=curve)
+    best = out["best"]
+    assert best is not None and best["params"].batch < 64
+    assert best["result"]["latency"]["p95_s"] <= 2.5
+    assert out["evals"] == 3 * 4 * 64 + 1
+
+
+def test_batches_past_max_batch_are_capped():
+    from core.throughput import MAX_BATCH
+    curve = ThroughputCurve({"half_batch": 16})
+    big = Params(**{**BASE.__dict__, "batch": 10 * MAX_BATCH})
+    r = plan(big, curve)
+    assert r["latency"]["slots"] == 2 * MAX_BATCH
+    assert curve.effective(big).servers == 2 * MAX_BATCH
+    batch = plan_batch(apply_curves(params_to_columns([big]), [curve]))
+    assert np.isclose(batch["latency"]["p95_s"][0], r["latency"]["p95_s"])
+
+
+def test_profile_file_curves_load_through_the_registry():
+    index = ProfileRegistry(EXAMPLE).index()
+    assert index.curve("default") is None
+    curve = index.curve("selfhosted-8b")
+    assert curve.decode_scale[7] == pytest.approx(1200 / 8 / 180)
+    r = plan(BASE, curve)
+    assert r["latency"]["slots"] == 16
+    assert r["latency"]["decode_s"] == pytest.approx(180 / (150 * 1200 / 8 / 180))